@@ -1,4 +1,7 @@
+import inspect
+import weakref
 from collections import Counter
+from collections.abc import Callable
 from typing import TYPE_CHECKING
 
 from framcore import Base
@@ -12,7 +15,24 @@ if TYPE_CHECKING:
 
 
 class ModelDict(dict):
-    """Dict storing only values of type Component | Expr | TimeVector | Curve."""
+    """
+    Dict storing only values of type Component | Expr | TimeVector | Curve.
+
+    Listeners added with add_listener are called with the list of changed keys after each change.
+    Listeners are held by weak reference, and are not kept when the ModelDict is copied or pickled.
+    """
+
+    # Weak references to listeners. Replaced, not mutated, so the class default is never changed.
+    _listeners: tuple[weakref.ref, ...] = ()
+
+    def add_listener(self, listener: Callable[[list[str]], None]) -> None:
+        """Call listener with the list of changed keys after each change. The listener is held by weak reference."""
+        ref = weakref.WeakMethod(listener) if inspect.ismethod(listener) else weakref.ref(listener)
+        self._listeners = (*self._listeners, ref)
+
+    def remove_listener(self, listener: Callable[[list[str]], None]) -> None:
+        """Stop calling listener on changes."""
+        self._listeners = tuple(ref for ref in self._listeners if ref() not in (None, listener))
 
     def __setitem__(self, key: str, value: Component | Expr | TimeVector | Curve) -> None:
         """Set item with type checking."""
@@ -22,7 +42,65 @@ class ModelDict(dict):
         if not isinstance(value, Component | Expr | TimeVector | Curve):
             message = f"Expected Component | Expr | TimeVector | Curve for key {key}, got {type(value).__name__}"
             raise TypeError(message)
-        return super().__setitem__(key, value)
+        super().__setitem__(key, value)
+        self._notify([key])
+
+    def __delitem__(self, key: str) -> None:
+        """Delete item."""
+        super().__delitem__(key)
+        self._notify([key])
+
+    def __ior__(self, other: object) -> "ModelDict":
+        """Update items."""
+        self.update(other)
+        return self
+
+    def update(self, *args: object, **kwargs: object) -> None:
+        """Update items."""
+        items = dict(*args, **kwargs)
+        super().update(items)
+        if items:
+            self._notify(list(items))
+
+    def setdefault(self, key: str, default: Component | Expr | TimeVector | Curve) -> Component | Expr | TimeVector | Curve:
+        """Set item if key is not present, and return item."""
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def pop(self, key: str, *default: object) -> object:
+        """Remove and return item."""
+        is_present = key in self
+        value = super().pop(key, *default)
+        if is_present:
+            self._notify([key])
+        return value
+
+    def popitem(self) -> tuple[str, object]:
+        """Remove and return last inserted item."""
+        key, value = super().popitem()
+        self._notify([key])
+        return key, value
+
+    def clear(self) -> None:
+        """Remove all items."""
+        keys = list(self)
+        super().clear()
+        if keys:
+            self._notify(keys)
+
+    def __getstate__(self) -> dict:
+        """Get state for copy and pickle. Listeners are not included."""
+        return {}
+
+    def _notify(self, keys: list[str]) -> None:
+        if not self._listeners:
+            return
+        listeners = [ref() for ref in self._listeners]
+        self._listeners = tuple(ref for ref, listener in zip(self._listeners, listeners, strict=True) if listener is not None)
+        for listener in listeners:
+            if listener is not None:
+                listener(keys)
 
 
 class Model(Base):
@@ -15,7 +15,7 @@ from framcore.aggregators._utils import (
 from framcore.attributes import AvgFlowVolume, Conversion, HydroGenerator, HydroReservoir, MaxFlowVolume, StockVolume
 from framcore.components import Component, HydroModule
 from framcore.curves import Curve
-from framcore.expressions import Expr, get_level_value
+from framcore.expressions import Expr, get_level_value, get_level_values
 from framcore.metadata import LevelExprMeta
 from framcore.timeindexes import FixedFrequencyTimeIndex, SinglePeriodTimeIndex
 from framcore.timevectors import ConstantTimeVector, TimeVector
@@ -505,10 +505,10 @@ class HydroAggregator(Aggregator):
             release_capacity_profile = None
             if any(rc.get_profile() for rc in release_capacities):
                 one_profile_max = Expr(src=ConstantTimeVector(1.0, is_zero_one_profile=False), is_profile=True)
-                weights = [get_level_value(rcl, model, "MW", self._data_dim, self._scen_dim, is_max=True) for rcl in release_capacity_levels]
+                weights = get_level_values(release_capacity_levels, model, "MW", self._data_dim, self._scen_dim, is_max=True).tolist()
                 profiles = [rc.get_profile() if rc.get_profile() else one_profile_max for rc in release_capacities]
                 release_capacity_profile = _aggregate_weighted_expressions(profiles, weights)
-            release_capacity = MaxFlowVolume(level=sum(release_capacity_levels) / energy_eq, profile=release_capacity_profile)
+            release_capacity = MaxFlowVolume(level=Expr.add_many(release_capacity_levels) / energy_eq, profile=release_capacity_profile)
 
             # Inflow level
             upstream_inflow_levels = defaultdict(list)
@@ -517,11 +517,12 @@ class HydroAggregator(Aggregator):
                     inflow = data[mm].get_inflow()
                     if inflow:
                         upstream_inflow_levels[m].append(inflow.get_level())
-            inflow_level_energy = sum(
-                sum(upstream_inflow_levels[m]) * data[m].get_generator().get_energy_equivalent().get_level()
+            inflow_levels_energy = [
+                Expr.add_many(upstream_inflow_levels[m]) * data[m].get_generator().get_energy_equivalent().get_level()
                 for m in generator_module_names
                 if len(upstream_inflow_levels[m]) > 0
-            )
+            ]
+            inflow_level_energy = Expr.add_many(inflow_levels_energy) if inflow_levels_energy else 0
             inflow_level = inflow_level_energy / energy_eq
 
             # Inflow profile
@@ -564,7 +565,7 @@ class HydroAggregator(Aggregator):
                     data[m].get_reservoir().get_capacity().get_level() * data[m].get_meta(self._metakey_energy_eq_downstream).get_value()
                     for m in self._grouped_reservoirs[new_id]
                 ]
-                reservoir_level = sum(reservoir_levels) / energy_eq
+                reservoir_level = Expr.add_many(reservoir_levels) / energy_eq
                 reservoir_capacity = StockVolume(level=reservoir_level)
 
                 fillings = [data[m].get_reservoir().get_volume() for m in self._grouped_reservoirs[new_id]]
@@ -635,9 +636,9 @@ class HydroAggregator(Aggregator):
         if all(self._is_disagg_filling_expr(level) for level in levels):
             return _get_level_profile_weights_from_disagg_levelprofiles(model, fillings, self._data_dim, self._scen_dim)
         levels_energy = [filling * ee for filling, ee in zip(levels, energy_eq_downstreams, strict=True)]
-        level = sum(levels_energy) / energy_eq
+        level = Expr.add_many(levels_energy) / energy_eq
         profiles = [filling.get_profile() for filling in fillings]
-        weights = [get_level_value(level_energy, model, weight_unit, self._data_dim, self._scen_dim, False) for level_energy in levels_energy]
+        weights = get_level_values(levels_energy, model, weight_unit, self._data_dim, self._scen_dim, False).tolist()
         return level, profiles, weights
 
     def _is_disagg_filling_expr(self, expr: Expr) -> bool:
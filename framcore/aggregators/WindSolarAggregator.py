@@ -13,7 +13,7 @@ from framcore.aggregators.Aggregator import Aggregator  # full import path so in
 from framcore.attributes import AvgFlowVolume, Cost
 from framcore.components import Component, Solar, Wind
 from framcore.curves import Curve
-from framcore.expressions import Expr, get_level_value
+from framcore.expressions import Expr, get_level_values
 from framcore.timeindexes import FixedFrequencyTimeIndex, SinglePeriodTimeIndex
 from framcore.timevectors import ConstantTimeVector, TimeVector
 
@@ -126,14 +126,14 @@ class _WindSolarAggregator(Aggregator):
         capacity_profiles = [member.get_max_capacity().get_profile() for member in members]
         vocs = [member.get_voc() for member in members]
         if any(capacity_profiles) or any(vocs):  # only calc capacity weights if needed
-            capacity_level_values = [get_level_value(cl, model, "MW", self._data_dim, self._scen_dim, True) for cl in capacity_levels]
+            capacity_level_values = get_level_values(capacity_levels, model, "MW", self._data_dim, self._scen_dim, True).tolist()
             if sum(capacity_level_values) == 0.0:
                 message = "All grouped components do not contribute to weights (capacity = 0). Simplified aggregation."
                 self.send_warning_event(message)
 
         # Production capacity
         capacity_levels = [member.get_max_capacity().get_level() for member in members]
-        capacity_level = sum(capacity_levels)
+        capacity_level = Expr.add_many(capacity_levels)
 
         capacity_profile = None
         if any(capacity_profiles) and (sum(capacity_level_values) != 0.0):
@@ -203,7 +203,7 @@ class _WindSolarAggregator(Aggregator):
             if _all_detailed_exprs_in_sum_expr(agg_production_level, detailed_production_levels):  # if agg production is sum of detailed levels,  keep original
                 continue
             capacity_levels = [new_data[detailed_key].get_max_capacity().get_level() for detailed_key in detailed_keys]
-            capacity_level_values = [get_level_value(cl, model, "MW", self._data_dim, self._scen_dim, True) for cl in capacity_levels]
+            capacity_level_values = get_level_values(capacity_levels, model, "MW", self._data_dim, self._scen_dim, True).tolist()
             capacity_level_value_weights = [cl / sum(capacity_level_values) for cl in capacity_level_values]
             production_weights = {detailed_key: weight for detailed_key, weight in zip(detailed_keys, capacity_level_value_weights, strict=False)}
             for detailed_key in detailed_keys:
@@ -3,7 +3,7 @@
 from math import isclose
 
 from framcore.attributes import AvgFlowVolume, Cost, LevelProfile
-from framcore.expressions import Expr, get_level_value
+from framcore.expressions import Expr, get_level_value, get_level_values
 from framcore.Model import Model
 from framcore.timeindexes import FixedFrequencyTimeIndex, SinglePeriodTimeIndex
 from framcore.timevectors import ConstantTimeVector
@@ -50,9 +50,9 @@ def _get_level_profile_weights_volumes_from_results(
     levels = [volume.get_level() for volume in volumes]
     if all(_is_weight_flow_expr(level) for level in levels):
         return _get_level_profile_weights_from_disagg_levelprofiles(model, volumes, data_dim, scen_dim)
-    level = sum(levels)
+    level = Expr.add_many(levels)
     profiles = [volume.get_profile() for volume in volumes]
-    weights = [get_level_value(level, model, weight_unit, data_dim, scen_dim, False) for level in levels]
+    weights = get_level_values(levels, model, weight_unit, data_dim, scen_dim, False).tolist()
     return level, profiles, weights
 
 
@@ -71,11 +71,11 @@ def _get_level_profile_weights_from_disagg_levelprofiles(
     """
     weights = _get_weights_from_levelprofiles(model, objs, data_dim, scen_dim)
     if all(isclose(weight, 1.0, rel_tol=1e-6) for weight in weights.values()):
-        level = sum([obj[0] for obj in weights])  # all weights 1, return sum of objs
+        level = Expr.add_many([obj[0] for obj in weights])  # all weights 1, return sum of objs
         profiles = [obj[1] for obj in weights]
         weights = [1.0 for _ in weights]
         return level, profiles, weights
-    level = sum([weight * obj[0] for obj, weight in weights.items()])  # return weighted sum of objs
+    level = Expr.weighted_sum([obj[0] for obj in weights], list(weights.values()))  # return weighted sum of objs
     profiles = [obj[1] for obj in weights]
     weights = [weight for weight in weights.values()]
     return level, profiles, weights
@@ -89,12 +89,13 @@ def _aggregate_weighted_expressions(exprs: list[Expr], weights: list[float]) ->
         raise ValueError(message)
     if all(exprs[0] == e for e in exprs):
         return exprs[0]
+    sum_weights = sum(weights)
     weights_dict = dict()
     for e, w in zip(exprs, weights, strict=True):
         if e not in weights_dict:
             weights_dict[e] = 0.0
-        weights_dict[e] += w / sum(weights)
-    return sum([w * e for e, w in weights_dict.items()])
+        weights_dict[e] += w / sum_weights
+    return Expr.weighted_sum(list(weights_dict.keys()), list(weights_dict.values()))
 
 
 def _is_weight_flow_expr(expr: Expr) -> bool:
@@ -159,7 +160,7 @@ def _aggregate_costs(
     if any(cost_profiles):
         one_profile = Expr(src=ConstantTimeVector(1.0, is_zero_one_profile=False), is_profile=True)
         cost_profiles = [profile if profile else one_profile for profile in cost_profiles]
-        cost_level_values = [get_level_value(level, model, weight_unit, data_dim, scen_dim, False) for level in cost_levels]
+        cost_level_values = get_level_values(cost_levels, model, weight_unit, data_dim, scen_dim, False).tolist()
         profile_weights = [clv * weight for clv, weight in zip(cost_level_values, weights, strict=True)]
         aggregated_profile = _aggregate_weighted_expressions(cost_profiles, profile_weights)
 
@@ -134,8 +134,18 @@ class Arrow(Base):
         level_period: SinglePeriodTimeIndex,
         unit: str | None,
         is_float32: bool = True,
+        out: NDArray | None = None,
     ) -> NDArray:
-        """Return vector with values along the given scenario horizon using level over level_period."""
+        """
+        Return vector with values along the given scenario horizon using level over level_period.
+
+        If out is given (e.g. a row of a preallocated matrix), the result is written into out, and out is returned.
+        """
+        self._check_type(out, (np.ndarray, type(None)))
+
+        # the first coefficient with profile writes its vector into buffer, and the result is computed in place in that vector
+        buffer = out
+
         conversion_vector = None
         efficiency_vector = None
         loss_vector = None
@@ -151,7 +161,9 @@ class Arrow(Base):
                     level_period=level_period,
                     unit=unit,
                     is_float32=is_float32,
+                    out=buffer,
                 )
+                buffer = None
             elif self._conversion.has_level():
                 conversion_value = self._conversion.get_data_value(
                     db=db,
@@ -169,7 +181,9 @@ class Arrow(Base):
                     level_period=level_period,
                     unit=None,
                     is_float32=is_float32,
+                    out=buffer,
                 )
+                buffer = None
             elif self._efficiency.has_level():
                 efficiency_value = self._efficiency.get_data_value(
                     db=db,
@@ -187,7 +201,9 @@ class Arrow(Base):
                     level_period=level_period,
                     unit=None,
                     is_float32=is_float32,
+                    out=buffer,
                 )
+                buffer = None
             elif self._loss.has_level():
                 loss_value = self._loss.get_data_value(
                     db=db,
@@ -199,45 +215,49 @@ class Arrow(Base):
 
         if conversion_value is not None:
             assert conversion_value >= 0, f"Arrow with invalid conversion ({conversion_value}): {self}"
-            out = conversion_value
+            result = conversion_value
         else:
-            out = 1.0
+            result = 1.0
 
         if efficiency_value is not None:
             assert efficiency_value > 0, f"Arrow with invalid efficiency ({efficiency_value}): {self}"
-            out = out / efficiency_value
+            result = result / efficiency_value
 
         if loss_value is not None:
             assert loss_value >= 0 or loss_value < 1, f"Arrow with invalid loss ({loss_value}): {self}"
-            out = out - out * loss_value
+            result = result - result * loss_value
 
         if conversion_vector is not None:
-            np.multiply(conversion_vector, out, out=conversion_vector)
-            out = conversion_vector
+            np.multiply(conversion_vector, result, out=conversion_vector)
+            result = conversion_vector
 
         if efficiency_vector is not None:
-            if isinstance(out, float):
-                np.divide(out, efficiency_vector, out=efficiency_vector)
-                out = efficiency_vector
+            if isinstance(result, float):
+                np.divide(result, efficiency_vector, out=efficiency_vector)
+                result = efficiency_vector
             else:
-                np.divide(out, efficiency_vector, out=out)
+                np.divide(result, efficiency_vector, out=result)
 
         if loss_vector is not None:
-            if isinstance(out, float):
-                np.multiply(out, loss_vector, out=loss_vector)
-                np.subtract(out, loss_vector, out=loss_vector)
-                out = loss_vector
+            if isinstance(result, float):
+                np.multiply(result, loss_vector, out=loss_vector)
+                np.subtract(result, loss_vector, out=loss_vector)
+                result = loss_vector
             else:
-                np.multiply(out, loss_vector, out=loss_vector)
-                np.subtract(out, loss_vector, out=out)
+                np.multiply(result, loss_vector, out=loss_vector)
+                np.subtract(result, loss_vector, out=result)
 
-        if isinstance(out, float):
-            num_periods = scenario_horizon.get_num_periods()
-            vector = np.ones(num_periods, dtype=np.float32 if is_float32 else np.float64)
-            vector.fill(out)
-            return vector
+        if isinstance(result, float):
+            if out is None:
+                out = np.empty(scenario_horizon.get_num_periods(), dtype=np.float32 if is_float32 else np.float64)
+            out.fill(result)
+            return out
 
-        return out
+        if out is not None and result is not out:
+            np.copyto(out, result)
+            return out
+
+        return result
 
     def get_data_value(
         self,
@@ -11,13 +11,14 @@ from framcore.expressions import (
     Expr,
     ensure_expr,
     get_leaf_profiles,
+    get_level_series,
     get_level_value,
     get_profile_exprs_from_leaf_levels,
     get_profile_vector,
     get_timeindexes_from_expr,
     get_units_from_expr,
 )
-from framcore.expressions._get_constant_from_expr import _get_constant_from_expr
+from framcore.expressions._get_constant_from_expr import _get_constant_from_expr, _get_constant_series_from_expr
 from framcore.querydbs import QueryDB
 from framcore.timeindexes import FixedFrequencyTimeIndex, SinglePeriodTimeIndex, TimeIndex
 from framcore.timevectors import ConstantTimeVector, ReferencePeriod, TimeVector
@@ -358,6 +359,7 @@ class LevelProfile(Base, ABC):
         level_period: SinglePeriodTimeIndex,
         unit: str | None,
         is_float32: bool = True,
+        out: NDArray | None = None,
     ) -> NDArray:
         """
         Evaluate LevelProfile over the periods in scenario dimension, and at the level period of the data dimension.
@@ -373,9 +375,11 @@ class LevelProfile(Base, ABC):
                 the expression should be unitless.
             is_float32 (bool, optional): Whether to return the vector as a NumPy array with `float32`
                 precision. Defaults to True.
+            out (NDArray | None, optional): Array with one value per period in scenario_horizon to write the result into,
+                e.g. a row of a preallocated matrix. Returned if given. Defaults to None.
 
         """
-        return self._get_scenario_vector(db, scenario_horizon, level_period, unit, is_float32)
+        return self._get_scenario_vector(db, scenario_horizon, level_period, unit, is_float32, out)
 
     def get_data_value(
         self,
@@ -400,6 +404,31 @@ class LevelProfile(Base, ABC):
         """
         return self._get_data_value(db, scenario_horizon, level_period, unit, is_max_level)
 
+    def get_data_series(
+        self,
+        db: QueryDB | Model,
+        scenario_horizon: FixedFrequencyTimeIndex,
+        level_periods: FixedFrequencyTimeIndex,
+        unit: str | None,
+        is_max_level: bool | None = None,
+    ) -> NDArray:
+        """
+        Evaluate LevelProfile to one scalar per period of level_periods in the data dimension, each as an average over the scenario horizon.
+
+        Same as calling get_data_value once for each period of level_periods, but underlying TimeVectors are only evaluated once.
+
+        Args:
+            db (QueryDB | Model): The database or model instance used to fetch the required data.
+            scenario_horizon (FixedFrequencyTimeIndex): TimeIndex of the scenario dimension to evaluate profiles.
+            level_periods (FixedFrequencyTimeIndex): TimeIndex of the data dimension to evaluate levels, e.g. one period per model year.
+            unit (str | None): The unit to convert the resulting values into (e.g., MW, GWh). If None,
+                the expression should be unitless.
+            is_max_level (bool | None, optional): Whether to evaluate the expression as a maximum level (with a zero_one profile)
+                or as an average level (with a mean_one profile). If None, the default format of the attribute is used.
+
+        """
+        return self._get_data_series(db, scenario_horizon, level_periods, unit, is_max_level)
+
     def shift_intercept(self, value: float, unit: str | None) -> None:
         """Modify the intercept part of (level * profile + intercept) of an attribute by adding a constant value."""
         expr = ensure_expr(
@@ -603,6 +632,52 @@ class LevelProfile(Base, ABC):
 
         return level_value + intercept
 
+    def _get_data_series(
+        self,
+        db: QueryDB | Model,
+        scenario_horizon: FixedFrequencyTimeIndex,
+        level_periods: FixedFrequencyTimeIndex,
+        unit: str | None,
+        is_max_level: bool | None,
+    ) -> NDArray:
+        # NB! don't type check db, as this is done in get_level_series
+        self._check_type(scenario_horizon, FixedFrequencyTimeIndex)
+        self._check_type(level_periods, FixedFrequencyTimeIndex)
+        self._check_type(unit, (str, type(None)))
+        self._check_type(is_max_level, (bool, type(None)))
+
+        level_expr = self.get_level()
+
+        if is_max_level is None:
+            is_max_level = self._IS_MAX_AND_ZERO_ONE
+
+        self._check_type(level_expr, (Expr, type(None)))
+        if not isinstance(level_expr, Expr):
+            raise ValueError("Attribute level Expr is None. Have you called Solver.solve yet?")
+
+        level_series = get_level_series(
+            expr=level_expr,
+            db=db,
+            scen_dim=scenario_horizon,
+            data_dims=level_periods,
+            unit=unit,
+            is_max=is_max_level,
+        )
+
+        if self._intercept is None:
+            return level_series
+
+        intercept_series = _get_constant_series_from_expr(
+            self._intercept,
+            db,
+            unit=unit,
+            data_dims=level_periods,
+            scen_dim=scenario_horizon,
+            is_max=is_max_level,
+        )
+
+        return level_series + intercept_series
+
     def _get_scenario_vector(
         self,
         db: QueryDB | Model,
@@ -610,6 +685,7 @@ class LevelProfile(Base, ABC):
         level_period: SinglePeriodTimeIndex,
         unit: str | None,
         is_float32: bool = True,
+        out: NDArray | None = None,
     ) -> NDArray:
         """Return vector with values along the given scenario horizon using level over level_period."""
         # NB! don't type check db, as this is done in get_level_value and get_profile_vector
@@ -617,6 +693,7 @@ class LevelProfile(Base, ABC):
         self._check_type(level_period, SinglePeriodTimeIndex)
         self._check_type(unit, (str, type(None)))
         self._check_type(is_float32, bool)
+        self._check_type(out, (np.ndarray, type(None)))
 
         level_expr = self.get_level()
 
@@ -636,11 +713,15 @@ class LevelProfile(Base, ABC):
         profile_expr = self.get_profile()
 
         if profile_expr is None:
-            profile_vector = np.ones(
-                scenario_horizon.get_num_periods(),
-                dtype=np.float32 if is_float32 else np.float64,
-            )
+            num_periods = scenario_horizon.get_num_periods()
+            if out is None:
+                out = np.empty(num_periods, dtype=np.float32 if is_float32 else np.float64)
+            elif out.shape != (num_periods,):
+                message = f"Expected out with shape {(num_periods,)}, got {out.shape}."
+                raise ValueError(message)
+            out.fill(level_value)
         else:
+            # profile vector is written into out if given, else it may be read-only
             profile_vector = get_profile_vector(
                 expr=profile_expr,
                 db=db,
@@ -648,7 +729,9 @@ class LevelProfile(Base, ABC):
                 data_dim=level_period,
                 is_zero_one=self._IS_MAX_AND_ZERO_ONE,
                 is_float32=is_float32,
+                out=out,
             )
+            out = np.multiply(profile_vector, level_value, out=out)
 
         intercept = None
         if self._intercept is not None:
@@ -661,10 +744,10 @@ class LevelProfile(Base, ABC):
                 is_max=self._IS_MAX_AND_ZERO_ONE,
             )
 
-        if intercept is None:
-            return level_value * profile_vector
+        if intercept is not None:
+            np.add(out, intercept, out=out)
 
-        return level_value * profile_vector + intercept
+        return out
 
     def _has_same_behaviour(self, other: LevelProfile) -> bool:
         return all(
@@ -12,7 +12,6 @@ if TYPE_CHECKING:
     from framcore.loaders import Loader
 
 
-# TODO: Add Expr.add_many to support faster aggregation expressions.
 class Expr(Base):
     """
     Mathematical expression with TimeVectors and Curves to represent Levels and Profiles in LevelProfiles.
@@ -31,19 +30,26 @@ class Expr(Base):
 
     Calculations using Expr are evaluated lazily, reducing unnecessary numerical operations during data manipulation.
     Computations involving values and units occur only when the Expr is queried.
+    Use Expr.add_many and Expr.weighted_sum rather than sum() to build sums of many Expr, since sum() is quadratic in the number of Expr.
+    Expr hash values are computed once and cached. intern_expr can be used to let equal sub-expressions share one object.
 
     We only support calculations using +, -, *, and / in Expr, and we have no plans to change this.
     Expanding beyond these would turn Expr into a complex programming language rather than keeping it as a simple
     and efficient system for common time-series calculations. More advanced operations are still possible through eager evaluation, so this is not a limitation.
     It simply distributes responsibilities across system components in a way that is practical from a maintenance perspective.
 
-    We use SymPy to support unit conversions. Already computed unit conversion factors are cached to minimize redundant calculations.
+    Unit conversions are computed by a small native unit engine (see units.py).
+    Already computed unit conversion factors are cached to minimize redundant calculations.
 
     At the moment we support these queries for Expr (see Aggregators for more about how they are used):
     - get_level_value(expr, db, unit, data_dim, scen_dim, is_max)
         - Supports all expressions. Will evaluate level Exprs at data_dim (with reference period of scen_dim),
             and profile Exprs as an average over scen_dim (both as constants).
-        - Has optimized fastpath methods for sums, products and aggregations. The rest uses a fallback method with SymPy.
+        - Has optimized fastpath methods for sums, products and aggregations. The rest uses a general numeric evaluator.
+    - get_level_values(exprs, db, unit, data_dim, scen_dim, is_max)
+        - Same as get_level_value for many Exprs at once. TimeVectors shared between the Exprs are only evaluated once.
+    - get_level_series(expr, db, unit, data_dims, scen_dim, is_max)
+        - Same as get_level_value for each period of data_dims. Each TimeVector is only evaluated once for all periods.
     - get_profile_vector(expr, db, data_dim, scen_dim, is_zero_one, is_float32)
         - Supports expr = sum(weight[i] * profile[i]) where weight[i] is a unitless constant Expr with value >= 0, and profile[i] is a unitless profile Expr.
 
@@ -109,6 +115,10 @@ class Expr(Base):
             operations = "", []
         self._operations: tuple[str, list[Expr]] = operations
 
+        # Expr is immutable, so the (recursive) hash is computed once, on first use.
+        # Not pickled, since hash values of str differ between processes.
+        self._hash: int | None = None
+
     def _check_operations(self, operations: tuple[str, list[Expr]] | None, expect_ops: bool = False) -> None:
         if operations is None:
             return
@@ -218,6 +228,7 @@ class Expr(Base):
         if not self.is_level():
             raise ValueError("Cannot set profile on Expr that is not a level.")
         self._profile = profile
+        self._hash = None
 
     def _analyze_op(self, op: str, other: Expr) -> tuple[bool, bool, bool, bool, Expr | None]:
         flow = (True, False)
@@ -403,6 +414,77 @@ class Expr(Base):
         message = f"Only support Expr, int, float. Got unsupported type {type(other).__name__}."
         raise TypeError(message)
 
+    @staticmethod
+    def add_many(exprs: list[Expr]) -> Expr:
+        """
+        Return the sum of exprs.
+
+        Gives the same Expr as sum(exprs), but only builds the final operation Expr once.
+        sum(exprs) copies the list of args each time an Expr is added, which is quadratic in len(exprs).
+
+        Args:
+            exprs (list[Expr]): Non-empty list of Expr to add.
+
+        Raises:
+            ValueError: If exprs is empty.
+
+        """
+        if not isinstance(exprs, list | tuple):
+            message = f"Expected list of Expr, got {type(exprs).__name__}."
+            raise TypeError(message)
+        if not exprs:
+            message = "Expected at least one Expr in exprs."
+            raise ValueError(message)
+        for expr in exprs:
+            if not isinstance(expr, Expr):
+                message = f"Expected list of Expr, got element of type {type(expr).__name__}."
+                raise TypeError(message)
+
+        # Add one by one (which may combine constants) until we have a +- operation Expr to extend.
+        out = exprs[0]
+        i = 1
+        while i < len(exprs) and (out.is_leaf() or out.get_operations(expect_ops=True, copy_list=False)[0][-1] not in "+-"):
+            out = out + exprs[i]
+            i += 1
+        if i == len(exprs):
+            return out
+
+        ops, args = out.get_operations(expect_ops=True, copy_list=True)
+        for expr in exprs[i:]:
+            out._analyze_op("+", expr)  # noqa: SLF001
+            args.append(expr)
+        ops = ops + "+" * (len(exprs) - i)
+
+        return Expr(
+            src=None,
+            is_flow=out.is_flow(),
+            is_stock=out.is_stock(),
+            is_level=out.is_level(),
+            is_profile=out.is_profile(),
+            profile=out.get_profile(),
+            operations=(ops, args),
+        )
+
+    @staticmethod
+    def weighted_sum(exprs: list[Expr], weights: list[float]) -> Expr:
+        """
+        Return the sum of weight * expr for each pair of expr and weight.
+
+        Gives the same Expr as sum([w * e for e, w in zip(exprs, weights)]), see Expr.add_many.
+
+        Args:
+            exprs (list[Expr]): Non-empty list of Expr.
+            weights (list[float]): Weight of each Expr.
+
+        Raises:
+            ValueError: If exprs is empty, or exprs and weights have different lengths.
+
+        """
+        if len(exprs) != len(weights):
+            message = f"Expected same number of exprs and weights, got {len(exprs)} and {len(weights)}."
+            raise ValueError(message)
+        return Expr.add_many([weight * expr for expr, weight in zip(exprs, weights, strict=True)])
+
     def __add__(self, other: object) -> Expr:  # noqa: D105
         return self._create_op_expr("+", other, is_rhs=False)
 
@@ -439,8 +521,12 @@ class Expr(Base):
 
     def __eq__(self, other) -> bool:  # noqa: ANN001
         """Check if self and other are equal."""
+        if self is other:
+            return True
         if not isinstance(other, type(self)):
             return False
+        if self._hash is not None and other._hash is not None and self._hash != other._hash:
+            return False
         return (
             self._is_flow == other._is_flow
             and self._is_level == other._is_level
@@ -454,19 +540,32 @@ class Expr(Base):
         )
 
     def __hash__(self) -> int:
-        """Compute hash value.."""
-        return hash(
-            (
-                self._is_flow,
-                self._is_stock,
-                self._is_level,
-                self._is_profile,
-                self._src,
-                self._profile,
-                self._operations[0],
-                tuple(self._operations[1]),
-            ),
-        )
+        """Compute hash value, or return the hash value computed earlier."""
+        if self._hash is None:
+            self._hash = hash(
+                (
+                    self._is_flow,
+                    self._is_stock,
+                    self._is_level,
+                    self._is_profile,
+                    self._src,
+                    self._profile,
+                    self._operations[0],
+                    tuple(self._operations[1]),
+                ),
+            )
+        return self._hash
+
+    def __getstate__(self) -> dict:
+        """Return state for pickle and copy, without the hash value."""
+        state = self.__dict__.copy()
+        state["_hash"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Set state from pickle and copy."""
+        self.__dict__.update(state)
+        self._hash = None
 
     def add_loaders(self, loaders: set[Loader]) -> None:
         """Add all loaders stored in TimeVector or Curve within Expr to loaders."""
@@ -589,3 +688,61 @@ def get_leaf_profiles(expr: Expr) -> list[Expr]:
 
     _traverse(expr)
     return leaf_profiles
+
+
+_INTERNED_EXPRS: dict[Expr, Expr] = dict()
+
+
+def intern_expr(expr: Expr) -> Expr:
+    """
+    Return an Expr equal to expr where structurally identical (sub-)expressions share one object.
+
+    Uses a global table of interned Expr. Interning many Expr that share sub-expressions
+    (e.g. after aggregation) reduces memory, and makes most equality checks an identity check.
+    The table keeps the interned Expr alive until clear_interned_exprs is called.
+
+    Args:
+        expr (Expr): Expr to intern. Is not modified.
+
+    Returns:
+        Expr: The interned Expr.
+
+    """
+    if not isinstance(expr, Expr):
+        message = f"Expected Expr, got {type(expr).__name__}."
+        raise TypeError(message)
+
+    interned = _INTERNED_EXPRS.get(expr)
+    if interned is not None:
+        return interned
+
+    profile = expr.get_profile()
+    interned_profile = None if profile is None else intern_expr(profile)
+
+    if expr.is_leaf():
+        is_same = interned_profile is profile
+        args = None
+    else:
+        ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+        interned_args = [intern_expr(arg) for arg in args]
+        is_same = interned_profile is profile and all(a is b for a, b in zip(args, interned_args, strict=True))
+        args = interned_args
+
+    if not is_same:
+        expr = Expr(
+            src=expr.get_src(),
+            is_stock=expr.is_stock(),
+            is_flow=expr.is_flow(),
+            is_profile=expr.is_profile(),
+            is_level=expr.is_level(),
+            profile=interned_profile,
+            operations=None if args is None else (ops, args),
+        )
+
+    _INTERNED_EXPRS[expr] = expr
+    return expr
+
+
+def clear_interned_exprs() -> None:
+    """Remove all Expr from the global table used by intern_expr."""
+    _INTERNED_EXPRS.clear()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import mmap
+import multiprocessing
+import sys
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+from framcore import Base
+from framcore.expressions._utils import _load_model_and_create_model_db
+from framcore.expressions.Expr import Expr
+from framcore.expressions.queries import get_level_value
+from framcore.querydbs import QueryDB
+from framcore.timeindexes import FixedFrequencyTimeIndex, SinglePeriodTimeIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from framcore import Model
+    from framcore.attributes import LevelProfile
+
+# Job of the running QueryExecutor. Set before the worker processes are forked, so that
+# workers share db (and the Model behind it) copy-on-write instead of getting a pickled copy,
+# and write results into an output array in shared memory instead of sending them back.
+_WORKER_JOB: tuple[Callable, QueryDB, list, tuple, NDArray] | None = None
+
+# Number of chunks per worker. More chunks gives better load balance, fewer chunks gives less overhead.
+_CHUNKS_PER_WORKER = 4
+
+
+class QueryExecutor(Base):
+    """
+    Run many queries against the same db over a pool of worker processes.
+
+    Gives the same results as querying each Expr or LevelProfile in turn, but spreads the work over num_workers processes.
+    Results are written in place into a preallocated array, in the same order as the queried items. Workers write into
+    a shared memory copy of it, which is copied into the returned array once all workers are done.
+
+    On Linux, workers are forked after db (and the Model behind it) is loaded, so workers share it copy-on-write.
+    Where fork is not available, or num_workers is 1, queries are run serially in the calling process.
+    Values computed and cached by workers (e.g. in a CacheDB) are not sent back to db. With a SharedMemoryCacheDB,
+    arrays computed by one worker are shared with the other workers and with the calling process.
+
+    Typically num_workers is taken from SolverConfig.get_num_cpu_cores().
+    """
+
+    def __init__(self, db: QueryDB | Model, num_workers: int = 1) -> None:
+        """
+        Initialize QueryExecutor.
+
+        Args:
+            db (QueryDB | Model): Model or QueryDB to run queries against.
+            num_workers (int, optional): Number of worker processes. Defaults to 1.
+
+        """
+        self._check_type(num_workers, int)
+        self._check_int(value=num_workers, lower_bound=1, upper_bound=None)
+        self._db = _load_model_and_create_model_db(db)
+        self._num_workers = num_workers
+
+    def get_num_workers(self) -> int:
+        """Return number of worker processes."""
+        return self._num_workers
+
+    def get_level_values(
+        self,
+        items: list[Expr | LevelProfile],
+        unit: str | None,
+        data_dim: SinglePeriodTimeIndex,
+        scen_dim: FixedFrequencyTimeIndex,
+        is_max: bool,
+    ) -> NDArray:
+        """
+        Evaluate level Exprs with get_level_value and LevelProfiles with get_data_value.
+
+        Returns:
+            NDArray with one value per item, in the same order as items.
+
+        """
+        self._check_items(items, allow_expr=True)
+        self._check_type(unit, (str, type(None)))
+        self._check_type(data_dim, SinglePeriodTimeIndex)
+        self._check_type(scen_dim, FixedFrequencyTimeIndex)
+        self._check_type(is_max, bool)
+
+        out = np.zeros(len(items), dtype=np.float64)
+        self._run(_get_level_value_of_item, items, (unit, data_dim, scen_dim, is_max), out)
+        return out
+
+    def get_scenario_vectors(
+        self,
+        items: list[LevelProfile],
+        unit: str | None,
+        data_dim: SinglePeriodTimeIndex,
+        scen_dim: FixedFrequencyTimeIndex,
+        is_float32: bool = True,
+    ) -> NDArray:
+        """
+        Evaluate LevelProfiles with get_scenario_vector.
+
+        Returns:
+            NDArray with shape (len(items), scen_dim.get_num_periods()), with one row per item in the same order as items.
+
+        """
+        self._check_items(items, allow_expr=False)
+        self._check_type(unit, (str, type(None)))
+        self._check_type(data_dim, SinglePeriodTimeIndex)
+        self._check_type(scen_dim, FixedFrequencyTimeIndex)
+        self._check_type(is_float32, bool)
+
+        out = np.zeros((len(items), scen_dim.get_num_periods()), dtype=np.float32 if is_float32 else np.float64)
+        self._run(_get_scenario_vector_of_item, items, (unit, data_dim, scen_dim, is_float32), out)
+        return out
+
+    def _check_items(self, items: list, allow_expr: bool) -> None:
+        from framcore.attributes import LevelProfile
+
+        self._check_type(items, (list, tuple))
+        for item in items:
+            self._check_type(item, (Expr, LevelProfile) if allow_expr else LevelProfile)
+
+    def _run(self, func: Callable, items: list, args: tuple, out: NDArray) -> None:
+        """Write func(item, db, *args) into out[i] for each items[i]."""
+        num_workers = min(self._num_workers, len(items))
+        if num_workers <= 1 or not _can_fork():
+            _write_items((func, self._db, items, args, out), 0, len(items))
+            return
+
+        num_chunks = min(len(items), num_workers * _CHUNKS_PER_WORKER)
+        bounds = np.linspace(0, len(items), num_chunks + 1).astype(int)
+        chunks = list(zip(bounds[:-1].tolist(), bounds[1:].tolist(), strict=True))
+
+        # Anonymous mmap is shared with forked workers, so their writes are seen by this process
+        shared_out = np.ndarray(out.shape, dtype=out.dtype, buffer=mmap.mmap(-1, max(out.nbytes, 1)))
+
+        global _WORKER_JOB  # noqa: PLW0603
+        _WORKER_JOB = (func, self._db, items, args, shared_out)
+        try:
+            with multiprocessing.get_context("fork").Pool(num_workers) as pool:
+                pool.map(_run_chunk, chunks)
+        finally:
+            _WORKER_JOB = None
+        out[...] = shared_out
+
+
+def _can_fork() -> bool:
+    return sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods()
+
+
+def _run_chunk(chunk: tuple[int, int]) -> None:
+    """Run job of QueryExecutor for items[start:stop] in a worker process."""
+    start, stop = chunk
+    _write_items(_WORKER_JOB, start, stop)
+
+
+def _write_items(job: tuple[Callable, QueryDB, list, tuple, NDArray], start: int, stop: int) -> None:
+    """Write func(item, db, *args) into out[i] for items[start:stop]."""
+    func, db, items, args, out = job
+    for i in range(start, stop):
+        if out.ndim == 1:
+            out[i] = func(items[i], db, *args)
+        else:
+            func(items[i], db, *args, out=out[i])  # write directly into row
+
+
+def _get_level_value_of_item(
+    item: Expr | LevelProfile,
+    db: QueryDB,
+    unit: str | None,
+    data_dim: SinglePeriodTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_max: bool,
+) -> float:
+    if isinstance(item, Expr):
+        return get_level_value(item, db, unit, data_dim, scen_dim, is_max)
+    return item.get_data_value(db, scen_dim, data_dim, unit, is_max_level=is_max)
+
+
+def _get_scenario_vector_of_item(
+    item: LevelProfile,
+    db: QueryDB,
+    unit: str | None,
+    data_dim: SinglePeriodTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_float32: bool,
+    out: NDArray | None = None,
+) -> NDArray:
+    return item.get_scenario_vector(db, scen_dim, data_dim, unit, is_float32, out=out)
@@ -1,30 +1,50 @@
 # framcore/expressions/__init__.py
 
-from framcore.expressions.Expr import Expr, ensure_expr, get_leaf_profiles, get_profile_exprs_from_leaf_levels
+from framcore.expressions.Expr import (
+    Expr,
+    clear_interned_exprs,
+    ensure_expr,
+    get_leaf_profiles,
+    get_profile_exprs_from_leaf_levels,
+    intern_expr,
+)
 
 from framcore.expressions.units import (
+    enable_persistent_unit_cache,
+    flush_persistent_unit_cache,
     get_unit_conversion_factor,
     is_convertable,
     validate_unit_conversion_fastpaths,
 )
 
 from framcore.expressions.queries import (
+    get_level_series,
     get_level_value,
+    get_level_values,
     get_profile_vector,
     get_units_from_expr,
     get_timeindexes_from_expr,
 )
 
+from framcore.expressions.QueryExecutor import QueryExecutor
+
 __all__ = [
     "Expr",
+    "QueryExecutor",
+    "clear_interned_exprs",
+    "enable_persistent_unit_cache",
     "ensure_expr",
+    "flush_persistent_unit_cache",
     "get_leaf_profiles",
+    "get_level_series",
     "get_level_value",
+    "get_level_values",
     "get_profile_exprs_from_leaf_levels",
     "get_profile_vector",
     "get_timeindexes_from_expr",
     "get_unit_conversion_factor",
     "get_units_from_expr",
+    "intern_expr",
     "is_convertable",
     "validate_unit_conversion_fastpaths",
 ]
@@ -4,25 +4,29 @@ Implementation of _get_constant_from_expr.
 The first implementation used the _sympy_fallback function in all cases.
 This turned out to be very slow for large expressions. Therefore,
 we collected data on common expressions that turn up in aggregation,
-and added fast paths for these cases.
+and added fast paths for these cases. Other expressions are evaluated
+by a general numeric evaluator, so the _sympy_fallback is now only used
+to verify results when _DEBUG is True.
 
 Since this results in more code than the original,
-we put this function in its own file.
+we put this function in its own file. The classification of expressions
+into fast paths is compiled once per expression into a _LevelPlan (see _level_plan.py).
 """
 
 from __future__ import annotations
 
-from time import time
+import time
 from typing import TYPE_CHECKING
 
-import sympy
+import numpy as np
+from numpy.typing import NDArray
 
 from framcore.curves import Curve
-from framcore.events import send_warning_event
 from framcore.expressions import Expr
-from framcore.expressions._utils import _ensure_real_expr, _load_model_and_create_model_db, _lookup_expr_from_constants_with_units
-from framcore.expressions.units import _get_scalar_from_expr, _unit_str_to_sym, get_unit_conversion_factor
-from framcore.querydbs import QueryDB
+from framcore.expressions._level_plan import _get_level_plan, _LevelPlan
+from framcore.expressions._utils import _ensure_real_expr, _load_model_and_create_model_db
+from framcore.expressions.units import _get_scalar_from_expr, _record_unit_stats, _unit_str_to_sym
+from framcore.querydbs import QueryDB, QueryStats
 from framcore.timeindexes import FixedFrequencyTimeIndex, SinglePeriodTimeIndex
 from framcore.timevectors import ConstantTimeVector, TimeVector
 
@@ -31,29 +35,6 @@ if TYPE_CHECKING:
 
 _DEBUG = False
 _DEBUG_ROUND_DECIMALS = 5
-_WARN_IF_FALLBACK = True
-_WARN_MAX_ELAPSED_SECONDS = 0.1
-
-_NUM_LEAF = 0
-_NUM_FALLBACK = 0
-_NUM_FASTPATH_PRODUCT = 0
-_NUM_FASTPATH_AGGREGATION = 0
-_NUM_FASTPATH_SUM = 0
-
-
-def _get_case_counts() -> dict[str, int]:
-    """
-    Return dict of counts for different cases of _get_constant_from_expr.
-
-    Useful for fastpath development.
-    """
-    return {
-        "fastpath_leaf": _NUM_LEAF,
-        "fallback": _NUM_FALLBACK,
-        "fastpath_sum": _NUM_FASTPATH_SUM,
-        "fastpath_product": _NUM_FASTPATH_PRODUCT,
-        "fastpath_aggregation": _NUM_FASTPATH_AGGREGATION,
-    }
 
 
 def _get_constant_from_expr(
@@ -72,389 +53,196 @@ def _get_constant_from_expr(
 
     real_expr = _ensure_real_expr(expr, db)
 
-    constants_with_units = dict()
-
-    expr_str = _update_constants_with_units(
-        constants_with_units,
-        real_expr,
-        db,
-        data_dim,
-        scen_dim,
-        is_max,
-    )
-
-    # counts for debug and optimization
-    global _NUM_LEAF  # noqa: PLW0603
-    global _NUM_FALLBACK  # noqa: PLW0603
-    global _NUM_FASTPATH_PRODUCT  # noqa: PLW0603
-    global _NUM_FASTPATH_AGGREGATION  # noqa: PLW0603
-    global _NUM_FASTPATH_SUM  # noqa: PLW0603
-
-    fastpath = None
-
-    if real_expr.is_leaf():
-        _NUM_LEAF += 1
-        fastpath = _fastpath_leaf(constants_with_units, real_expr, unit)
-
-    elif _is_fastpath_sum(expr):
-        _NUM_FASTPATH_SUM += 1
-        fastpath = _fastpath_sum(constants_with_units, real_expr, unit)
+    plan = _get_level_plan(real_expr)
 
-    elif _is_fastpath_product(real_expr):
-        _NUM_FASTPATH_PRODUCT += 1
-        fastpath = _fastpath_product(constants_with_units, real_expr, unit)
+    leaf_values = _get_leaf_values_with_units(plan.get_leaves(), db, data_dim, scen_dim, is_max)
 
-    elif _is_fastpath_aggregation(real_expr):
-        _NUM_FASTPATH_AGGREGATION += 1
-        fastpath = _fastpath_aggregation(constants_with_units, real_expr, unit)
+    return _evaluate_level_plan(plan, real_expr, leaf_values, unit, db.get_stats())
 
-    if fastpath is not None and _DEBUG is not True:
-        return fastpath
 
-    _NUM_FALLBACK += 1
-    t = time()
-    fallback = _sympy_fallback(constants_with_units, expr_str, unit)
-    elapsed_seconds_fallback = time() - t
-
-    if _DEBUG and fastpath is not None and round(fastpath, _DEBUG_ROUND_DECIMALS) != round(fallback, _DEBUG_ROUND_DECIMALS):
-        message = f"Different results!\nExpr {real_expr}\nwith symbolic representation {expr_str}\nfastpath {fastpath} and fallback {fallback}"
-        raise RuntimeError(message)
+def _get_constants_from_exprs(
+    exprs: list[Expr],
+    db: QueryDB,
+    unit: str | None,
+    data_dim: SinglePeriodTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_max: bool,
+) -> list[float]:
+    """Evaluate each expr like _get_constant_from_expr, but only evaluate leaves shared between exprs once."""
+    memo = dict()
+    real_exprs = [_ensure_real_expr(expr, db, memo) for expr in exprs]
+    plans = [_get_level_plan(real_expr) for real_expr in real_exprs]
 
-    if _DEBUG is False and _WARN_IF_FALLBACK is True and elapsed_seconds_fallback > _WARN_MAX_ELAPSED_SECONDS:
-        message = f"fallback used {elapsed_seconds_fallback} seconds for (symbolic) expr: {expr_str}"
-        send_warning_event(sender=_get_constant_from_expr, message=message)
+    leaves = dict.fromkeys(leaf for plan in plans for leaf in plan.get_leaves())
+    leaf_values = _get_leaf_values_with_units(list(leaves), db, data_dim, scen_dim, is_max)
 
-    return fallback
+    stats = db.get_stats()
+    return [_evaluate_level_plan(plan, real_expr, leaf_values, unit, stats) for plan, real_expr in zip(plans, real_exprs, strict=True)]
 
 
-def _update_constants_with_units(
-    constants_with_units: dict[str, tuple],
-    real_expr: Expr,
-    db: QueryDB,
-    data_dim: SinglePeriodTimeIndex,
+def _get_constant_series_from_expr(
+    expr: Expr,
+    db: QueryDB | Model,
+    unit: str | None,
+    data_dims: FixedFrequencyTimeIndex,
     scen_dim: FixedFrequencyTimeIndex,
     is_max: bool,
-) -> str:
-    """Extract symbol, constant value and unit info from all leaf expressions of real_expr."""
+) -> NDArray:
+    """Evaluate expr like _get_constant_from_expr for each period of data_dims, but only resample each leaf once."""
     # To avoid circular import TODO: improve?
-    from framcore.expressions.queries import _get_level_value_from_timevector
+    from framcore.expressions.queries import _get_level_value_from_period_average, _get_period_average_series, _is_profile_independent_of_data_dim
 
-    if real_expr.is_leaf():
-        is_level = real_expr.is_level()
-        is_profile = real_expr.is_profile()
+    if not isinstance(expr, Expr):
+        message = f"Expected Expr, got {expr}"
+        raise ValueError(message)
 
-        src = real_expr.get_src()
+    db = _load_model_and_create_model_db(db)
 
-        if isinstance(src, str) and db.has_key(src):
-            obj = db.get(src)
-            assert not isinstance(obj, Expr), f"{obj}"
-            assert isinstance(obj, TimeVector | Curve), f"{obj}"
+    real_expr = _ensure_real_expr(expr, db)
 
-        elif isinstance(src, ConstantTimeVector):
-            obj: ConstantTimeVector = src
-            src = obj.get_expr_str()
+    plan = _get_level_plan(real_expr)
+
+    data_dim_list = [
+        SinglePeriodTimeIndex(
+            start_time=start_time,
+            period_duration=data_dims.get_period_duration(),
+            is_52_week_years=data_dims.is_52_week_years(),
+            extrapolate_first_point=data_dims.extrapolate_first_point(),
+            extrapolate_last_point=data_dims.extrapolate_last_point(),
+        )
+        for start_time in data_dims.get_datetime_list()[:-1]
+    ]
+
+    leaves = plan.get_leaves()
+    timevectors = [_get_leaf_timevector(leaf, db) for leaf in leaves]
+    period_average_series = _get_period_average_series(timevectors, data_dims, db)
+
+    # Level values are linear in the period average. The factor only depends on data_dim through profile weights.
+    leaf_series = []
+    for leaf, timevector, period_averages in zip(leaves, timevectors, period_average_series, strict=True):
+        leaf_unit = timevector.get_unit()
+        profile_expr = leaf.get_profile()
+        if _is_profile_independent_of_data_dim(profile_expr, db):
+            data_dim = data_dim_list[0]
+            factors = _get_level_value_from_period_average(1.0, timevector, db, leaf_unit, data_dim, scen_dim, is_max, profile_expr)
         else:
-            message = f"Unexpected value for src: {src}\nin expr {real_expr}"
-            raise ValueError(message)
-
-        if src in constants_with_units:
-            sym, value, unit = constants_with_units[src]
-            return sym
-
-        if isinstance(obj, TimeVector):
-            obj: TimeVector
-
-            # added to support any_expr * ConstantTimeVector. We added this to support LevelProfile.scale()
-            times_constant_case = (not is_profile) and isinstance(obj, ConstantTimeVector)
-
-            if is_level or times_constant_case:
-                unit = obj.get_unit()
-                profile_expr = real_expr.get_profile()
-                value = _get_level_value_from_timevector(obj, db, unit, data_dim, scen_dim, is_max, profile_expr)
-                sym = f"x{len(constants_with_units)}"
-                constants_with_units[src] = (sym, float(value), unit)
-                return sym
-
-            if not is_profile:
-                message = f"Unsupported case where expr is not level and not profile:\nexpr: {real_expr}\nobj: {obj}"
-                raise ValueError(message)
-
-            assert is_profile
-
-            raise NotImplementedError("Profile TimeVector not implemented yet")
-        raise NotImplementedError("Curve not implemented yet")
-
-    ops, args = real_expr.get_operations(expect_ops=True, copy_list=False)
-
-    x = _update_constants_with_units(constants_with_units, args[0], db, data_dim, scen_dim, is_max)
-    out = f"{x}"
-    for op, arg in zip(ops, args[1:], strict=True):
-        x = _update_constants_with_units(constants_with_units, arg, db, data_dim, scen_dim, is_max)
-        out = f"{out} {op} {x}"
-
-    return f"({out})"
-
-
-def _is_fastpath_sum(expr: Expr) -> bool:
-    """E.g. x0 + x1 + x2 + .. where x is leaf."""
-    if expr.is_leaf():
-        return True
-    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
-    if ops[0] not in "+-":
-        return False
-    return all(arg.is_leaf() for arg in args)
-
-
-def _is_fastpath_product(expr: Expr) -> bool:
-    """E.g. x1 * (x2 + x3), or x1 * x2 * x3 where x is leaf."""
-    if expr.is_leaf():
-        return True
-    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
-    if not all(op == "*" for op in ops):
-        return False
-    return all(arg.is_leaf() or _is_fastpath_sum(arg) for arg in args)
-
-
-def _is_fastpath_sum_of_products(expr: Expr) -> bool:
-    """E.g. x1 * (x2 + x3) + x4 * x5 where x is leaf."""
-    if expr.is_leaf():
-        return True
-    if _is_fastpath_product(expr):
-        return True
-    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
-    if ops[0] not in "+-":
-        return False
-    return all(_is_fastpath_product(arg) for arg in args)
-
-
-def _is_fastpath_aggregation(expr: Expr) -> bool:
-    """E.g. ((x1 * (x2 + x3) + x4 * x5) / (x6 + x7)) where x is leaf."""
-    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
-    if ops != "/":
-        return False
-    try:
-        numerator, denominator = args
-    except Exception:
-        return False
-    if not _is_fastpath_sum_of_products(numerator):
-        return False
-    return _is_fastpath_sum(denominator)
-
-
-def _fastpath_leaf(
-    constants_with_units: dict[str, tuple],
-    expr: Expr,
-    target_unit: str | None,
-) -> float:
-    __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, expr)
-    if unit == target_unit:
-        return value
-    return get_unit_conversion_factor(unit, target_unit) * value
+            factors = np.array(
+                [_get_level_value_from_period_average(1.0, timevector, db, leaf_unit, data_dim, scen_dim, is_max, profile_expr) for data_dim in data_dim_list],
+            )
+        leaf_series.append((period_averages.astype(np.float64) * factors, leaf_unit))
+
+    stats = db.get_stats()
+    out = np.zeros(len(data_dim_list), dtype=np.float64)
+    for i in range(len(data_dim_list)):
+        leaf_values = {leaf: (float(series[i]), leaf_unit) for leaf, (series, leaf_unit) in zip(leaves, leaf_series, strict=True)}
+        out[i] = _evaluate_level_plan(plan, real_expr, leaf_values, unit, stats)
+    return out
 
 
-def _fastpath_sum(
-    constants_with_units: dict[str, tuple],
-    expr: Expr,
-    target_unit: str | None,
+def _evaluate_level_plan(
+    plan: _LevelPlan,
+    real_expr: Expr,
+    leaf_values: dict[Expr, tuple[float, str | None]],
+    unit: str | None,
+    stats: QueryStats | None,
 ) -> float:
-    d = _get_fastpath_sum_dict(constants_with_units, expr)
-
-    out = 0.0
-    for unit, value in d.items():
-        if value == 0.0:
-            continue
-        if unit == target_unit:
-            out += value
-        else:
-            out += value * get_unit_conversion_factor(unit, target_unit)
-
-    return out
+    values = []
+    units = []
+    for leaf in plan.get_leaves():
+        value, leaf_unit = leaf_values[leaf]
+        values.append(value)
+        units.append(leaf_unit)
+
+    if stats is None:
+        value = plan.evaluate(values, units, unit)
+    else:
+        t0 = time.perf_counter()
+        with _record_unit_stats(stats):
+            value = plan.evaluate(values, units, unit)
+        t1 = time.perf_counter()
+        stats.record_path(plan.get_kind(), t1 - t0, real_expr)
+
+    if _DEBUG is not True:
+        return value
 
+    t0 = time.perf_counter()
+    expr_str = plan.get_expr_str()
+    fallback = _sympy_fallback(plan.get_constants_with_units(values, units), expr_str, unit)
+    t1 = time.perf_counter()
+    if stats is not None:
+        stats.record_path("fallback", t1 - t0, real_expr)
 
-def _fastpath_product(
-    constants_with_units: dict[str, tuple],
-    expr: Expr,
-    target_unit: str | None,
-) -> float:
-    d = _get_fastpath_product_dict(constants_with_units, expr)
+    if round(value, _DEBUG_ROUND_DECIMALS) != round(fallback, _DEBUG_ROUND_DECIMALS):
+        message = f"Different results!\nExpr {real_expr}\nwith symbolic representation {expr_str}\nkind {plan.get_kind()} {value} and fallback {fallback}"
+        raise RuntimeError(message)
 
-    out = 1.0
-    from_unit = None
-    for unit, value in d.items():
-        if value == 0.0:
-            return 0.0
-        out *= value
-        if unit is None:
-            continue
-        from_unit = unit if from_unit is None else f"{from_unit} * {unit}"
+    return value
 
-    if not from_unit:
-        return out
 
-    return out * get_unit_conversion_factor(from_unit, target_unit)
+def _get_leaf_values_with_units(
+    leaves: list[Expr],
+    db: QueryDB,
+    data_dim: SinglePeriodTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_max: bool,
+) -> dict[Expr, tuple[float, str | None]]:
+    """Get constant value and unit of leaf expressions of real exprs. Period averages are computed once per TimeVector."""
+    # To avoid circular import TODO: improve?
+    from framcore.expressions.queries import _get_level_value_from_period_average, _get_period_averages
 
+    timevectors = [_get_leaf_timevector(leaf, db) for leaf in leaves]
+    period_averages = _get_period_averages(timevectors, data_dim, db)
 
-def _fastpath_aggregation(  # noqa: C901, PLR0911
-    constants_with_units: dict[str, tuple],
-    expr: Expr,
-    target_unit: str | None,
-) -> float:
-    __, args = expr.get_operations(expect_ops=True, copy_list=False)
-    numerator, denominator = args
+    out = dict()
+    for leaf, timevector, period_average in zip(leaves, timevectors, period_averages, strict=True):
+        unit = timevector.get_unit()
+        profile_expr = leaf.get_profile()
+        value = _get_level_value_from_period_average(period_average, timevector, db, unit, data_dim, scen_dim, is_max, profile_expr)
+        out[leaf] = (float(value), unit)
+    return out
 
-    num = _get_fastpath_aggregation_numerator_dict(constants_with_units, numerator)
-    dem = _get_fastpath_aggregation_denominator_dict(constants_with_units, denominator)
 
-    if len(dem) == len(num) == 1:
-        num_unit, num_value = next(iter(num.items()))
-        dem_unit, dem_value = next(iter(dem.items()))
+def _get_leaf_timevector(leaf: Expr, db: QueryDB) -> TimeVector:
+    """Get TimeVector of a level leaf expression of a real expr."""
+    is_level = leaf.is_level()
+    is_profile = leaf.is_profile()
 
-        not_num_unit = num_unit is None
-        not_dem_unit = dem_unit is None
-        has_num_unit = num_unit is not None
-        has_dem_unit = dem_unit is not None
+    src = leaf.get_src()
 
-        if not_num_unit and not_dem_unit:
-            if target_unit is None:
-                return num_value / dem_value
-            message = f"Could not convert to {target_unit} with numerator {numerator} and denominator {denominator} for expr {expr}"
-            raise ValueError(message)
+    if isinstance(src, str) and db.has_key(src):
+        obj = db.get(src)
+        assert not isinstance(obj, Expr), f"{obj}"
+        assert isinstance(obj, TimeVector | Curve), f"{obj}"
 
-        if not_dem_unit and has_num_unit:
-            if target_unit == num_unit:
-                return num_value / dem_value
-            return get_unit_conversion_factor(num_unit, target_unit) * (num_value / dem_value)
-        if has_dem_unit and not_num_unit:
-            inverse_dem_unit = f"1/({dem_unit})"
-            if target_unit == inverse_dem_unit:
-                return num_value / dem_value
-            return get_unit_conversion_factor(inverse_dem_unit, target_unit) * (num_value / dem_value)
-        combined_unit = f"{num_unit}/({dem_unit})"
-        if target_unit == combined_unit:
-            return num_value / dem_value
-        return get_unit_conversion_factor(combined_unit, target_unit) * (num_value / dem_value)
-
-    new_constants_with_units = dict()
-
-    combined_num = ""
-    for unit, value in num.items():
-        sym = f"x{len(new_constants_with_units)}"
-        new_constants_with_units[sym] = (sym, value, unit)
-        combined_num = f"{combined_num} + {sym}"
-
-    combined_dem = ""
-    for unit, value in dem.items():
-        sym = f"x{len(new_constants_with_units)}"
-        new_constants_with_units[sym] = (sym, value, unit)
-        combined_dem = f"{combined_dem} + {sym}"
-
-    combined = f"({combined_num})/({combined_dem})"
-
-    return _sympy_fallback(new_constants_with_units, combined, target_unit)
-
-
-def _get_fastpath_sum_dict(
-    constants_with_units: dict[str, tuple],
-    expr: Expr,
-) -> dict[str | None, float]:
-    d = dict()
-    if expr.is_leaf():
-        __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, expr)
-        return {unit: value}
-    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
-    __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, args[0])
-    d[unit] = value
-    for op, arg in zip(ops, args[1:], strict=True):
-        __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, arg)
-        contribution = value if op == "+" else -value
-        if unit not in d:
-            d[unit] = contribution
-        else:
-            d[unit] += contribution
-    return d
+    elif isinstance(src, ConstantTimeVector):
+        obj: ConstantTimeVector = src
+    else:
+        message = f"Unexpected value for src: {src}\nin expr {leaf}"
+        raise ValueError(message)
 
+    if isinstance(obj, TimeVector):
+        obj: TimeVector
 
-def _get_fastpath_product_dict(
-    constants_with_units: dict[str, tuple],
-    expr: Expr,
-) -> dict[str | None, float]:
-    d = dict()
-    if expr.is_leaf():
-        __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, expr)
-        return {unit: value}
-    __, args = expr.get_operations(expect_ops=True, copy_list=False)
-    for arg in args:
-        if _is_fastpath_sum(arg):
-            values = _get_fastpath_sum_dict(constants_with_units, arg)
-        else:
-            __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, arg)
-            values = {unit: value}
-        for unit, value in values.items():
-            if unit not in d:
-                d[unit] = value
-            else:
-                d[unit] *= value
-    return d
-
-
-def _get_fastpath_product_unit(d: dict[str | None, float]) -> tuple[float, str | None]:
-    combined_value = 1.0
-    combined_unit = []
-    for unit, value in d.items():
-        combined_value *= value
-        if unit is not None:
-            combined_unit.append(unit)
-    if not combined_unit:
-        return combined_value, None
-    return combined_value, "*".join(sorted(f"({s})" for s in combined_unit))
+        # added to support any_expr * ConstantTimeVector. We added this to support LevelProfile.scale()
+        times_constant_case = (not is_profile) and isinstance(obj, ConstantTimeVector)
 
+        if is_level or times_constant_case:
+            return obj
 
-def _get_fastpath_aggregation_numerator_dict(
-    constants_with_units: dict[str, tuple],
-    expr: Expr,
-) -> dict[str | None, float]:
-    if expr.is_leaf():
-        __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, expr)
-        return {unit: value}
-    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
-    out = dict()
-    value, unit = _get_fastpath_product_unit(_get_fastpath_product_dict(constants_with_units, args[0]))
-    out[unit] = value
-    for op, arg in zip(ops, args[1:], strict=True):
-        value, unit = _get_fastpath_product_unit(_get_fastpath_product_dict(constants_with_units, arg))
-        contribution = value if op == "+" else -value
-        if unit not in out:
-            out[unit] = contribution
-        else:
-            out[unit] += contribution
-    return out
+        if not is_profile:
+            message = f"Unsupported case where expr is not level and not profile:\nexpr: {leaf}\nobj: {obj}"
+            raise ValueError(message)
 
+        assert is_profile
 
-def _get_fastpath_aggregation_denominator_dict(
-    constants_with_units: dict[str, tuple],
-    expr: Expr,
-) -> dict[str | None, float]:
-    if expr.is_leaf():
-        __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, expr)
-        return {unit: value}
-    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
-    d = dict()
-    __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, args[0])
-    d[unit] = value
-    for op, arg in zip(ops, args[1:], strict=True):
-        __, value, unit = _lookup_expr_from_constants_with_units(constants_with_units, arg)
-        if value == 0.0:
-            continue
-        contribution = value if op == "+" else -value
-        if unit not in d:
-            d[unit] = contribution
-        else:
-            d[unit] += contribution
-    return d
+        raise NotImplementedError("Profile TimeVector not implemented yet")
+    raise NotImplementedError("Curve not implemented yet")
 
 
 def _sympy_fallback(constants_with_units: dict[str, tuple], expr_str: str, target_unit: str | None) -> float:
     """Convert expr to sympy expr, substitue in constants with units, and let sympy evaluate."""
+    import sympy
+
     expr_sym = sympy.sympify(expr_str)
     for src, (sym, value, unit) in constants_with_units.items():
         sympy_sym = sympy.Symbol(sym)
@@ -0,0 +1,477 @@
+"""
+Compiled evaluation plans for level queries.
+
+_get_constant_from_expr is called many times for the same expressions with different
+data_dim and scen_dim. Walking the Expr tree, building the symbolic representation
+and classifying the expression into a fastpath gives the same result every time.
+A _LevelPlan does this work once per expression, so that later calls only
+need to compute the leaf values and run a short numeric loop over them.
+
+Expressions that do not match a fastpath are evaluated by a general numeric evaluator,
+which carries (value, dimensions) pairs in base units through the +-*/ tree and only converts
+to the target unit at the root.
+"""
+
+from __future__ import annotations
+
+from framcore.expressions import Expr
+from framcore.expressions.units import _multiply_units, _parse_unit, get_unit_conversion_factor
+from framcore.timevectors import ConstantTimeVector
+
+_KIND_LEAF = "leaf"
+_KIND_SUM = "sum"
+_KIND_PRODUCT = "product"
+_KIND_SUM_OF_PRODUCTS = "sum_of_products"
+_KIND_AGGREGATION = "aggregation"
+_KIND_GENERAL = "general"
+
+_MAX_NUM_PLANS = 10_000
+
+_PLANS: dict[Expr, _LevelPlan] = dict()
+
+
+def _get_level_plan(real_expr: Expr) -> _LevelPlan:
+    """Get cached plan for real_expr, or compile and cache a new one."""
+    plan = _PLANS.get(real_expr)
+    if plan is None:
+        plan = _LevelPlan(real_expr)
+        if len(_PLANS) >= _MAX_NUM_PLANS:
+            del _PLANS[next(iter(_PLANS))]
+        _PLANS[real_expr] = plan
+    return plan
+
+
+def _clear_level_plans() -> None:
+    """Remove all cached plans."""
+    _PLANS.clear()
+
+
+class _LevelPlan:
+    """
+    Flat evaluation plan for a real level Expr (i.e. an Expr without references to other Expr).
+
+    Holds one slot per unique leaf (in the same order as the x0, x1, .. symbols of the
+    symbolic representation), the fastpath kind of the expression, and a layout of slot indices
+    describing the operations. Unit conversion factors are computed once for each combination of
+    leaf units and target unit, and stored in the plan.
+    """
+
+    def __init__(self, real_expr: Expr) -> None:
+        """Compile real_expr into a plan."""
+        self._keys: list[str] = []
+        self._leaves: list[Expr] = []
+        slots: dict[str, int] = dict()
+        self._expr_str = self._compile_expr_str(real_expr, slots)
+        self._kind, self._layout = _compile_layout(real_expr, slots)
+        self._tree = _compile_tree(real_expr, slots)
+        self._programs: dict[tuple[tuple[str | None, ...], str | None], object] = dict()
+
+    def get_kind(self) -> str:
+        """Get the fastpath kind (leaf, sum, product, sum_of_products, aggregation or general)."""
+        return self._kind
+
+    def get_leaves(self) -> list[Expr]:
+        """Get the first leaf Expr of each slot."""
+        return self._leaves
+
+    def get_expr_str(self) -> str:
+        """Get symbolic representation of the expression using symbols x0, x1, .. for the slots."""
+        return self._expr_str
+
+    def get_constants_with_units(self, values: list[float], units: list[str | None]) -> dict[str, tuple]:
+        """Get dict {src: (symbol, value, unit)} as used by the SymPy fallback (for debugging)."""
+        return {key: (f"x{i}", values[i], units[i]) for i, key in enumerate(self._keys)}
+
+    def evaluate(self, values: list[float], units: list[str | None], target_unit: str | None) -> float:  # noqa: PLR0911
+        """Evaluate the plan with the given slot values and slot units."""
+        if self._kind == _KIND_GENERAL:
+            return self.evaluate_general(values, units, target_unit)
+
+        signature = (tuple(units), target_unit)
+        program = self._programs.get(signature)
+        if program is None:
+            program = self._compile_program(units, target_unit)
+            self._programs[signature] = program
+
+        if self._kind == _KIND_LEAF:
+            return _evaluate_leaf(program, values, self._layout, target_unit)
+        if self._kind == _KIND_SUM:
+            return _evaluate_sum(program, values, target_unit)
+        if self._kind == _KIND_PRODUCT:
+            return _evaluate_product(program, values, target_unit)
+        if self._kind == _KIND_SUM_OF_PRODUCTS:
+            return _evaluate_sum_of_products(program, values, target_unit)
+        value = _evaluate_aggregation(program, values, target_unit)
+        if value is None:
+            return self.evaluate_general(values, units, target_unit)
+        return value
+
+    def evaluate_general(self, values: list[float], units: list[str | None], target_unit: str | None) -> float:
+        """Evaluate the plan with the general numeric evaluator. Works for all kinds."""
+        slot_units = [_get_base_unit(unit) for unit in units]
+        value, dims = _evaluate_tree(self._tree, values, slot_units, self._expr_str)
+        if value == 0.0:
+            return 0.0
+        target_scale, target_dims = _get_base_unit(target_unit)
+        if dims != target_dims:
+            message = f"Cannot convert expression '{self._expr_str}' with units {units} to target_unit {target_unit}. Got dimensions {dims}."
+            raise ValueError(message)
+        return value / target_scale
+
+    def _compile_expr_str(self, expr: Expr, slots: dict[str, int]) -> str:
+        if expr.is_leaf():
+            key = _get_slot_key(expr)
+            if key not in slots:
+                slots[key] = len(self._keys)
+                self._keys.append(key)
+                self._leaves.append(expr)
+            return f"x{slots[key]}"
+
+        ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+        out = self._compile_expr_str(args[0], slots)
+        for op, arg in zip(ops, args[1:], strict=True):
+            out = f"{out} {op} {self._compile_expr_str(arg, slots)}"
+        return f"({out})"
+
+    def _compile_program(self, units: list[str | None], target_unit: str | None) -> object:
+        if self._kind == _KIND_LEAF:
+            unit = units[self._layout]
+            return unit, _try_get_factor(unit, target_unit)
+        if self._kind == _KIND_SUM:
+            return _compile_sum_program(self._layout, units, target_unit)
+        if self._kind == _KIND_PRODUCT:
+            return _compile_product_program(self._layout, units, target_unit)
+        if self._kind == _KIND_SUM_OF_PRODUCTS:
+            return [(is_negative, _compile_product_program(layout, units, target_unit)) for is_negative, layout in self._layout]
+        return _compile_aggregation_program(self._layout, units, target_unit)
+
+
+def _get_slot_key(leaf: Expr) -> str:
+    src = leaf.get_src()
+    if isinstance(src, str):
+        return src
+    if isinstance(src, ConstantTimeVector):
+        return src.get_expr_str()
+    message = f"Unexpected value for src: {src}\nin expr {leaf}"
+    raise ValueError(message)
+
+
+def _is_fastpath_sum(expr: Expr) -> bool:
+    """E.g. x0 + x1 + x2 + .. where x is leaf."""
+    if expr.is_leaf():
+        return True
+    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+    if ops[0] not in "+-":
+        return False
+    return all(arg.is_leaf() for arg in args)
+
+
+def _is_fastpath_product(expr: Expr) -> bool:
+    """E.g. x1 * (x2 + x3), or x1 * x2 * x3 where x is leaf."""
+    if expr.is_leaf():
+        return True
+    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+    if not all(op == "*" for op in ops):
+        return False
+    return all(arg.is_leaf() or _is_fastpath_sum(arg) for arg in args)
+
+
+def _is_fastpath_sum_of_products(expr: Expr) -> bool:
+    """E.g. x1 * (x2 + x3) + x4 * x5 where x is leaf."""
+    if expr.is_leaf():
+        return True
+    if _is_fastpath_product(expr):
+        return True
+    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+    if ops[0] not in "+-":
+        return False
+    return all(_is_fastpath_product(arg) for arg in args)
+
+
+def _is_fastpath_aggregation(expr: Expr) -> bool:
+    """E.g. ((x1 * (x2 + x3) + x4 * x5) / (x6 + x7)) where x is leaf."""
+    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+    if ops != "/":
+        return False
+    try:
+        numerator, denominator = args
+    except Exception:
+        return False
+    if not _is_fastpath_sum_of_products(numerator):
+        return False
+    return _is_fastpath_sum(denominator)
+
+
+# Layouts:
+# - leaf:        slot
+# - sum:         [(slot, is_negative), ..]
+# - product:     [sum, ..] (one sum layout per factor)
+# - sum_of_products: [(is_negative, product), ..]
+# - aggregation: ([(is_negative, product), ..], sum) for numerator and denominator
+
+
+def _compile_layout(expr: Expr, slots: dict[str, int]) -> tuple[str, object]:
+    if expr.is_leaf():
+        return _KIND_LEAF, slots[_get_slot_key(expr)]
+    if _is_fastpath_sum(expr):
+        return _KIND_SUM, _compile_sum_layout(expr, slots)
+    if _is_fastpath_product(expr):
+        return _KIND_PRODUCT, _compile_product_layout(expr, slots)
+    if _is_fastpath_sum_of_products(expr):
+        return _KIND_SUM_OF_PRODUCTS, _compile_sum_of_products_layout(expr, slots)
+    if _is_fastpath_aggregation(expr):
+        __, (numerator, denominator) = expr.get_operations(expect_ops=True, copy_list=False)
+        return _KIND_AGGREGATION, (_compile_sum_of_products_layout(numerator, slots), _compile_sum_layout(denominator, slots))
+    return _KIND_GENERAL, None
+
+
+def _compile_sum_layout(expr: Expr, slots: dict[str, int]) -> list[tuple[int, bool]]:
+    if expr.is_leaf():
+        return [(slots[_get_slot_key(expr)], False)]
+    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+    layout = [(slots[_get_slot_key(args[0])], False)]
+    layout.extend((slots[_get_slot_key(arg)], op == "-") for op, arg in zip(ops, args[1:], strict=True))
+    return layout
+
+
+def _compile_sum_of_products_layout(expr: Expr, slots: dict[str, int]) -> list[tuple[bool, list]]:
+    if _is_fastpath_product(expr):
+        return [(False, _compile_product_layout(expr, slots))]
+    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+    terms = [(False, _compile_product_layout(args[0], slots))]
+    terms.extend((op == "-", _compile_product_layout(arg, slots)) for op, arg in zip(ops, args[1:], strict=True))
+    return terms
+
+
+def _compile_product_layout(expr: Expr, slots: dict[str, int]) -> list[list[tuple[int, bool]]]:
+    if expr.is_leaf():
+        return [_compile_sum_layout(expr, slots)]
+    __, args = expr.get_operations(expect_ops=True, copy_list=False)
+    return [_compile_sum_layout(arg, slots) for arg in args]
+
+
+# Programs are layouts combined with unit conversion factors for a given set of slot units and target unit.
+# A factor of None means that the conversion failed. This is only an error if the converted value is non-zero.
+
+
+def _try_get_factor(from_unit: str | None, to_unit: str | None) -> float | None:
+    try:
+        return get_unit_conversion_factor(from_unit, to_unit)
+    except Exception:
+        return None
+
+
+def _group_by_unit(terms: list, term_units: list[str | None]) -> list[tuple[str | None, list]]:
+    """Group terms by unit in order of first appearance."""
+    groups: dict[str | None, list] = dict()
+    for term, unit in zip(terms, term_units, strict=True):
+        groups.setdefault(unit, []).append(term)
+    return list(groups.items())
+
+
+def _sum_terms(terms: list[tuple[int, bool]], values: list[float]) -> float:
+    out = 0.0
+    for slot, is_negative in terms:
+        if is_negative:
+            out -= values[slot]
+        else:
+            out += values[slot]
+    return out
+
+
+def _evaluate_leaf(program: tuple[str | None, float | None], values: list[float], slot: int, target_unit: str | None) -> float:
+    unit, factor = program
+    if factor is None:
+        get_unit_conversion_factor(unit, target_unit)  # raises the original error
+    return values[slot] * factor
+
+
+def _compile_sum_program(layout: list[tuple[int, bool]], units: list[str | None], target_unit: str | None) -> list:
+    groups = _group_by_unit(layout, [units[slot] for slot, __ in layout])
+    return [(unit, _try_get_factor(unit, target_unit), terms) for unit, terms in groups]
+
+
+def _evaluate_sum(program: list, values: list[float], target_unit: str | None) -> float:
+    out = 0.0
+    for unit, factor, terms in program:
+        value = _sum_terms(terms, values)
+        if value == 0.0:
+            continue
+        if factor is None:
+            get_unit_conversion_factor(unit, target_unit)  # raises the original error
+        out += value * factor
+    return out
+
+
+def _compile_product_terms(layout: list[list[tuple[int, bool]]], units: list[str | None]) -> list[tuple[str | None, list]]:
+    """Group the terms of each factor by unit, and collect factors with the same unit (as the original fastpath did)."""
+    product_terms: dict[str | None, list] = dict()
+    for sum_layout in layout:
+        for unit, terms in _group_by_unit(sum_layout, [units[slot] for slot, __ in sum_layout]):
+            product_terms.setdefault(unit, []).append(terms)
+    return list(product_terms.items())
+
+
+def _evaluate_product_terms(product_terms: list[tuple[str | None, list]], values: list[float]) -> float:
+    out = 1.0
+    for __, factors in product_terms:
+        value = _sum_terms(factors[0], values)
+        for terms in factors[1:]:
+            value *= _sum_terms(terms, values)
+        if value == 0.0:
+            return 0.0
+        out *= value
+    return out
+
+
+def _compile_product_program(layout: list[list[tuple[int, bool]]], units: list[str | None], target_unit: str | None) -> tuple:
+    product_terms = _compile_product_terms(layout, units)
+    product_units = [unit for unit, __ in product_terms if unit is not None]
+    if not product_units:
+        return None, 1.0, product_terms  # unitless product is not converted
+    unit = " * ".join(product_units)
+    return unit, _try_get_factor(unit, target_unit), product_terms
+
+
+def _evaluate_product(program: tuple, values: list[float], target_unit: str | None) -> float:
+    unit, factor, product_terms = program
+    value = _evaluate_product_terms(product_terms, values)
+    if value == 0.0:
+        return 0.0
+    if factor is None:
+        get_unit_conversion_factor(unit, target_unit)  # raises the original error
+    return value * factor
+
+
+def _evaluate_sum_of_products(program: list, values: list[float], target_unit: str | None) -> float:
+    out = 0.0
+    for is_negative, product_program in program:
+        if is_negative:
+            out -= _evaluate_product(product_program, values, target_unit)
+        else:
+            out += _evaluate_product(product_program, values, target_unit)
+    return out
+
+
+def _compile_aggregation_program(layout: tuple, units: list[str | None], target_unit: str | None) -> tuple:
+    numerator_layout, denominator_layout = layout
+
+    numerator_terms = []
+    numerator_units = []
+    for is_negative, product_layout in numerator_layout:
+        product_terms = _compile_product_terms(product_layout, units)
+        product_units = [unit for unit, __ in product_terms if unit is not None]
+        unit = "*".join(sorted(f"({s})" for s in product_units)) if product_units else None
+        numerator_terms.append((is_negative, product_terms))
+        numerator_units.append(unit)
+
+    numerator = _compile_common_unit_groups(_group_by_unit(numerator_terms, numerator_units))
+    denominator = _compile_common_unit_groups(_group_by_unit(denominator_layout, [units[slot] for slot, __ in denominator_layout]))
+
+    num_unit = numerator[0][0]
+    dem_unit = denominator[0][0]
+
+    if num_unit is None and dem_unit is None:
+        combined_unit = None
+        factor = 1.0 if target_unit is None else None
+    elif dem_unit is None:
+        combined_unit = num_unit
+        factor = 1.0 if target_unit == combined_unit else _try_get_factor(combined_unit, target_unit)
+    elif num_unit is None:
+        combined_unit = f"1/({dem_unit})"
+        factor = 1.0 if target_unit == combined_unit else _try_get_factor(combined_unit, target_unit)
+    else:
+        combined_unit = f"{num_unit}/({dem_unit})"
+        factor = 1.0 if target_unit == combined_unit else _try_get_factor(combined_unit, target_unit)
+
+    return numerator, denominator, combined_unit, factor
+
+
+def _compile_common_unit_groups(groups: list[tuple[str | None, list]]) -> list[tuple[str | None, float | None, list]]:
+    """Add factor to convert each group to the unit of the first group."""
+    first_unit = groups[0][0]
+    return [(unit, 1.0 if unit == first_unit else _try_get_factor(unit, first_unit), terms) for unit, terms in groups]
+
+
+def _evaluate_aggregation(program: tuple, values: list[float], target_unit: str | None) -> float | None:  # noqa: C901
+    numerator, denominator, combined_unit, factor = program
+
+    num_value = 0.0
+    for __, group_factor, terms in numerator:
+        value = 0.0
+        for is_negative, product_terms in terms:
+            if is_negative:
+                value -= _evaluate_product_terms(product_terms, values)
+            else:
+                value += _evaluate_product_terms(product_terms, values)
+        if value == 0.0:
+            continue
+        if group_factor is None:
+            return None
+        num_value += value * group_factor
+
+    dem_value = 0.0
+    for __, group_factor, terms in denominator:
+        value = _sum_terms(terms, values)
+        if value == 0.0:
+            continue
+        if group_factor is None:
+            return None
+        dem_value += value * group_factor
+
+    if factor is None:
+        if combined_unit is None:
+            message = f"Could not convert to {target_unit} from unitless aggregation"
+            raise ValueError(message)
+        get_unit_conversion_factor(combined_unit, target_unit)  # raises the original error
+
+    return factor * (num_value / dem_value)
+
+
+# The general evaluator works on a tree of slots:
+# - leaf: slot
+# - operation: (ops, [tree, ..])
+# and carries values in base units together with their dimensions, see units._parse_unit.
+
+
+def _compile_tree(expr: Expr, slots: dict[str, int]) -> int | tuple[str, list]:
+    if expr.is_leaf():
+        return slots[_get_slot_key(expr)]
+    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+    return ops, [_compile_tree(arg, slots) for arg in args]
+
+
+def _get_base_unit(unit: str | None) -> tuple[float, dict[str, int]]:
+    if unit is None:
+        return 1.0, {}
+    scale, dims = _parse_unit(unit)
+    return float(scale), dims
+
+
+def _evaluate_tree(
+    tree: int | tuple[str, list],
+    values: list[float],
+    slot_units: list[tuple[float, dict[str, int]]],
+    expr_str: str,
+) -> tuple[float, dict[str, int]]:
+    if isinstance(tree, int):
+        scale, dims = slot_units[tree]
+        return values[tree] * scale, dims
+
+    ops, args = tree
+    value, dims = _evaluate_tree(args[0], values, slot_units, expr_str)
+    for op, arg in zip(ops, args[1:], strict=True):
+        arg_value, arg_dims = _evaluate_tree(arg, values, slot_units, expr_str)
+        if op in "+-":
+            # a zero value is compatible with any unit
+            if arg_value == 0.0:
+                continue
+            if value == 0.0:
+                dims = arg_dims
+            elif dims != arg_dims:
+                message = f"Cannot add or subtract incompatible units in expression '{expr_str}'. Got dimensions {dims} and {arg_dims}."
+                raise ValueError(message)
+            value = value + arg_value if op == "+" else value - arg_value
+        else:
+            value, dims = _multiply_units((value, dims), (arg_value, arg_dims), 1 if op == "*" else -1)
+    return value, dims
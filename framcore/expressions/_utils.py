@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import copy
 from typing import TYPE_CHECKING
 
 from framcore.curves import Curve
 from framcore.expressions import Expr
 from framcore.querydbs import QueryDB
-from framcore.timevectors import ConstantTimeVector, TimeVector
+from framcore.timevectors import TimeVector
 
 if TYPE_CHECKING:
     from framcore import Model
@@ -26,48 +25,50 @@ def _load_model_and_create_model_db(db: QueryDB | Model) -> QueryDB:
     return db
 
 
-def _lookup_expr_from_constants_with_units(
-    constants_with_units: dict[str, tuple],
-    expr: Expr,
-) -> tuple[str, float, str | None]:
-    src = expr.get_src()
-    if isinstance(src, ConstantTimeVector):
-        src = src.get_expr_str()
-    sym, value, unit = constants_with_units[src]
-    return sym, value, unit
+def _ensure_real_expr(expr: Expr, db: QueryDB, memo: dict[str, Expr] | None = None) -> Expr:
+    """
+    Return expr where all references to other Exprs in db are resolved.
 
+    Nothing is copied. Subtrees without references are shared with expr, and resolved
+    references are shared with the Exprs in db. Returns expr itself if it has no references.
+    Pass the same memo to resolve many exprs against the same db.
+    """
+    if memo is None:
+        memo = dict()
+    return _resolve_expr(expr, db, memo, set())
 
-def _is_real_expr(expr: Expr, db: QueryDB) -> bool:
+
+def _resolve_expr(expr: Expr, db: QueryDB, memo: dict[str, Expr], active: set[str]) -> Expr:
     if expr.is_leaf():
         src = expr.get_src()
         if isinstance(src, TimeVector | Curve):
-            return True
+            return expr
+        if src in memo:
+            return memo[src]
         obj = db.get(src)
-        return not isinstance(obj, Expr)
-    __, args = expr.get_operations(expect_ops=True, copy_list=False)
-    return all(_is_real_expr(ex, db) for ex in args)
-
-
-def _ensure_real_expr(expr: Expr, db: QueryDB) -> Expr:
-    if _is_real_expr(expr, db):
+        if not isinstance(obj, Expr):
+            assert isinstance(obj, TimeVector | Curve), f"Got {obj}"
+            return expr
+        if src in active:
+            message = f"Cycle of Expr references at '{src}' in expr {expr}"
+            raise ValueError(message)
+        active.add(src)
+        resolved = _resolve_expr(obj, db, memo, active)
+        active.remove(src)
+        memo[src] = resolved
+        return resolved
+
+    ops, args = expr.get_operations(expect_ops=True, copy_list=False)
+    resolved_args = [_resolve_expr(arg, db, memo, active) for arg in args]
+    if all(resolved is arg for resolved, arg in zip(resolved_args, args, strict=True)):
         return expr
-    expr = copy.deepcopy(expr)
-    _extend_expr(expr, db)
-    return expr
-
 
-def _extend_expr(expr: Expr, db: QueryDB) -> None:
-    if expr.is_leaf():
-        src = expr.get_src()
-        if isinstance(src, TimeVector | Curve):
-            return
-        obj = db.get(src)
-        if isinstance(obj, Expr):
-            for name, value in obj.__dict__.items():
-                setattr(expr, name, value)
-            _extend_expr(expr, db)
-        assert isinstance(obj, TimeVector | Curve), f"Got {obj}"
-        return
-    __, args = expr.get_operations(expect_ops=True, copy_list=False)
-    for ex in args:
-        _extend_expr(ex, db)
+    return Expr(
+        src=None,
+        is_stock=expr.is_stock(),
+        is_flow=expr.is_flow(),
+        is_profile=expr.is_profile(),
+        is_level=expr.is_level(),
+        profile=expr.get_profile(),
+        operations=(ops, resolved_args),
+    )
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import contextlib
 import time
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -10,16 +11,21 @@ from numpy.typing import NDArray
 from framcore import check_type
 from framcore.curves import Curve
 from framcore.expressions import Expr
-from framcore.expressions._get_constant_from_expr import _get_constant_from_expr
+from framcore.expressions._get_constant_from_expr import _get_constant_from_expr, _get_constant_series_from_expr, _get_constants_from_exprs
 from framcore.expressions._utils import _load_model_and_create_model_db
-from framcore.expressions.units import get_unit_conversion_factor
+from framcore.expressions.units import _record_unit_stats, get_unit_conversion_factor
 from framcore.querydbs import QueryDB
 from framcore.timeindexes import FixedFrequencyTimeIndex, ProfileTimeIndex, SinglePeriodTimeIndex, TimeIndex, WeeklyIndex
-from framcore.timevectors import TimeVector
+from framcore.timevectors import ConstantTimeVector, TimeVector
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from framcore import Model
 
+# Max size of the matrix of profile vectors used to compute weighted sums of profiles in _get_profile_vector
+_MAX_PROFILE_MATRIX_BYTES = 64 * 1024 * 1024
+
 
 def get_level_value(
     expr: Expr,
@@ -40,7 +46,7 @@ def get_level_value(
 
     Supports all expressions. Will evaluate level Exprs at data_dim (with reference period of scen_dim),
     and profile Exprs as an average over scen_dim (both as constants). Has optimized fastpath methods for sums, products and aggregations.
-    The rest uses a fallback method with SymPy.
+    The rest uses a general numeric evaluator.
 
     """
     check_type(expr, Expr)  # check expr here since _get_level_value is not recursively called.
@@ -53,6 +59,72 @@ def get_level_value(
     return _get_level_value(expr, db, unit, data_dim, scen_dim, is_max)
 
 
+def get_level_values(
+    exprs: list[Expr],
+    db: QueryDB | Model,
+    unit: str | None,
+    data_dim: SinglePeriodTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_max: bool,
+) -> NDArray:
+    """
+    Evaluate many Exprs representing (possibly aggregated) levels.
+
+    Gives the same values as calling get_level_value for each expr, but is faster for many exprs.
+    TimeVectors shared between the exprs are only fetched and averaged once, and the Python
+    overhead of one query per expr is avoided.
+
+    Returns:
+        NDArray with one value per expr, in the same order as exprs.
+
+    """
+    check_type(exprs, (list, tuple))
+    for expr in exprs:
+        check_type(expr, Expr)
+    check_type(unit, (str, type(None)))
+    check_type(data_dim, SinglePeriodTimeIndex)
+    check_type(scen_dim, FixedFrequencyTimeIndex)
+    check_type(is_max, bool)
+    db = _load_model_and_create_model_db(db)
+
+    return _get_level_values(exprs, db, unit, data_dim, scen_dim, is_max)
+
+
+def get_level_series(
+    expr: Expr,
+    db: QueryDB | Model,
+    unit: str | None,
+    data_dims: FixedFrequencyTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_max: bool,
+    copy: bool = False,
+) -> NDArray:
+    """
+    Evaluate Expr representing a (possibly aggregated) level at each period of data_dims.
+
+    Gives the same values as calling get_level_value once for each period of data_dims (as a SinglePeriodTimeIndex),
+    but each TimeVector in expr is only fetched and written into data_dims once, instead of once per period.
+    Useful for e.g. capacity trajectories over many model years.
+
+    The returned array may be shared with the cache in db, and is therefore read-only.
+    Use copy=True to get a writeable copy.
+
+    Returns:
+        NDArray with one value per period in data_dims.
+
+    """
+    check_type(expr, Expr)
+    check_type(unit, (str, type(None)))
+    check_type(data_dims, FixedFrequencyTimeIndex)
+    check_type(scen_dim, FixedFrequencyTimeIndex)
+    check_type(is_max, bool)
+    check_type(copy, bool)
+    db = _load_model_and_create_model_db(db)
+
+    output_series = _get_level_series(expr, db, unit, data_dims, scen_dim, is_max)
+    return output_series.copy() if copy else output_series
+
+
 def get_profile_vector(
     expr: Expr,
     db: QueryDB | Model,
@@ -60,6 +132,8 @@ def get_profile_vector(
     scen_dim: FixedFrequencyTimeIndex,
     is_zero_one: bool,
     is_float32: bool = True,
+    copy: bool = False,
+    out: NDArray | None = None,
 ) -> NDArray:
     """
     Evaluate expr representing a (possibly aggregated) profile.
@@ -84,15 +158,32 @@ def get_profile_vector(
 
         The query parameter is_zero_one tells which profile type the output
         vector should be converted to.
+
+    The returned vector may be shared with the cache in db, and is therefore read-only.
+    Use copy=True to get a writeable copy, or give out (e.g. a row of a preallocated matrix)
+    to write the result into. If out is given, out is returned.
     """
     # Argument expr checked in _get_profile_vector since it can be recursively called.
     check_type(data_dim, SinglePeriodTimeIndex)
     check_type(scen_dim, FixedFrequencyTimeIndex)
     check_type(is_zero_one, bool)
     check_type(is_float32, bool)
+    check_type(copy, bool)
+    check_type(out, (np.ndarray, type(None)))
     db = _load_model_and_create_model_db(db)
 
-    return _get_profile_vector(expr, db, data_dim, scen_dim, is_zero_one, is_float32)
+    if out is not None:
+        num_periods = scen_dim.get_num_periods()
+        if out.shape != (num_periods,):
+            message = f"Expected out with shape {(num_periods,)}, got {out.shape}."
+            raise ValueError(message)
+        return _get_profile_vector(expr, db, data_dim, scen_dim, is_zero_one, is_float32, out)
+
+    vector = _get_profile_vector(expr, db, data_dim, scen_dim, is_zero_one, is_float32)
+    if copy:
+        return vector if vector.flags.writeable else vector.copy()
+    vector.flags.writeable = False
+    return vector
 
 
 def get_units_from_expr(db: QueryDB | Model, expr: Expr) -> set[str]:
@@ -121,6 +212,29 @@ def get_timeindexes_from_expr(db: QueryDB | Model, expr: Expr) -> set[TimeIndex]
     return timeindexes
 
 
+def _has_cached_value(db: QueryDB, cache_key: tuple) -> bool:
+    """Return True if db has a value behind cache_key. Records the cache hit or miss in the QueryStats of db."""
+    is_hit = db.has_key(cache_key)
+    stats = db.get_stats()
+    if stats is not None:
+        if is_hit:
+            stats.record_cache_hit(cache_key[0])
+        else:
+            stats.record_cache_miss(cache_key[0])
+    return is_hit
+
+
+@contextlib.contextmanager
+def _discard_computing_on_error(db: QueryDB, *cache_keys: tuple) -> Iterator[None]:
+    """Call db.discard_computing for cache_keys if computing their values raises, as they will not be put in db."""
+    try:
+        yield
+    except BaseException:
+        for cache_key in cache_keys:
+            db.discard_computing(cache_key)
+        raise
+
+
 def _get_level_value(
     expr: Expr,
     db: QueryDB,
@@ -130,16 +244,73 @@ def _get_level_value(
     is_max: bool,
 ) -> float:
     cache_key = ("_get_constant_from_expr", expr, unit, data_dim, scen_dim, is_max)
-    if db.has_key(cache_key):
+    if _has_cached_value(db, cache_key):
         return db.get(cache_key)
     t0 = time.perf_counter()
-    output_value = _get_constant_from_expr(expr, db, unit, data_dim, scen_dim, is_max)
+    with _discard_computing_on_error(db, cache_key):
+        output_value = _get_constant_from_expr(expr, db, unit, data_dim, scen_dim, is_max)
     t1 = time.perf_counter()
     db.put(cache_key, output_value, elapsed_seconds=t1 - t0)
 
     return output_value
 
 
+def _get_level_values(
+    exprs: list[Expr],
+    db: QueryDB,
+    unit: str | None,
+    data_dim: SinglePeriodTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_max: bool,
+) -> NDArray:
+    out = np.zeros(len(exprs), dtype=np.float64)
+
+    missing: dict[Expr, list[int]] = dict()
+    for i, expr in enumerate(exprs):
+        cache_key = ("_get_constant_from_expr", expr, unit, data_dim, scen_dim, is_max)
+        if _has_cached_value(db, cache_key):
+            out[i] = db.get(cache_key)
+        else:
+            missing.setdefault(expr, []).append(i)
+
+    if not missing:
+        return out
+
+    missing_exprs = list(missing)
+    t0 = time.perf_counter()
+    with _discard_computing_on_error(db, *(("_get_constant_from_expr", expr, unit, data_dim, scen_dim, is_max) for expr in missing_exprs)):
+        values = _get_constants_from_exprs(missing_exprs, db, unit, data_dim, scen_dim, is_max)
+    t1 = time.perf_counter()
+
+    elapsed_seconds = (t1 - t0) / len(missing_exprs)
+    for expr, value in zip(missing_exprs, values, strict=True):
+        out[missing[expr]] = value
+        db.put(("_get_constant_from_expr", expr, unit, data_dim, scen_dim, is_max), value, elapsed_seconds=elapsed_seconds)
+
+    return out
+
+
+def _get_level_series(
+    expr: Expr,
+    db: QueryDB,
+    unit: str | None,
+    data_dims: FixedFrequencyTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_max: bool,
+) -> NDArray:
+    cache_key = ("_get_constant_series_from_expr", expr, unit, data_dims, scen_dim, is_max)
+    if _has_cached_value(db, cache_key):
+        return db.get(cache_key)
+    t0 = time.perf_counter()
+    with _discard_computing_on_error(db, cache_key):
+        output_series = _get_constant_series_from_expr(expr, db, unit, data_dims, scen_dim, is_max)
+    output_series.flags.writeable = False
+    t1 = time.perf_counter()
+    db.put(cache_key, output_series, elapsed_seconds=t1 - t0)
+
+    return output_series
+
+
 def _get_profile_vector(
     expr: Expr,
     db: QueryDB,
@@ -147,22 +318,65 @@ def _get_profile_vector(
     scen_dim: FixedFrequencyTimeIndex,
     is_zero_one: bool,
     is_float32: bool = True,
+    out: NDArray | None = None,
 ) -> NDArray:
     check_type(expr, Expr)
 
     if expr.is_leaf():
-        return _get_profile_vector_from_leaf_expr(expr, db, data_dim, scen_dim, is_zero_one, is_float32)
+        vector = _get_profile_vector_from_leaf_expr(expr, db, data_dim, scen_dim, is_zero_one, is_float32)
+        if out is None:
+            return vector
+        np.copyto(out, vector)
+        return out
+
+    # Collect all (weights, profile) terms in one walk, and evaluate all weights at once.
+    terms: list[tuple[tuple[list[Expr], ...], TimeVector | Curve]] = []
+    _collect_weighted_profiles(expr, db, (), terms)
+
+    weight_exprs = list(dict.fromkeys(weight_expr for weight_groups, __ in terms for group in weight_groups for weight_expr in group))
+    is_max = False  # use avg-values to calculate weights
+    weight_values = dict(zip(weight_exprs, _get_constants_from_exprs(weight_exprs, db, None, data_dim, scen_dim, is_max), strict=True))
+
+    # Sum weights of each profile TimeVector/Curve.
+    weighted_profiles: dict[int, list] = dict()
+    for weight_groups, obj in terms:
+        weight = 1.0
+        for group in weight_groups:
+            weight *= sum(weight_values[weight_expr] for weight_expr in group)
+        if id(obj) in weighted_profiles:
+            weighted_profiles[id(obj)][1] += weight
+        else:
+            weighted_profiles[id(obj)] = [obj, weight]
+
+    return _get_weighted_profile_sum(list(weighted_profiles.values()), db, data_dim, scen_dim, is_zero_one, is_float32, out)
+
+
+def _collect_weighted_profiles(
+    expr: Expr,
+    db: QueryDB,
+    weight_groups: tuple[list[Expr], ...],
+    terms: list[tuple[tuple[list[Expr], ...], TimeVector | Curve]],
+) -> None:
+    """Append (weight_groups, profile) to terms for each profile in expr. The weight of a profile is the product of the sum of each weight group."""
+    if expr.is_leaf():
+        src = expr.get_src()
+        obj = db.get(src) if isinstance(src, str) else src
+        if isinstance(obj, Expr):
+            if not obj.is_profile():
+                msg = f"Expected {obj} to be is_profile=True."  # User may be getting this from setting wrong metadata in time vector files?
+                raise ValueError(msg)
+            _collect_weighted_profiles(obj, db, weight_groups, terms)
+            return
+        assert isinstance(obj, (TimeVector, Curve))
+        terms.append((weight_groups, obj))
+        return
 
     ops, args = expr.get_operations(expect_ops=True, copy_list=False)
-    tmp = np.zeros(scen_dim.get_num_periods(), dtype=np.float32 if is_float32 else np.float64)
-
-    if "+" in ops:
-        out = _get_profile_vector(args[0], db, data_dim, scen_dim, is_zero_one, is_float32)
-        for op, arg in zip(ops, args[1:], strict=True):
-            assert op == "+", f"{ops}  {args}"
-            tmp = _get_profile_vector(arg, db, data_dim, scen_dim, is_zero_one, is_float32)
-            np.add(out, tmp, out=out)
-        return out
+
+    if all(op == "+" for op in ops):
+        for arg in args:
+            _collect_weighted_profiles(arg, db, weight_groups, terms)
+        return
 
     if not all(op == "*" for op in ops):
         message = f"Expected w1*w2*..*wn*profile. Got operations {ops} for expr {expr}"
@@ -175,14 +389,40 @@ def _get_profile_vector(
         message = f"Got {len(profiles)} profiles in expr {expr}"
         raise ValueError(message)
 
-    total_weight = 0.0
-    is_max = False  # use avg-values to calculate weights
+    _collect_weighted_profiles(profiles[0], db, (*weight_groups, weights), terms)
+
+
+def _get_weighted_profile_sum(
+    weighted_profiles: list[list],
+    db: QueryDB,
+    data_dim: SinglePeriodTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_zero_one: bool,
+    is_float32: bool,
+    out: NDArray | None = None,
+) -> NDArray:
+    """Compute sum(weight * profile_vector) as weights @ matrix, where each row of matrix is a profile vector. Uses blocks of rows to limit memory."""
+    dtype = np.float32 if is_float32 else np.float64
+    num_periods = scen_dim.get_num_periods()
 
-    for weight_expr in weights:
-        total_weight += _get_constant_from_expr(weight_expr, db, None, data_dim, scen_dim, is_max)
+    if out is None:
+        out = np.zeros(num_periods, dtype=dtype)
+    else:
+        out.fill(0.0)
+    if not weighted_profiles:
+        return out
+
+    block_size = max(1, min(len(weighted_profiles), _MAX_PROFILE_MATRIX_BYTES // max(1, num_periods * np.dtype(dtype).itemsize)))
+    matrix = np.empty((block_size, num_periods), dtype=dtype)
+    weights = np.array([weight for __, weight in weighted_profiles], dtype=dtype)
+
+    for start in range(0, len(weighted_profiles), block_size):
+        block = weighted_profiles[start : start + block_size]
+        rows = matrix[: len(block)]
+        for i, (obj, __) in enumerate(block):
+            rows[i] = _get_cached_profile_vector(obj, db, data_dim, scen_dim, is_zero_one, is_float32)
+        out += weights[start : start + len(block)] @ rows
 
-    out = _get_profile_vector(profiles[0], db, data_dim, scen_dim, is_zero_one, is_float32)
-    np.multiply(out, total_weight, out=out)
     return out
 
 
@@ -209,12 +449,25 @@ def _get_profile_vector_from_leaf_expr(
 
     assert isinstance(obj, (TimeVector, Curve))
 
+    return _get_cached_profile_vector(obj, db, data_dim, scen_dim, is_zero_one, is_float32)
+
+
+def _get_cached_profile_vector(
+    obj: TimeVector | Curve,
+    db: QueryDB,
+    data_dim: SinglePeriodTimeIndex,
+    scen_dim: FixedFrequencyTimeIndex,
+    is_zero_one: bool,
+    is_float32: bool,
+) -> NDArray:
+    """Get profile vector of obj from db, or compute it and put it in db. The returned vector is read-only."""
     cache_key = ("_get_profile_vector_from_timevector", obj, data_dim, scen_dim, is_zero_one, is_float32)
-    if db.has_key(cache_key):
-        vector: NDArray = db.get(cache_key)
-        return vector.copy()
+    if _has_cached_value(db, cache_key):
+        return db.get(cache_key)
     t0 = time.perf_counter()
-    vector = _get_profile_vector_from_timevector(obj, scen_dim, is_zero_one, is_float32)
+    with _discard_computing_on_error(db, cache_key):
+        vector = _get_profile_vector_from_timevector(obj, scen_dim, is_zero_one, is_float32)
+    vector.flags.writeable = False
     t1 = time.perf_counter()
     db.put(cache_key, vector, elapsed_seconds=t1 - t0)
     return vector
@@ -309,7 +562,132 @@ def _recursively_update_timeindexes(timeindexes: set[TimeIndex], db: QueryDB, ex
         _recursively_update_timeindexes(timeindexes, db, arg)
 
 
-def _get_level_value_from_timevector(  # noqa: C901, PLR0915
+def _get_period_averages(timevectors: list[TimeVector], data_dim: SinglePeriodTimeIndex, db: QueryDB) -> list[float]:
+    """
+    Get average value of each TimeVector over the period of data_dim.
+
+    Each unique TimeVector is only averaged once, and ConstantTimeVector values are used directly.
+    TimeVectors with FixedFrequencyTimeIndex are averaged using their cumulative integral, which is cached in db.
+    """
+    starttime = data_dim.get_start_time()  # OPPGAVE endrer ConstantTimeIndex-API?
+    timedelta_ = data_dim.get_period_duration()  # OPPGAVE endrer ConstantTimeIndex-API?
+    is_52_week_years = data_dim.is_52_week_years()
+
+    is_float32 = True
+
+    averages: dict[int, float] = dict()
+    out = []
+    for timevector in timevectors:
+        key = id(timevector)
+        if key not in averages:
+            average = None
+            if isinstance(timevector, ConstantTimeVector):
+                average = timevector.get_vector(is_float32)[0]
+            elif isinstance(timevector.get_timeindex(), FixedFrequencyTimeIndex):
+                average = _get_period_averages_from_cumulative_integral(timevector, db, starttime, timedelta_, 1, is_52_week_years, is_float32)
+                if average is not None:
+                    average = average[0]
+            if average is None:
+                values = timevector.get_vector(is_float32)  # OPPGAVE endrer TimeVector-API
+
+                # if DEFENSIVE_MODE:  # global i data-mng-modul
+                # assert isinstance(values, np.ndarray)
+                # assert len(values.shape) == 1
+
+                timeindex = timevector.get_timeindex()
+                average = timeindex.get_period_average(values, starttime, timedelta_, is_52_week_years)
+            averages[key] = average
+        out.append(averages[key])
+    return out
+
+
+def _get_period_average_series(timevectors: list[TimeVector], data_dims: FixedFrequencyTimeIndex, db: QueryDB) -> list[NDArray]:
+    """
+    Get average value of each TimeVector over each period of data_dims.
+
+    Each unique TimeVector is written into data_dims once, and ConstantTimeVector values are used directly.
+    TimeVectors with FixedFrequencyTimeIndex are averaged using their cumulative integral, which is cached in db.
+    """
+    num_periods = data_dims.get_num_periods()
+
+    is_float32 = True
+
+    averages: dict[int, NDArray] = dict()
+    out = []
+    for timevector in timevectors:
+        key = id(timevector)
+        if key not in averages:
+            series = None
+            if not isinstance(timevector, ConstantTimeVector) and isinstance(timevector.get_timeindex(), FixedFrequencyTimeIndex):
+                series = _get_period_averages_from_cumulative_integral(
+                    timevector,
+                    db,
+                    data_dims.get_start_time(),
+                    data_dims.get_period_duration(),
+                    num_periods,
+                    data_dims.is_52_week_years(),
+                    is_float32,
+                )
+            if series is None:
+                values = timevector.get_vector(is_float32)
+                series = np.zeros(num_periods, dtype=values.dtype)
+                if isinstance(timevector, ConstantTimeVector):
+                    series.fill(values[0])
+                else:
+                    timevector.get_timeindex().write_into_fixed_frequency(series, data_dims, values)
+            averages[key] = series
+        out.append(averages[key])
+    return out
+
+
+def _get_period_averages_from_cumulative_integral(
+    timevector: TimeVector,
+    db: QueryDB,
+    start_time: datetime,
+    period_duration: timedelta,
+    num_periods: int,
+    is_52_week_years: bool,
+    is_float32: bool,
+) -> NDArray | None:
+    """Get period averages of timevector with FixedFrequencyTimeIndex from its cumulative integral, or None if not possible."""
+    timeindex: FixedFrequencyTimeIndex = timevector.get_timeindex()
+    cumulative_integral = _get_cumulative_integral(timevector, db, is_float32)
+    averages = timeindex.get_period_averages_from_cumulative_integral(cumulative_integral, start_time, period_duration, num_periods, is_52_week_years)
+    if averages is None:
+        return None
+    return averages.astype(np.float32) if is_float32 else averages
+
+
+def _get_cumulative_integral(timevector: TimeVector, db: QueryDB, is_float32: bool) -> NDArray:
+    """Get cumulative integral of timevector with FixedFrequencyTimeIndex from db, or compute it and put it in db. The returned vector is read-only."""
+    cache_key = ("_get_cumulative_integral", timevector, is_float32)
+    if _has_cached_value(db, cache_key):
+        return db.get(cache_key)
+    t0 = time.perf_counter()
+    with _discard_computing_on_error(db, cache_key):
+        cumulative_integral = timevector.get_timeindex().get_cumulative_integral(timevector.get_vector(is_float32))
+    cumulative_integral.flags.writeable = False
+    t1 = time.perf_counter()
+    db.put(cache_key, cumulative_integral, elapsed_seconds=t1 - t0)
+    return cumulative_integral
+
+
+def _is_profile_independent_of_data_dim(profile_expr: Expr | None, db: QueryDB) -> bool:
+    """Return True if profile_expr is None or a single profile (possibly behind references), i.e. has no weights evaluated at data_dim."""
+    if profile_expr is None:
+        return True
+    if not profile_expr.is_leaf():
+        return False
+    src = profile_expr.get_src()
+    if isinstance(src, str):
+        obj = db.get(src)
+        if isinstance(obj, Expr):
+            return _is_profile_independent_of_data_dim(obj, db)
+    return True
+
+
+def _get_level_value_from_period_average(  # noqa: C901, PLR0915
+    scalar: float,
     timevector: TimeVector,
     db: QueryDB,
     target_unit: str | None,
@@ -318,25 +696,16 @@ def _get_level_value_from_timevector(  # noqa: C901, PLR0915
     target_is_max: bool,
     profile_expr: Expr | None,
 ) -> float:
+    """Convert period average of timevector to level value with target_unit and level type (is_max or is_avg)."""
     tv_is_max = timevector.is_max_level()  # OPPGAVE endrer TimeVector-API
 
     is_float32 = True
 
-    values = timevector.get_vector(is_float32)  # OPPGAVE endrer TimeVector-API
-
-    # if DEFENSIVE_MODE:  # global i data-mng-modul
-    # assert isinstance(values, np.ndarray)
-    # assert len(values.shape) == 1
-
-    timeindex = timevector.get_timeindex()
     from_unit = timevector.get_unit()
 
-    starttime = data_dim.get_start_time()  # OPPGAVE endrer ConstantTimeIndex-API?
-    timedelta_ = data_dim.get_period_duration()  # OPPGAVE endrer ConstantTimeIndex-API?
-    scalar = timeindex.get_period_average(values, starttime, timedelta_, data_dim.is_52_week_years())
-
     if from_unit is not None and target_unit is not None:
-        scalar *= get_unit_conversion_factor(from_unit, target_unit)
+        with _record_unit_stats(db.get_stats()):
+            scalar *= get_unit_conversion_factor(from_unit, target_unit)
     elif from_unit is None and target_unit is None:
         pass
     else:
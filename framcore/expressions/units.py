@@ -1,63 +1,155 @@
 """
 Define units used in the system, their handling and conversion rules.
 
-We use SymPy to support unit conversions. Already computed unit conversion factors are cached to minimize redundant calculations.
+Unit strings are parsed into a scale factor and a vector of dimension exponents, so that conversion factors
+can be computed with plain rational arithmetic. SymPy is only used to validate this engine (see _DEBUG and
+validate_unit_conversion_fastpaths). Already computed unit conversion factors are cached to minimize redundant calculations.
 """
 
 from __future__ import annotations
 
+import atexit
 import contextlib
+import json
+import math
+import os
 import re
-
-import sympy
-from sympy import Expr as SymPyExpr
-from sympy.core.power import Pow
-from sympy.core.symbol import Symbol
-from sympy.physics.units import Quantity, giga, gram, hour, kilo, mega, meter, second, tera, tonne, watt, year
-from sympy.physics.units.prefixes import Prefix
-
-EUR = Quantity("EUR", abbrev="€")
-
-_SUPPORTED_UNITS = {
-    "second": second,
-    "s": second,
-    "hour": hour,
-    "h": hour,
-    "year": year,
-    "y": year,
-    "watt": watt,
-    "joule": watt * second,
-    "g": gram,
-    "gram": gram,
-    "kg": kilo * gram,
-    "t": tonne,
-    "tonne": tonne,
-    "meter": meter,
-    "m": meter,
-    "m3": meter**3,
-    "l": meter**3 / 1000,
-    "Mm3": mega * meter**3,
-    "m3/s": meter**3 / second,
-    "kilo": kilo,
-    "mega": mega,
-    "giga": giga,
-    "tera": tera,
-    "kWh": kilo * watt * hour,
-    "MWh": mega * watt * hour,
-    "GWh": giga * watt * hour,
-    "TWh": tera * watt * hour,
-    "J": watt * second,
-    "kJ": kilo * watt * second,
-    "MJ": mega * watt * second,
-    "GJ": giga * watt * second,
-    "kW": kilo * watt,
-    "MW": mega * watt,
-    "GW": giga * watt,
-    "TW": tera * watt,
-    "EUR": EUR,
-    "€": EUR,
+import tempfile
+from collections.abc import Iterator
+from fractions import Fraction
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sympy import Expr as SymPyExpr
+
+    from framcore.querydbs import QueryStats
+
+# SymPy is slow to import and only used for validation, so _SUPPORTED_UNITS (and EUR) are created on first use.
+_SYMPY_UNITS: dict | None = None
+
+
+def _get_supported_units() -> dict:
+    """Get dict of unit names and their SymPy representation. Imports SymPy on first call."""
+    global _SYMPY_UNITS  # noqa: PLW0603
+    if _SYMPY_UNITS is not None:
+        return _SYMPY_UNITS
+
+    from sympy.physics.units import Quantity, giga, gram, hour, kilo, mega, meter, second, tera, tonne, watt, year
+
+    eur = Quantity("EUR", abbrev="€")
+
+    _SYMPY_UNITS = {
+        "second": second,
+        "s": second,
+        "hour": hour,
+        "h": hour,
+        "year": year,
+        "y": year,
+        "watt": watt,
+        "joule": watt * second,
+        "g": gram,
+        "gram": gram,
+        "kg": kilo * gram,
+        "t": tonne,
+        "tonne": tonne,
+        "meter": meter,
+        "m": meter,
+        "m3": meter**3,
+        "l": meter**3 / 1000,
+        "Mm3": mega * meter**3,
+        "m3/s": meter**3 / second,
+        "kilo": kilo,
+        "mega": mega,
+        "giga": giga,
+        "tera": tera,
+        "kWh": kilo * watt * hour,
+        "MWh": mega * watt * hour,
+        "GWh": giga * watt * hour,
+        "TWh": tera * watt * hour,
+        "J": watt * second,
+        "kJ": kilo * watt * second,
+        "MJ": mega * watt * second,
+        "GJ": giga * watt * second,
+        "kW": kilo * watt,
+        "MW": mega * watt,
+        "GW": giga * watt,
+        "TW": tera * watt,
+        "EUR": eur,
+        "€": eur,
+    }
+    return _SYMPY_UNITS
+
+
+def __getattr__(name: str) -> object:
+    """Create the SymPy units EUR and _SUPPORTED_UNITS on first access."""
+    if name == "_SUPPORTED_UNITS":
+        return _get_supported_units()
+    if name == "EUR":
+        return _get_supported_units()["EUR"]
+    message = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(message)
+
+
+# Native definitions of _SUPPORTED_UNITS as (scale, {dimension: exponent}) in base units g, m, s and EUR.
+# Unknown names are treated as their own dimension (like sympy.Symbol).
+_G = {"g": 1}
+_M = {"m": 1}
+_S = {"s": 1}
+_WATT = {"g": 1, "m": 2, "s": -3}
+_JOULE = {"g": 1, "m": 2, "s": -2}
+_EUR = {"EUR": 1}
+_HOUR = Fraction(3600)
+_YEAR = Fraction(31556925.216)  # same value as sympy.physics.units.year (tropical year)
+_KILO = Fraction(10**3)
+_MEGA = Fraction(10**6)
+_GIGA = Fraction(10**9)
+_TERA = Fraction(10**12)
+
+_NATIVE_UNITS: dict[str, tuple[Fraction, dict[str, int]]] = {
+    "second": (Fraction(1), _S),
+    "s": (Fraction(1), _S),
+    "hour": (_HOUR, _S),
+    "h": (_HOUR, _S),
+    "year": (_YEAR, _S),
+    "y": (_YEAR, _S),
+    "watt": (_KILO, _WATT),
+    "joule": (_KILO, _JOULE),
+    "g": (Fraction(1), _G),
+    "gram": (Fraction(1), _G),
+    "kg": (_KILO, _G),
+    "t": (_MEGA, _G),
+    "tonne": (_MEGA, _G),
+    "meter": (Fraction(1), _M),
+    "m": (Fraction(1), _M),
+    "m3": (Fraction(1), {"m": 3}),
+    "l": (Fraction(1, 1000), {"m": 3}),
+    "Mm3": (_MEGA, {"m": 3}),
+    "kilo": (_KILO, {}),
+    "mega": (_MEGA, {}),
+    "giga": (_GIGA, {}),
+    "tera": (_TERA, {}),
+    "kWh": (_KILO * _KILO * _HOUR, _JOULE),
+    "MWh": (_MEGA * _KILO * _HOUR, _JOULE),
+    "GWh": (_GIGA * _KILO * _HOUR, _JOULE),
+    "TWh": (_TERA * _KILO * _HOUR, _JOULE),
+    "J": (_KILO, _JOULE),
+    "kJ": (_KILO * _KILO, _JOULE),
+    "MJ": (_MEGA * _KILO, _JOULE),
+    "GJ": (_GIGA * _KILO, _JOULE),
+    "kW": (_KILO * _KILO, _WATT),
+    "MW": (_MEGA * _KILO, _WATT),
+    "GW": (_GIGA * _KILO, _WATT),
+    "TW": (_TERA * _KILO, _WATT),
+    "EUR": (Fraction(1), _EUR),
+    "€": (Fraction(1), _EUR),
 }
 
+_UNIT_TOKEN_PATTERN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)|([A-Za-z_€][A-Za-z0-9_€]*)|(\*\*|[*/^()+-]))")
+
+_MAX_NUM_PARSED_UNITS = 10_000
+_PARSED_UNITS: dict[str, tuple[Fraction, dict[str, int]]] = dict()
+
 _FASTPATH_CONVERSION_FACTORS = {
     ("MW", "GW"): 0.001,
     ("MWh", "TWh"): 1e-6,
@@ -79,12 +171,35 @@ _FASTPATH_INCOMPATIBLE_CONVERSIONS = {
 
 _DEBUG = False
 
-_COLLECT_FASTPATH_DATA = False
-_OBSERVED_UNIT_CONVERSIONS = set()
+# Opt-in persistent cache of _FASTPATH_CONVERSION_FACTORS, see enable_persistent_unit_cache.
+_PERSISTENT_CACHE_ENV_VAR = "FRAMCORE_UNIT_CACHE"
+_PERSISTENT_CACHE_ENV_OFF_VALUES = ("", "0", "false", "no", "off")
+_PERSISTENT_CACHE_ENV_DEFAULT_PATH_VALUES = ("1", "true", "yes", "on")
+_PERSISTENT_CACHE_VERSION = 1
+_PERSISTENT_CACHE_PATH: Path | None = None
+_PERSISTENT_CACHE_IS_DIRTY = False
+_PERSISTENT_CACHE_ATEXIT_REGISTERED = False
+
+# QueryStats of the currently running query, if any, see _record_unit_stats
+_QUERY_STATS: QueryStats | None = None
+
+
+@contextlib.contextmanager
+def _record_unit_stats(stats: QueryStats | None) -> Iterator[None]:
+    """Record unit conversions without fastpath in stats while in context."""
+    global _QUERY_STATS  # noqa: PLW0603
+    previous = _QUERY_STATS
+    _QUERY_STATS = stats
+    try:
+        yield
+    finally:
+        _QUERY_STATS = previous
 
 
 def get_unit_conversion_factor(from_unit: str | None, to_unit: str | None) -> float:  # noqa C901
     """Get the conversion factor from one unit to another."""
+    global _PERSISTENT_CACHE_IS_DIRTY  # noqa: PLW0603
+
     if from_unit == to_unit:
         return 1.0
 
@@ -110,22 +225,26 @@ def get_unit_conversion_factor(from_unit: str | None, to_unit: str | None) -> fl
             if _DEBUG is False and fastpath is not None:
                 return fastpath
 
-    if _COLLECT_FASTPATH_DATA and fastpath is None:
+    if _QUERY_STATS is not None and fastpath is None:
         if has_multiplier:
-            _OBSERVED_UNIT_CONVERSIONS.add((base_from_unit, to_unit))
+            _QUERY_STATS.record_unit_fastpath_miss(base_from_unit, to_unit)
         else:
-            _OBSERVED_UNIT_CONVERSIONS.add((from_unit, to_unit))
+            _QUERY_STATS.record_unit_fastpath_miss(from_unit, to_unit)
 
-    fallback = _fallback_get_unit_conversion_factor(from_unit, to_unit)
+    factor = _native_get_unit_conversion_factor(from_unit, to_unit)
 
-    if _DEBUG and fastpath is not None and fallback != fastpath:
-        message = f"Different results!\nfrom_unit {from_unit} to_unit {to_unit}\nfastpath {fastpath} fallback {fallback}"
-        raise RuntimeError(message)
+    if _DEBUG:
+        fallback = _fallback_get_unit_conversion_factor(from_unit, to_unit)
+        if not math.isclose(factor, fallback, rel_tol=1e-12) or (fastpath is not None and not math.isclose(fastpath, fallback, rel_tol=1e-12)):
+            message = f"Different results!\nfrom_unit {from_unit} to_unit {to_unit}\nfastpath {fastpath} native {factor} fallback {fallback}"
+            raise RuntimeError(message)
 
     if _unit_has_no_floats(from_unit) and _unit_has_no_floats(to_unit):
-        _FASTPATH_CONVERSION_FACTORS[(from_unit, to_unit)] = fallback
+        _FASTPATH_CONVERSION_FACTORS[(from_unit, to_unit)] = factor
+        if _PERSISTENT_CACHE_PATH is not None:
+            _PERSISTENT_CACHE_IS_DIRTY = True
 
-    return fallback
+    return factor
 
 
 def _get_unit_conversion_factor_with_none(from_unit: str | None, to_unit: str | None) -> float:
@@ -154,25 +273,123 @@ def _unit_has_no_floats(unit: str) -> bool:
 
 
 def validate_unit_conversion_fastpaths() -> bool:
-    """Run-Time validation of fastpaths."""
+    """
+    Run-Time validation of fastpaths and the native unit engine against SymPy.
+
+    This includes factors loaded from the persistent cache (see enable_persistent_unit_cache).
+    """
     errors = []
     for (from_unit, to_unit), result in _FASTPATH_CONVERSION_FACTORS.items():
         sympy_result = None
         with contextlib.suppress(Exception):
             sympy_result = _fallback_get_unit_conversion_factor(from_unit, to_unit)
-        if result != sympy_result:
+        if sympy_result is None or not math.isclose(result, sympy_result, rel_tol=1e-12):
             message = f"'{from_unit}' to '{to_unit}' failed. Fastpath: {result}, SymPy: {sympy_result}"
             errors.append(message)
+        native_result = None
+        with contextlib.suppress(Exception):
+            native_result = _native_get_unit_conversion_factor(from_unit, to_unit)
+        if sympy_result is None or native_result is None or not math.isclose(native_result, sympy_result, rel_tol=1e-12):
+            message = f"'{from_unit}' to '{to_unit}' failed. Native: {native_result}, SymPy: {sympy_result}"
+            errors.append(message)
     for from_unit, to_unit in _FASTPATH_INCOMPATIBLE_CONVERSIONS:
         with contextlib.suppress(Exception):
             sympy_result = _fallback_get_unit_conversion_factor(from_unit, to_unit)
             message = f"'{from_unit}' to '{to_unit}'. Fastpath claim incompatible units, but SymPy fallback returned {sympy_result}"
             errors.append(message)
+        with contextlib.suppress(Exception):
+            native_result = _native_get_unit_conversion_factor(from_unit, to_unit)
+            message = f"'{from_unit}' to '{to_unit}'. Fastpath claim incompatible units, but native engine returned {native_result}"
+            errors.append(message)
     if errors:
         message = "\n".join(errors)
         raise RuntimeError(message)
 
 
+def enable_persistent_unit_cache(path: Path | str | None = None) -> Path:
+    """
+    Load unit conversion factors from a file, and save new factors to the same file when the process exits.
+
+    Only factors between units without floats are cached (see _unit_has_no_floats). The file is shared between
+    processes: flush_persistent_unit_cache merges with the current content of the file and replaces it atomically.
+    Can also be enabled by setting the environment variable FRAMCORE_UNIT_CACHE to a path, or to 1 (true, yes, on)
+    to use the default path. The values 0, false, no, off and the empty string leave the cache disabled.
+
+    Args:
+        path (Path | str | None, optional): Path to cache file. Defaults to framcore/unit_conversion_factors.json
+            in the user cache directory.
+
+    Returns:
+        Path: Path to the cache file.
+
+    """
+    global _PERSISTENT_CACHE_PATH  # noqa: PLW0603
+    global _PERSISTENT_CACHE_ATEXIT_REGISTERED  # noqa: PLW0603
+
+    _PERSISTENT_CACHE_PATH = Path(path) if path is not None else _get_default_persistent_cache_path()
+
+    for key, factor in _read_persistent_cache(_PERSISTENT_CACHE_PATH).items():
+        _FASTPATH_CONVERSION_FACTORS.setdefault(key, factor)
+
+    if not _PERSISTENT_CACHE_ATEXIT_REGISTERED:
+        atexit.register(flush_persistent_unit_cache)
+        _PERSISTENT_CACHE_ATEXIT_REGISTERED = True
+
+    return _PERSISTENT_CACHE_PATH
+
+
+def flush_persistent_unit_cache() -> None:
+    """Save new unit conversion factors to the persistent cache file, if enabled."""
+    global _PERSISTENT_CACHE_IS_DIRTY  # noqa: PLW0603
+
+    path = _PERSISTENT_CACHE_PATH
+    if path is None or not _PERSISTENT_CACHE_IS_DIRTY:
+        return
+
+    factors = _read_persistent_cache(path)
+    for (from_unit, to_unit), factor in _FASTPATH_CONVERSION_FACTORS.items():
+        if _unit_has_no_floats(from_unit) and _unit_has_no_floats(to_unit):
+            factors[(from_unit, to_unit)] = factor
+
+    content = {
+        "version": _PERSISTENT_CACHE_VERSION,
+        "factors": [[from_unit, to_unit, factor] for (from_unit, to_unit), factor in factors.items()],
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False, encoding="utf-8") as f:
+        tmp_path = Path(f.name)
+        json.dump(content, f)
+    try:
+        tmp_path.replace(path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    _PERSISTENT_CACHE_IS_DIRTY = False
+
+
+def _get_default_persistent_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA") or Path("~/.cache").expanduser()
+    return Path(cache_home) / "framcore" / "unit_conversion_factors.json"
+
+
+def _read_persistent_cache(path: Path) -> dict[tuple[str, str], float]:
+    """Read cache file. Returns empty dict if the file does not exist or is invalid."""
+    try:
+        with path.open(encoding="utf-8") as f:
+            content = json.load(f)
+        if content.get("version") != _PERSISTENT_CACHE_VERSION:
+            return dict()
+        factors = dict()
+        for from_unit, to_unit, factor in content["factors"]:
+            if isinstance(from_unit, str) and isinstance(to_unit, str) and _unit_has_no_floats(from_unit) and _unit_has_no_floats(to_unit):
+                factors[(from_unit, to_unit)] = float(factor)
+        return factors
+    except Exception:
+        return dict()
+
+
 def _fastpath_get_unit_conversion_factor(from_unit: str, to_unit: str) -> float | None:
     """Try to look up the result."""
     key = (from_unit, to_unit)
@@ -184,6 +401,133 @@ def _fastpath_get_unit_conversion_factor(from_unit: str, to_unit: str) -> float
     return None
 
 
+def _native_get_unit_conversion_factor(from_unit: str, to_unit: str) -> float:
+    """Calculate conversion factor by dividing the parsed units."""
+    from_scale, from_dims = _parse_unit(from_unit)
+    to_scale, to_dims = _parse_unit(to_unit)
+
+    if from_dims != to_dims:
+        message = f"Cannot convert from '{from_unit}' to '{to_unit}':\nIncompatible dimensions {from_dims} and {to_dims}"
+        raise ValueError(message)
+
+    return float(from_scale / to_scale)
+
+
+def _parse_unit(unit: str) -> tuple[Fraction, dict[str, int]]:
+    """Parse unit str into (scale, {dimension: exponent}). Supports numbers, names, *, /, ** (or ^) and parentheses."""
+    parsed = _PARSED_UNITS.get(unit)
+    if parsed is not None:
+        return parsed
+
+    tokens = []
+    pos = 0
+    stripped = unit.rstrip()
+    while pos < len(stripped):
+        match = _UNIT_TOKEN_PATTERN.match(stripped, pos)
+        if match is None:
+            message = f"Unit string '{unit}' not valid. Unexpected character at position {pos}."
+            raise ValueError(message)
+        tokens.append(match.groups())
+        pos = match.end()
+
+    parser = _UnitParser(unit, tokens)
+    parsed = parser.parse()
+
+    if len(_PARSED_UNITS) >= _MAX_NUM_PARSED_UNITS:
+        _PARSED_UNITS.clear()
+    _PARSED_UNITS[unit] = parsed
+    return parsed
+
+
+def _multiply_units(
+    x: tuple[Fraction, dict[str, int]],
+    y: tuple[Fraction, dict[str, int]],
+    sign: int,
+) -> tuple[Fraction, dict[str, int]]:
+    """Return x * y if sign is 1, and x / y if sign is -1."""
+    x_scale, x_dims = x
+    y_scale, y_dims = y
+    dims = dict(x_dims)
+    for dim, exp in y_dims.items():
+        new_exp = dims.get(dim, 0) + sign * exp
+        if new_exp == 0:
+            dims.pop(dim, None)
+        else:
+            dims[dim] = new_exp
+    return (x_scale * y_scale if sign == 1 else x_scale / y_scale), dims
+
+
+class _UnitParser:
+    """Recursive descent parser for unit strings, used by _parse_unit."""
+
+    def __init__(self, unit: str, tokens: list[tuple[str | None, str | None, str | None]]) -> None:
+        self._unit = unit
+        self._tokens = tokens
+        self._pos = 0
+
+    def parse(self) -> tuple[Fraction, dict[str, int]]:
+        if not self._tokens:
+            self._error("Empty unit")
+        out = self._product()
+        if self._pos < len(self._tokens):
+            self._error(f"Unexpected token {self._peek_op() or self._tokens[self._pos]}")
+        return out
+
+    def _error(self, reason: str) -> None:
+        message = f"Unit string '{self._unit}' not valid. {reason}."
+        raise ValueError(message)
+
+    def _peek_op(self) -> str | None:
+        if self._pos < len(self._tokens):
+            return self._tokens[self._pos][2]
+        return None
+
+    def _product(self) -> tuple[Fraction, dict[str, int]]:
+        out = self._factor()
+        while self._peek_op() in ("*", "/"):
+            sign = 1 if self._tokens[self._pos][2] == "*" else -1
+            self._pos += 1
+            out = _multiply_units(out, self._factor(), sign)
+        if self._peek_op() in ("+", "-"):
+            self._error("Only *, / and ** are supported in units")
+        return out
+
+    def _factor(self) -> tuple[Fraction, dict[str, int]]:
+        op = self._peek_op()
+        if op in ("+", "-"):
+            self._pos += 1
+            scale, dims = self._factor()
+            return (-scale if op == "-" else scale), dims
+        base = self._atom()
+        if self._peek_op() in ("**", "^"):
+            self._pos += 1
+            exp_scale, exp_dims = self._factor()
+            if exp_dims or exp_scale.denominator != 1:
+                self._error("Only integer exponents are supported")
+            base_scale, base_dims = base
+            exp = int(exp_scale)
+            return base_scale**exp, {dim: e * exp for dim, e in base_dims.items() if exp != 0}
+        return base
+
+    def _atom(self) -> tuple[Fraction, dict[str, int]]:
+        if self._pos >= len(self._tokens):
+            self._error("Unexpected end")
+        number, name, op = self._tokens[self._pos]
+        self._pos += 1
+        if number is not None:
+            return Fraction(number), {}
+        if name is not None:
+            return _NATIVE_UNITS.get(name, (Fraction(1), {name: 1}))
+        if op == "(":
+            out = self._product()
+            if self._peek_op() != ")":
+                self._error("Missing )")
+            self._pos += 1
+            return out
+        self._error(f"Unexpected token {op}")
+        return None
+
+
 def _fallback_get_unit_conversion_factor(from_unit: str, to_unit: str) -> float | str:
     """Calculate conversion factor using sympy."""
     from_unit_sym = _unit_str_to_sym(from_unit)
@@ -203,8 +547,14 @@ def _fallback_get_unit_conversion_factor(from_unit: str, to_unit: str) -> float
 
 def _unit_str_to_sym(unit: str) -> SymPyExpr:
     """Convert str unit to valid sympy representation or error."""
+    import sympy
+    from sympy.core.power import Pow
+    from sympy.core.symbol import Symbol
+    from sympy.physics.units import Quantity
+    from sympy.physics.units.prefixes import Prefix
+
     unit = unit.strip()
-    x = sympy.sympify(unit, locals=_SUPPORTED_UNITS)
+    x = sympy.sympify(unit.replace("€", "EUR"), locals=_get_supported_units())  # € is not a valid Python identifier
     unsupported_args = [arg for arg in x.args if not (isinstance(arg, Prefix | Quantity | Pow | Symbol) or arg.is_number)]
     if unsupported_args:
         message = f"Unit string '{unit}' not valid. Unsupported args: {unsupported_args}"
@@ -214,9 +564,11 @@ def _unit_str_to_sym(unit: str) -> SymPyExpr:
 
 def _get_scalar_from_expr(expr_sym: SymPyExpr) -> float | str:
     """Get scalar value from a sympy expression."""
+    from sympy.physics.units.prefixes import Prefix
+
     simplified_expr = expr_sym.simplify()
     if not simplified_expr.is_number:
-        for prefix in _SUPPORTED_UNITS.values():
+        for prefix in _get_supported_units().values():
             if isinstance(prefix, Prefix):
                 expr_sym = expr_sym.subs(prefix, prefix.scale_factor)
         simplified_expr = expr_sym.simplify()
@@ -232,3 +584,14 @@ def is_convertable(unit_from: str, unit_to: str) -> bool:
         get_unit_conversion_factor(unit_from, unit_to)
         return True
     return False
+
+
+def _enable_persistent_unit_cache_from_env() -> None:
+    """Enable persistent cache if the environment variable FRAMCORE_UNIT_CACHE is set to a path or to an on value."""
+    value = os.environ.get(_PERSISTENT_CACHE_ENV_VAR, "").strip()
+    if value.lower() in _PERSISTENT_CACHE_ENV_OFF_VALUES:
+        return
+    enable_persistent_unit_cache(None if value.lower() in _PERSISTENT_CACHE_ENV_DEFAULT_PATH_VALUES else value)
+
+
+_enable_persistent_unit_cache_from_env()
@@ -8,9 +8,6 @@ from urllib.parse import urlparse
 
 from framcore import Base
 
-os.environ["JULIA_SSL_CA_ROOTS_PATH"] = ""
-os.environ["SSL_CERT_FILE"] = ""
-
 
 def _is_url(url_string: str) -> bool:
     """
@@ -96,6 +93,8 @@ class JuliaModel(Base):
         self._env_path = str(Path(project) / "julia_envs" / self.ENV_NAME) if not self._env_path else str(self._env_path)
         self._depot_path = str(Path(project) / "julia_pkgs") if not self._depot_path else str(self._depot_path)
 
+        os.environ["JULIA_SSL_CA_ROOTS_PATH"] = ""
+        os.environ["SSL_CERT_FILE"] = ""
         os.environ["PYTHON_JULIAPKG_PROJECT"] = self._env_path
         os.environ["JULIA_DEPOT_PATH"] = self._depot_path
         if self._julia_path:  # If Julia path is not set, let JuliaCall handle defaults.
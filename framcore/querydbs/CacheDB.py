@@ -1,9 +1,29 @@
+import heapq
+import itertools
+
+import numpy as np
+
 from framcore import Model
 from framcore.querydbs import QueryDB
 
+# Size accounted for cached values that are not arrays (e.g. floats)
+_NOMINAL_VALUE_BYTES = 64
+
 
 class CacheDB(QueryDB):
-    """Stores models and precomputed values."""
+    """
+    Stores models and precomputed values.
+
+    The cache can be given a byte budget (see set_max_bytes). When the budget is exceeded, values are evicted
+    with the GreedyDual-Size policy: Values that took long to compute relative to their size, and values that
+    were recently used, are kept longest.
+
+    While a value is computed, CacheDB records which model keys were read. When an item in the data of one
+    of the models is set or deleted, only the cached values that depended on that key are removed.
+    Queries call discard_computing when computing a value fails, so that recording for it stops.
+    Values put without a preceding cache miss in has_key, or computed with get_data, are removed on any change.
+    Changes inside objects stored in the models (as opposed to replacing them) are not detected.
+    """
 
     def __init__(self, model: Model, *models: tuple[Model]) -> None:
         """
@@ -18,6 +38,25 @@ class CacheDB(QueryDB):
         self._cache = dict()
         self._min_elapsed_seconds = 0.01
 
+        # GreedyDual-Size state. _priorities may contain stale entries, which are skipped on eviction.
+        self._max_bytes: int | None = None
+        self._num_bytes = 0
+        self._inflation = 0.0
+        self._entries: dict[object, tuple[float, int, int, float]] = dict()  # key -> (priority, seq, num_bytes, elapsed_seconds)
+        self._priorities: list[tuple[float, int, object]] = []
+        self._seq = itertools.count()
+
+        # Dependency tracking. None means the value may depend on any model key.
+        self._computing: dict[object, set[str] | None] = dict()  # keys being computed -> model keys read so far
+        self._dependencies: dict[object, set[str] | None] = dict()  # cached key -> model keys
+        self._dependents: dict[str, set[object]] = dict()  # model key -> cached keys
+        self._depends_on_all: set[object] = set()
+
+        for m in self._models:
+            data = m.get_data()
+            if hasattr(data, "add_listener"):  # ModelDict
+                data.add_listener(self._on_model_data_changed)
+
     def set_min_elapsed_seconds(self, value: float) -> None:
         """Values that takes below this threshold to compute, does not get cached."""
         self._check_type(value, float)
@@ -28,23 +67,152 @@ class CacheDB(QueryDB):
         """Values that takes below this threshold to compute, does not get cached."""
         return self._min_elapsed_seconds
 
+    def set_max_bytes(self, value: int | None) -> None:
+        """Set max total size of cached values in bytes. None means no limit. Evicts values if needed."""
+        self._check_type(value, (int, type(None)))
+        if value is not None:
+            self._check_int(value=value, lower_bound=0, upper_bound=None)
+        self._max_bytes = value
+        self._evict()
+
+    def get_max_bytes(self) -> int | None:
+        """Get max total size of cached values in bytes. None means no limit."""
+        return self._max_bytes
+
+    def get_num_bytes(self) -> int:
+        """Get current total size of cached values in bytes."""
+        return self._num_bytes
+
+    def get_num_values(self) -> int:
+        """Get number of cached values."""
+        return len(self._cache)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self._cache.clear()
+        self._entries.clear()
+        self._priorities.clear()
+        self._num_bytes = 0
+        self._inflation = 0.0
+        self._computing.clear()
+        self._dependencies.clear()
+        self._dependents.clear()
+        self._depends_on_all.clear()
+
+    def get_dependencies(self, key: object) -> set[str] | None:
+        """Get model keys the cached value behind key depends on. None means it may depend on any model key."""
+        if key not in self._cache:
+            message = f"Key '{key}' not cached."
+            raise KeyError(message)
+        dependencies = self._dependencies[key]
+        return None if dependencies is None else set(dependencies)
+
     def _get(self, key: object) -> object:
         if key in self._cache:
+            self._touch(key)
+            self._add_dependencies(self._dependencies[key])
             return self._cache[key]
         for m in self._models:
             data = m.get_data()
             if key in data:
+                self._add_dependencies((key,))
                 return data[key]
         message = f"Key '{key}' not found."
         raise KeyError(message)
 
     def _has_key(self, key: object) -> bool:
-        return key in self._cache or any(key in m.get_data() for m in self._models)
+        if key in self._cache:
+            return True
+        if any(key in m.get_data() for m in self._models):
+            return True
+        if isinstance(key, tuple):  # cache keys of queries are tuples. The value is typically computed and put next
+            self._computing.setdefault(key, set())
+        elif isinstance(key, str):
+            self._add_dependencies((key,))  # value would change if key is added
+        return False
 
     def _put(self, key: object, value: object, elapsed_seconds: float) -> None:
+        dependencies = self._computing.pop(key, None)
         if elapsed_seconds < self._min_elapsed_seconds:
             return
+        num_bytes = value.nbytes if isinstance(value, np.ndarray) else _NOMINAL_VALUE_BYTES
+        if self._max_bytes is not None and num_bytes > self._max_bytes:
+            return
+        if key in self._cache:
+            self._remove(key)
         self._cache[key] = value
+        self._num_bytes += num_bytes
+        self._set_priority(key, num_bytes, elapsed_seconds)
+        self._set_dependencies(key, dependencies)
+        self._evict()
+
+    def _discard_computing(self, key: object) -> None:
+        self._computing.pop(key, None)
 
     def _get_data(self) -> dict:
+        self._add_dependencies(None)
         return self._models[0].get_data()
+
+    def _add_dependencies(self, model_keys: set[str] | tuple[str] | None) -> None:
+        """Record that the values being computed depend on model_keys (None means any model key)."""
+        for key, dependencies in self._computing.items():
+            if model_keys is None:
+                self._computing[key] = None
+            elif dependencies is not None:
+                dependencies.update(model_keys)
+
+    def _set_dependencies(self, key: object, dependencies: set[str] | None) -> None:
+        self._dependencies[key] = dependencies
+        if dependencies is None:
+            self._depends_on_all.add(key)
+            return
+        for model_key in dependencies:
+            self._dependents.setdefault(model_key, set()).add(key)
+
+    def _on_model_data_changed(self, model_keys: list[str]) -> None:
+        keys = set(self._depends_on_all)
+        for model_key in model_keys:
+            keys.update(self._dependents.get(model_key, ()))
+        for key in keys:
+            self._remove(key)
+
+    def _remove(self, key: object) -> None:
+        """Remove cached value. Entries in _priorities become stale."""
+        del self._cache[key]
+        self._num_bytes -= self._entries.pop(key)[2]
+        dependencies = self._dependencies.pop(key)
+        if dependencies is None:
+            self._depends_on_all.discard(key)
+            return
+        for model_key in dependencies:
+            dependents = self._dependents[model_key]
+            dependents.discard(key)
+            if not dependents:
+                del self._dependents[model_key]
+
+    def _touch(self, key: object) -> None:
+        __, __, num_bytes, elapsed_seconds = self._entries[key]
+        self._set_priority(key, num_bytes, elapsed_seconds)
+
+    def _set_priority(self, key: object, num_bytes: int, elapsed_seconds: float) -> None:
+        priority = self._inflation + elapsed_seconds / max(num_bytes, 1)
+        seq = next(self._seq)
+        self._entries[key] = (priority, seq, num_bytes, elapsed_seconds)
+        heapq.heappush(self._priorities, (priority, seq, key))
+        if len(self._priorities) > 2 * len(self._entries) + 64:
+            self._compact_priorities()
+
+    def _compact_priorities(self) -> None:
+        self._priorities = [(priority, seq, key) for key, (priority, seq, __, __) in self._entries.items()]
+        heapq.heapify(self._priorities)
+
+    def _evict(self) -> None:
+        if self._max_bytes is None:
+            return
+        while self._num_bytes > self._max_bytes:
+            priority, seq, key = heapq.heappop(self._priorities)
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != seq:
+                continue  # stale
+            self._remove(key)
+            self._inflation = priority
@@ -0,0 +1,146 @@
+import contextlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from framcore import Model
+from framcore.querydbs import CacheDB
+from framcore.querydbs._digests import _KeyDigester
+
+# Increment when the format of stored values, or how they are computed, changes. Old entries are then not found.
+_PERSISTENT_CACHE_VERSION = 1
+
+_INDEX_FILE_NAME = "index.jsonl"
+_ARRAYS_DIR_NAME = "arrays"
+
+
+class PersistentCacheDB(CacheDB):
+    """
+    CacheDB that also stores precomputed values on local disk, so they are found again in later runs.
+
+    Values are stored on disk behind a digest of the key, where Exprs, TimeVectors, Curves and TimeIndexes in the key
+    are represented by the hash of their Fingerprint, and TimeVectors also by their reference period. References in
+    Exprs are followed through the models, so the digest changes when the data a value depends on is replaced.
+    Changes that are not seen by Fingerprints or reference periods give the same digest, and the stale value on disk
+    is used. Remove the cache directory after such changes.
+
+    Vectors are stored as .npy files and loaded as read-only memory-mapped arrays. Scalars are stored in an index file.
+    Values of other types, and values with keys that have no fingerprint, are only cached in memory.
+
+    Values are also cached in memory as in CacheDB, within its byte budget (see set_max_bytes). Values loaded from
+    disk are cached in memory as if they took min_elapsed_seconds to compute, so they are evicted first, and are
+    removed from memory on any change in the data of the models. Values on disk are kept, and found again if the
+    data they depend on is unchanged.
+    """
+
+    def __init__(self, path: Path | str, model: Model, *models: tuple[Model]) -> None:
+        """
+        Initialize PersistentCacheDB with a cache directory and one or more Model instances.
+
+        Args:
+            path (Path | str): Directory to store values in. Created if it does not exist.
+            model (Model): The primary Model instance.
+            *models (tuple[Model]): Additional Model instances.
+
+        """
+        super().__init__(model, *models)
+        self._check_type(path, (Path, str))
+        self._path = Path(path)
+
+        self._digester = _KeyDigester(self._models, salt=_PERSISTENT_CACHE_VERSION)
+
+        (self._path / _ARRAYS_DIR_NAME).mkdir(parents=True, exist_ok=True)
+        self._scalars: dict[str, float] = self._read_index()
+
+    def get_path(self) -> Path:
+        """Get directory where values are stored."""
+        return self._path
+
+    def _get(self, key: object) -> object:
+        if key not in self._cache:
+            value = self._load_stored(key)
+            if value is not None and key not in self._cache:
+                return value  # larger than the byte budget
+        return super()._get(key)
+
+    def _has_key(self, key: object) -> bool:
+        if key not in self._cache and self._load_stored(key) is not None:
+            return True
+        return super()._has_key(key)
+
+    def _put(self, key: object, value: object, elapsed_seconds: float) -> None:
+        super()._put(key, value, elapsed_seconds)
+        if elapsed_seconds < self._min_elapsed_seconds:
+            return
+
+        digest = self._digester.get_digest(key)
+        if digest is None:
+            return
+        if isinstance(value, np.ndarray):
+            self._store_array(digest, value)
+        elif isinstance(value, float | int | np.floating) and not isinstance(value, bool):
+            self._store_scalar(digest, float(value))
+
+    def _on_model_data_changed(self, model_keys: list[str]) -> None:
+        super()._on_model_data_changed(model_keys)
+        self._digester.clear()  # digests may depend on the changed items through references
+
+    def _load_stored(self, key: object) -> object | None:
+        """Load value behind key from disk into the memory cache. Return None if not stored."""
+        value = self._load(key)
+        if value is not None:
+            # Dependencies of the value are not known, so it is removed on any change in model data
+            super()._put(key, value, self._min_elapsed_seconds)
+        return value
+
+    def _load(self, key: object) -> object | None:
+        if not isinstance(key, tuple):
+            return None
+        digest = self._digester.get_digest(key)
+        if digest is None:
+            return None
+        if digest in self._scalars:
+            return self._scalars[digest]
+        array_path = self._get_array_path(digest)
+        if array_path.exists():
+            return np.load(array_path, mmap_mode="r")
+        return None
+
+    def _get_array_path(self, digest: str) -> Path:
+        return self._path / _ARRAYS_DIR_NAME / f"{digest}.npy"
+
+    def _store_array(self, digest: str, value: np.ndarray) -> None:
+        array_path = self._get_array_path(digest)
+        if array_path.exists():
+            return
+        fd, tmp_name = tempfile.mkstemp(dir=array_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, value)
+            Path(tmp_name).replace(array_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                Path(tmp_name).unlink()
+            raise
+
+    def _store_scalar(self, digest: str, value: float) -> None:
+        if digest in self._scalars:
+            return
+        self._scalars[digest] = value
+        with (self._path / _INDEX_FILE_NAME).open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": digest, "value": value}) + "\n")
+
+    def _read_index(self) -> dict[str, float]:
+        index_path = self._path / _INDEX_FILE_NAME
+        scalars = dict()
+        if not index_path.exists():
+            return scalars
+        with index_path.open(encoding="utf-8") as f:
+            for line in f:
+                with contextlib.suppress(ValueError, KeyError, TypeError):  # ignore partly written lines
+                    entry = json.loads(line)
+                    scalars[entry["key"]] = float(entry["value"])
+        return scalars
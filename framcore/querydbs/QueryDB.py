@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
 from framcore import Base
+from framcore.querydbs.QueryStats import QueryStats
 
 
 class QueryDB(Base, ABC):
@@ -10,8 +11,12 @@ class QueryDB(Base, ABC):
     Provides an interface for getting, putting, and checking keys in a database.
     Subclasses must implement the _get, _put, and _has_key methods.
 
+    Optionally holds a QueryStats object, which queries against the db record statistics in.
+
     """
 
+    _stats: QueryStats | None = None
+
     def get(self, key: object) -> object:
         """Get value behind key from db."""
         return self._get(key)
@@ -24,10 +29,23 @@ class QueryDB(Base, ABC):
         """Return True if db has value behind key."""
         return self._has_key(key)
 
+    def discard_computing(self, key: object) -> None:
+        """Tell db that no value will be put behind key after a miss in has_key, e.g. because computing it failed."""
+        self._discard_computing(key)
+
     def get_data(self) -> dict:
         """Return output of get_data called on first underlying model."""
         return self._get_data()
 
+    def get_stats(self) -> QueryStats | None:
+        """Return QueryStats recording statistics about queries against db, or None if not enabled."""
+        return self._stats
+
+    def set_stats(self, stats: QueryStats | None) -> None:
+        """Set QueryStats to record statistics about queries against db in. Set None to disable."""
+        self._check_type(stats, (QueryStats, type(None)))
+        self._stats = stats
+
     @abstractmethod
     def _get(self, key: object) -> object:
         pass
@@ -43,3 +61,6 @@ class QueryDB(Base, ABC):
     @abstractmethod
     def _get_data(self) -> dict:
         pass
+
+    def _discard_computing(self, key: object) -> None:
+        pass
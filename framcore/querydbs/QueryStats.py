@@ -0,0 +1,105 @@
+import heapq
+import itertools
+
+from framcore import Base
+
+
+class QueryStats(Base):
+    """
+    Statistics about queries against a QueryDB.
+
+    Records, per evaluation path (e.g. the fastpaths of level queries), the number of evaluations,
+    the cumulative wall time and the slowest expressions. Also records cache hits and misses per
+    type of query, and unit conversions that did not have a fastpath.
+
+    Useful to find which expressions or units in a run are worth adding fastpaths for.
+
+    Enable by setting a QueryStats object on a QueryDB:
+
+        stats = QueryStats()
+        db.set_stats(stats)
+        ... run queries against db ...
+        print(stats.get_snapshot())
+
+    """
+
+    def __init__(self, max_slowest: int = 10) -> None:
+        """
+        Initialize empty QueryStats.
+
+        Args:
+            max_slowest (int, optional): Number of slowest expressions to keep per evaluation path. Defaults to 10.
+
+        """
+        self._check_type(max_slowest, int)
+        self._check_int(value=max_slowest, lower_bound=0, upper_bound=None)
+        self._max_slowest = max_slowest
+        self._counter = itertools.count()
+        self.reset()
+
+    def get_max_slowest(self) -> int:
+        """Return number of slowest expressions kept per evaluation path."""
+        return self._max_slowest
+
+    def reset(self) -> None:
+        """Remove all recorded statistics."""
+        self._path_counts: dict[str, int] = dict()
+        self._path_seconds: dict[str, float] = dict()
+        self._path_slowest: dict[str, list[tuple[float, int, object]]] = dict()
+        self._cache_hits: dict[str, int] = dict()
+        self._cache_misses: dict[str, int] = dict()
+        self._unit_fastpath_misses: dict[tuple[str, str], int] = dict()
+
+    def record_path(self, path: str, elapsed_seconds: float, expr: object) -> None:
+        """Record that expr was evaluated by path in elapsed_seconds."""
+        self._path_counts[path] = self._path_counts.get(path, 0) + 1
+        self._path_seconds[path] = self._path_seconds.get(path, 0.0) + elapsed_seconds
+
+        if self._max_slowest == 0:
+            return
+        slowest = self._path_slowest.setdefault(path, [])
+        item = (elapsed_seconds, next(self._counter), expr)
+        if len(slowest) < self._max_slowest:
+            heapq.heappush(slowest, item)
+        elif elapsed_seconds > slowest[0][0]:
+            heapq.heapreplace(slowest, item)
+
+    def record_cache_hit(self, name: str) -> None:
+        """Record that a query of type name was found in the cache."""
+        self._cache_hits[name] = self._cache_hits.get(name, 0) + 1
+
+    def record_cache_miss(self, name: str) -> None:
+        """Record that a query of type name was not found in the cache."""
+        self._cache_misses[name] = self._cache_misses.get(name, 0) + 1
+
+    def record_unit_fastpath_miss(self, from_unit: str, to_unit: str) -> None:
+        """Record that the conversion factor from from_unit to to_unit was not found in the unit fastpaths."""
+        key = (from_unit, to_unit)
+        self._unit_fastpath_misses[key] = self._unit_fastpath_misses.get(key, 0) + 1
+
+    def get_snapshot(self) -> dict:
+        """
+        Return a copy of the recorded statistics.
+
+        Returns:
+            dict with keys
+            - "paths": {path: {"count": int, "seconds": float, "slowest": [(seconds, expr), ...]}}, with slowest first
+            - "cache_hits": {name: int}
+            - "cache_misses": {name: int}
+            - "unit_fastpath_misses": {(from_unit, to_unit): int}
+
+        """
+        paths = dict()
+        for path, count in self._path_counts.items():
+            slowest = sorted(self._path_slowest.get(path, []), reverse=True)
+            paths[path] = {
+                "count": count,
+                "seconds": self._path_seconds[path],
+                "slowest": [(seconds, expr) for seconds, __, expr in slowest],
+            }
+        return {
+            "paths": paths,
+            "cache_hits": dict(self._cache_hits),
+            "cache_misses": dict(self._cache_misses),
+            "unit_fastpath_misses": dict(self._unit_fastpath_misses),
+        }
@@ -0,0 +1,214 @@
+import contextlib
+import multiprocessing
+import os
+import secrets
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from framcore import Model
+from framcore.querydbs import CacheDB
+from framcore.querydbs._digests import _KeyDigester
+
+# States of slots in the shared index
+_EMPTY = 0
+_WRITING = 1
+_READY = 2
+
+_MAX_NDIM = 4
+_MAX_DTYPE_STR_LEN = 8
+
+_INDEX_DTYPE = np.dtype(
+    [
+        ("state", np.uint8),
+        ("digest", "S40"),
+        ("dtype", f"S{_MAX_DTYPE_STR_LEN}"),
+        ("ndim", np.uint8),
+        ("shape", np.int64, (_MAX_NDIM,)),
+        ("elapsed_seconds", np.float64),
+        ("writer_pid", np.int64),
+    ],
+)
+
+
+class SharedMemoryCacheDB(CacheDB):
+    """
+    CacheDB that shares computed arrays with other processes on the same host through shared memory.
+
+    Arrays put in the db are published in multiprocessing.shared_memory segments, listed in a small shared index.
+    When a value is not cached locally, other processes look it up in the index and map the segment zero-copy
+    (as a read-only array) instead of computing it again. Keys are matched by digest (see PersistentCacheDB),
+    so the processes must have equal model data for values to be shared.
+
+    Sharing works with processes forked after the SharedMemoryCacheDB is created (e.g. the workers of QueryExecutor).
+    The process that created the db owns the segments, and removes them in close, when the db is garbage collected,
+    or when the process exits. Values that are not arrays are only cached locally. A slot left half-written by a
+    process that died is reclaimed when the same value is published again.
+    """
+
+    def __init__(self, model: Model, *models: tuple[Model], max_shared_values: int = 4096) -> None:
+        """
+        Initialize SharedMemoryCacheDB with one or more Model instances.
+
+        Args:
+            model (Model): The primary Model instance.
+            *models (tuple[Model]): Additional Model instances.
+            max_shared_values (int, optional): Number of slots in the shared index. Arrays are not shared when the
+                index is full. Defaults to 4096.
+
+        """
+        super().__init__(model, *models)
+        self._check_type(max_shared_values, int)
+        self._check_int(value=max_shared_values, lower_bound=1, upper_bound=None)
+
+        self._digester = _KeyDigester(self._models, salt="SharedMemoryCacheDB")
+        self._prefix = f"fc{secrets.token_hex(4)}_"  # short, as some platforms limit names to 31 characters
+        self._lock = multiprocessing.Lock()
+        self._index_memory = SharedMemory(create=True, size=max_shared_values * _INDEX_DTYPE.itemsize)
+        self._index = np.ndarray((max_shared_values,), dtype=_INDEX_DTYPE, buffer=self._index_memory.buf)
+        self._index["state"] = _EMPTY
+        self._segments: dict[str, SharedMemory] = dict()  # segments mapped by this process
+
+        self._finalizer = weakref.finalize(self, _remove_segments, os.getpid(), self._prefix, self._index_memory)
+
+    def get_max_shared_values(self) -> int:
+        """Get number of slots in the shared index."""
+        return len(self._index)
+
+    def get_num_shared_values(self) -> int:
+        """Get number of arrays published in shared memory, by any process."""
+        with self._lock:
+            return int(np.count_nonzero(self._index["state"] == _READY))
+
+    def close(self) -> None:
+        """Remove values from the cache and unmap shared segments. Shared segments are removed if called by the owner."""
+        self.clear()
+        self._index = None
+        for segment in self._segments.values():
+            with contextlib.suppress(BufferError):  # arrays returned by get may still use it
+                segment.close()
+        self._segments.clear()
+        self._finalizer()
+
+    def _on_model_data_changed(self, model_keys: list[str]) -> None:
+        super()._on_model_data_changed(model_keys)
+        self._digester.clear()
+
+    def _has_key(self, key: object) -> bool:
+        if isinstance(key, tuple) and key not in self._cache and self._load_shared(key):
+            return True
+        return super()._has_key(key)
+
+    def _put(self, key: object, value: object, elapsed_seconds: float) -> None:
+        super()._put(key, value, elapsed_seconds)
+        if elapsed_seconds >= self._min_elapsed_seconds and isinstance(key, tuple) and _is_shareable(value):
+            self._publish(key, value, elapsed_seconds)
+
+    def _load_shared(self, key: object) -> bool:
+        """Map value behind key from shared memory into the local cache. Return False if not found."""
+        if self._index is None:
+            return False
+        digest = self._digester.get_digest(key)
+        if digest is None:
+            return False
+        with self._lock:
+            slot = self._find_slot(digest)
+            if slot is None or self._index[slot]["state"] != _READY:
+                return False
+            entry = self._index[slot].copy()
+
+        name = f"{self._prefix}{slot}"
+        if name not in self._segments:
+            self._segments[name] = SharedMemory(name=name)
+        shape = tuple(int(n) for n in entry["shape"][: entry["ndim"]])
+        value = np.ndarray(shape, dtype=np.dtype(entry["dtype"].decode()), buffer=self._segments[name].buf)
+        value.flags.writeable = False
+
+        # Dependencies of the value are not known in this process, so it is removed on any change in model data
+        super()._put(key, value, float(entry["elapsed_seconds"]))
+        return key in self._cache
+
+    def _publish(self, key: object, value: np.ndarray, elapsed_seconds: float) -> None:
+        if self._index is None:
+            return
+        digest = self._digester.get_digest(key)
+        if digest is None:
+            return
+        with self._lock:
+            slot = self._find_slot(digest)
+            if slot is None:
+                return  # index is full
+            entry = self._index[slot]
+            if entry["state"] == _WRITING and not _is_process_alive(int(entry["writer_pid"])):
+                _unlink_segment(f"{self._prefix}{slot}")  # may be left by the dead writer
+            elif entry["state"] != _EMPTY:
+                return  # value is published, or being published, by another process
+            entry["state"] = _WRITING
+            entry["digest"] = digest.encode()
+            entry["writer_pid"] = os.getpid()
+
+        name = f"{self._prefix}{slot}"
+        try:
+            segment = SharedMemory(name=name, create=True, size=max(value.nbytes, 1))
+            np.ndarray(value.shape, dtype=value.dtype, buffer=segment.buf)[...] = value
+        except BaseException:
+            with self._lock:
+                self._index[slot]["state"] = _EMPTY
+            raise
+        self._segments[name] = segment
+
+        with self._lock:
+            entry = self._index[slot]
+            entry["dtype"] = value.dtype.str.encode()
+            entry["ndim"] = value.ndim
+            entry["shape"][: value.ndim] = value.shape
+            entry["elapsed_seconds"] = elapsed_seconds
+            entry["state"] = _READY
+
+    def _find_slot(self, digest: str) -> int | None:
+        """Return slot holding digest, or the empty slot where it would be added, or None if the index is full."""
+        num_slots = len(self._index)
+        start = int(digest[:16], 16) % num_slots
+        encoded = digest.encode()
+        for i in range(num_slots):
+            slot = (start + i) % num_slots
+            entry = self._index[slot]
+            if entry["state"] == _EMPTY or entry["digest"] == encoded:
+                return slot
+        return None
+
+
+def _is_shareable(value: object) -> bool:
+    return isinstance(value, np.ndarray) and value.ndim <= _MAX_NDIM and not value.dtype.hasobject and len(value.dtype.str) <= _MAX_DTYPE_STR_LEN
+
+
+def _is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, but owned by another user
+    return True
+
+
+def _unlink_segment(name: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        segment = SharedMemory(name=name)
+        segment.close()
+        segment.unlink()
+
+
+def _remove_segments(owner_pid: int, prefix: str, index_memory: SharedMemory) -> None:
+    """Unlink all segments listed in the index, and the index itself. Does nothing in other processes than the owner."""
+    if os.getpid() != owner_pid:
+        return
+    index = np.ndarray((index_memory.size // _INDEX_DTYPE.itemsize,), dtype=_INDEX_DTYPE, buffer=index_memory.buf)
+    used_slots = np.flatnonzero(index["state"] != _EMPTY).tolist()
+    del index
+    for slot in used_slots:
+        _unlink_segment(f"{prefix}{slot}")
+    with contextlib.suppress(BufferError):  # the SharedMemoryCacheDB may still have a view of the index
+        index_memory.close()
+    index_memory.unlink()
@@ -1,11 +1,17 @@
 # framcore/querydbs/__init__.py
 
+from framcore.querydbs.QueryStats import QueryStats
 from framcore.querydbs.QueryDB import QueryDB
 from framcore.querydbs.ModelDB import ModelDB
 from framcore.querydbs.CacheDB import CacheDB
+from framcore.querydbs.PersistentCacheDB import PersistentCacheDB
+from framcore.querydbs.SharedMemoryCacheDB import SharedMemoryCacheDB
 
 __all__ = [
     "CacheDB",
     "ModelDB",
+    "PersistentCacheDB",
     "QueryDB",
+    "QueryStats",
+    "SharedMemoryCacheDB",
 ]
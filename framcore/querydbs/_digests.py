@@ -0,0 +1,105 @@
+import hashlib
+
+from framcore import Model
+from framcore.fingerprints import Fingerprint, FingerprintRef
+from framcore.timevectors import ReferencePeriod, TimeVector
+
+# Max number of memoized digests of keys. The least recently used is removed first.
+_MAX_NUM_DIGESTS = 4096
+
+
+class _NoDigestError(Exception):
+    """Raised when a key cannot be converted to a digest."""
+
+
+class _KeyDigester:
+    """
+    Compute digests of cache keys that are stable across processes and runs.
+
+    Exprs, TimeVectors, Curves and TimeIndexes in the key are represented by the hash of their Fingerprint.
+    TimeVectors are also represented by their reference period, which is excluded from their Fingerprint.
+    References in Exprs are followed through the models, so the digest changes when any data the value depends on changes.
+    Digests of the most recently used keys are memoized. Call clear when the data of the models change.
+    """
+
+    def __init__(self, models: tuple[Model], salt: object) -> None:
+        self._models = models
+        self._salt = salt
+        self._digests: dict[object, str | None] = dict()
+        self._ref_digests: dict[str, tuple[object, str]] = dict()
+
+    def clear(self) -> None:
+        self._digests.clear()
+        self._ref_digests.clear()
+
+    def get_digest(self, key: object) -> str | None:
+        """Get digest of key, or None if key cannot be represented by fingerprints."""
+        if key in self._digests:
+            digest = self._digests.pop(key)
+            self._digests[key] = digest  # move to end as most recently used
+            return digest
+        try:
+            digest = _hash_str(repr((self._salt, self._get_value_digest(key, set()))))
+        except _NoDigestError:
+            digest = None
+        if len(self._digests) >= _MAX_NUM_DIGESTS:
+            del self._digests[next(iter(self._digests))]
+        self._digests[key] = digest
+        return digest
+
+    def _get_value_digest(self, value: object, active: set[str]) -> str:
+        if value is None or isinstance(value, bool | int | float | str):
+            return repr(value)
+        if isinstance(value, tuple):
+            return repr(tuple(self._get_value_digest(x, active) for x in value))
+        if isinstance(value, TimeVector):
+            fingerprint_digest = self._get_fingerprint_digest(value.get_fingerprint(), active)
+            return repr((type(value).__name__, fingerprint_digest, _get_reference_period_digest(value.get_reference_period())))
+        if hasattr(value, "get_fingerprint"):
+            return repr((type(value).__name__, self._get_fingerprint_digest(value.get_fingerprint(), active)))
+        message = f"Cannot compute digest of {value}"
+        raise _NoDigestError(message)
+
+    def _get_fingerprint_digest(self, fingerprint: Fingerprint, active: set[str]) -> str:
+        """Like Fingerprint.get_hash, but references are replaced by the digest of the referenced object."""
+        parts = []
+        for name, part in fingerprint.get_parts().items():
+            if isinstance(part, Fingerprint):
+                parts.append((name, self._get_fingerprint_digest(part, active)))
+            elif isinstance(part, FingerprintRef):
+                parts.append((name, self._get_ref_digest(part.get_key(), active)))
+            else:
+                parts.append((name, part))
+        return _hash_str(repr(sorted(parts)))
+
+    def _get_ref_digest(self, ref_key: str, active: set[str]) -> str:
+        obj = self._get_from_models(ref_key)
+        if ref_key in self._ref_digests and self._ref_digests[ref_key][0] is obj:
+            return self._ref_digests[ref_key][1]
+        if ref_key in active:
+            message = f"Cycle of references at '{ref_key}'"
+            raise _NoDigestError(message)
+        active.add(ref_key)
+        digest = self._get_value_digest(obj, active)
+        active.remove(ref_key)
+        self._ref_digests[ref_key] = (obj, digest)
+        return digest
+
+    def _get_from_models(self, ref_key: str) -> object:
+        if isinstance(ref_key, str):
+            for m in self._models:
+                data = m.get_data()
+                if ref_key in data:
+                    return data[ref_key]
+        message = f"Reference '{ref_key}' not found."
+        raise _NoDigestError(message)
+
+
+def _get_reference_period_digest(reference_period: ReferencePeriod | None) -> str:
+    if reference_period is None:
+        return repr(None)
+    return repr((reference_period.get_start_year(), reference_period.get_num_years()))
+
+
+def _hash_str(value: str) -> str:
+    return hashlib.sha1(value.encode()).hexdigest()
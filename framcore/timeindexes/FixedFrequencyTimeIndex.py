@@ -8,9 +8,13 @@ from numpy.typing import NDArray
 
 import framcore.timeindexes._time_vector_operations as v_ops
 from framcore.fingerprints import Fingerprint
+from framcore.timeindexes.ResamplingPlan import ResamplingPlan, get_resampling_plan
 from framcore.timeindexes.TimeIndex import TimeIndex  # NB! full import path needed for inheritance to work
 from framcore.timevectors import ReferencePeriod
 
+# A ResamplingPlan is only created if it has at most this many indices per input and output value.
+_MAX_PLAN_SIZE_FACTOR = 4
+
 
 class FixedFrequencyTimeIndex(TimeIndex):
     """TimeIndex with fixed frequency."""
@@ -226,6 +230,87 @@ class FixedFrequencyTimeIndex(TimeIndex):
         )
         return target_vector[0]
 
+    def get_cumulative_integral(self, vector: NDArray) -> NDArray:
+        """
+        Get the cumulative integral of vector, which gives period averages in constant time.
+
+        See get_period_averages_from_cumulative_integral. Typically computed once per vector and cached.
+
+        Returns:
+            float64 NDArray with num_periods + 1 values, where value i is the sum of the first i values of vector.
+
+        """
+        self._check_type(vector, np.ndarray)
+        if vector.shape != (self.get_num_periods(),):
+            msg = f"Vector shape {vector.shape} does not match number of periods {self.get_num_periods()} of timeindex ({self})."
+            raise ValueError(msg)
+        cumulative_integral = np.zeros(self._num_periods + 1, dtype=np.float64)
+        np.cumsum(vector, dtype=np.float64, out=cumulative_integral[1:])
+        return cumulative_integral
+
+    def get_period_averages_from_cumulative_integral(
+        self,
+        cumulative_integral: NDArray,
+        start_time: datetime,
+        period_duration: timedelta,
+        num_periods: int,
+        is_52_week_years: bool,
+    ) -> NDArray | None:
+        """
+        Get the average of the vector over each of num_periods periods, using its cumulative integral.
+
+        Gives the same averages as write_into_fixed_frequency with a target FixedFrequencyTimeIndex with these arguments,
+        by interpolating in the cumulative integral at the period boundaries. Values before the first and after the
+        last period are extrapolated if allowed by the extrapolation flags of this TimeIndex.
+
+        Args:
+            cumulative_integral (NDArray): Output of get_cumulative_integral.
+            start_time (datetime): Start time of the first period.
+            period_duration (timedelta): Duration of each period.
+            num_periods (int): Number of periods.
+            is_52_week_years (bool): Whether the periods are in 52-week years.
+
+        Returns:
+            float64 NDArray with the average of each period, or None if the averages cannot be computed this way
+            (i.e. is_52_week_years differs from this TimeIndex, or this one-year TimeIndex must be repeated).
+            Use write_into_fixed_frequency or get_period_average then.
+
+        """
+        if cumulative_integral.shape != (self._num_periods + 1,):
+            msg = f"Cumulative integral shape {cumulative_integral.shape} does not match number of periods {self._num_periods} of timeindex ({self})."
+            raise ValueError(msg)
+        if is_52_week_years != self._is_52_week_years:
+            return None
+
+        # Period boundaries as whole seconds of (model) time since start of this TimeIndex
+        source_seconds = int(self._period_duration.total_seconds())
+        target_seconds = int(period_duration.total_seconds())
+        first_seconds = self._get_offset_seconds(start_time)
+        last_seconds = first_seconds + num_periods * target_seconds
+        total_seconds = self._num_periods * source_seconds
+
+        is_within = first_seconds >= 0 and last_seconds <= total_seconds
+        if not is_within and self.is_one_year():
+            return None
+        if (first_seconds < 0 and not self._extrapolate_first_point) or (last_seconds > total_seconds and not self._extrapolate_last_point):
+            return None  # let write_into_fixed_frequency raise the error
+
+        boundaries = (first_seconds + target_seconds * np.arange(num_periods + 1, dtype=np.int64)) / source_seconds
+        integrals = np.interp(boundaries, np.arange(self._num_periods + 1), cumulative_integral)
+        if not is_within:
+            first_value = cumulative_integral[1] - cumulative_integral[0]
+            last_value = cumulative_integral[-1] - cumulative_integral[-2]
+            integrals = np.where(boundaries < 0, boundaries * first_value, integrals)
+            integrals = np.where(boundaries > self._num_periods, cumulative_integral[-1] + (boundaries - self._num_periods) * last_value, integrals)
+
+        return np.diff(integrals) * (source_seconds / target_seconds)
+
+    def _get_offset_seconds(self, time: datetime) -> int:
+        """Get signed number of seconds from start time to time, excluding weeks 53 if 52-week years."""
+        if time >= self._start_time:
+            return int(v_ops.period_duration(self._start_time, time, self._is_52_week_years).total_seconds())
+        return -int(v_ops.period_duration(time, self._start_time, self._is_52_week_years).total_seconds())
+
     def write_into_fixed_frequency(
         self,
         target_vector: NDArray,
@@ -246,26 +331,91 @@ class FixedFrequencyTimeIndex(TimeIndex):
 
         Notes
         -----
-        - If the object is constant (as determined by `self.is_constant()`), the input_vector is expected to have a single value,
-          which will be used to fill the entire target_vector.
+        - Many vectors sharing this TimeIndex can be written in one call, as 2D arrays of shape (num_series, num_periods).
+          All transformations are then done along the last axis.
+        - If the object is constant (as determined by `self.is_constant()`), the input_vector is expected to have a single value
+          (per series), which will be used to fill the entire target_vector.
+        - Otherwise, when vectors are written between the same pair of time indexes more than once, a cached ResamplingPlan
+          is used (see get_resampling_plan).
         - Otherwise, the method delegates the operation to `_write_into_fixed_frequency_recursive` for handling more complex cases.
 
         """
+        if input_vector.ndim != target_vector.ndim or input_vector.shape[:-1] != target_vector.shape[:-1]:
+            msg = f"Shapes of input_vector {input_vector.shape} and target_vector {target_vector.shape} must only differ in the last axis."
+            raise ValueError(msg)
         if self.is_constant():
-            assert input_vector.size == 1
-            target_vector.fill(input_vector[0])
+            assert input_vector.shape[-1] == 1
+            target_vector[...] = input_vector
+            return
+        plan = get_resampling_plan(self, target_timeindex)
+        if plan is not None:
+            plan.apply(input_vector, target_vector)
         else:
             self._write_into_fixed_frequency_recursive(target_vector, target_timeindex, input_vector)
 
-    def _write_into_fixed_frequency_recursive(  # noqa: C901
+    def create_resampling_plan(self, target_timeindex: FixedFrequencyTimeIndex) -> ResamplingPlan | None:
+        """
+        Create a ResamplingPlan that writes vectors of this TimeIndex into target_timeindex like write_into_fixed_frequency.
+
+        The plan is found by applying the transformations of write_into_fixed_frequency to the indices of the vector
+        instead of its values, and is checked against write_into_fixed_frequency with a random vector.
+
+        Returns:
+            ResamplingPlan, or None if the transformations do not select and average values of the vector in a fixed
+            pattern (e.g. when conversion to or from 52-week years must split periods), or if the plan would have many
+            more indices than there are input and output values (e.g. when start times are only aligned at a much finer
+            resolution than the period durations).
+
+        """
+        self._check_type(target_timeindex, FixedFrequencyTimeIndex)
+        if self.is_constant():
+            return None
+
+        max_num_indices = _MAX_PLAN_SIZE_FACTOR * (self._num_periods + target_timeindex.get_num_periods())
+        if self._get_num_periods_at_finest_resolution(target_timeindex) > max_num_indices:
+            return None  # checked before the transformations, as they would be just as large
+
+        source_timeindex, indices = self._transform_to_same_period(target_timeindex, np.arange(self._num_periods, dtype=np.int64))
+        if not np.issubdtype(indices.dtype, np.integer):
+            indices = np.rint(indices).astype(np.int64)  # some transformations always return float32
+
+        num_periods = target_timeindex.get_num_periods()
+        group_size = 1
+        if target_timeindex.get_period_duration() < source_timeindex.get_period_duration():
+            indices = np.repeat(indices, num_periods // indices.size)
+        elif target_timeindex.get_period_duration() > source_timeindex.get_period_duration():
+            group_size = indices.size // num_periods
+        if indices.size != num_periods * group_size or indices.size > max_num_indices:
+            return None
+        plan = ResamplingPlan(indices, group_size)
+
+        probe = np.random.default_rng(seed=0).random(self._num_periods, dtype=np.float32)
+        expected = np.zeros(num_periods, dtype=np.float32)
+        self._write_into_fixed_frequency_recursive(expected, target_timeindex, probe)
+        actual = np.zeros(num_periods, dtype=np.float32)
+        plan.apply(probe, actual)
+        if not np.array_equal(actual, expected):
+            return None
+        return plan
+
+    def _get_num_periods_at_finest_resolution(self, target_timeindex: FixedFrequencyTimeIndex) -> int:
+        """Get number of periods of this TimeIndex at the resolution that divides both period durations and the start time offset."""
+        source_seconds = int(self._period_duration.total_seconds())
+        finest_seconds = math.gcd(
+            source_seconds,
+            int(target_timeindex.get_period_duration().total_seconds()),
+            int((self._start_time - target_timeindex.get_start_time()).total_seconds()),
+        )
+        return self._num_periods * (source_seconds // finest_seconds)
+
+    def _write_into_fixed_frequency_recursive(
         self,
         target_vector: NDArray,
         target_timeindex: FixedFrequencyTimeIndex,
         input_vector: NDArray,
-        _depth: int = 0,  # only for recursion depth tracking
     ) -> None:
         """
-        Recursively write the input_vector into the target_vector according to the target_timeindex, applying necessary transformations.
+        Write the input_vector into the target_vector according to the target_timeindex, applying necessary transformations.
 
         Parameters
         ----------
@@ -277,16 +427,41 @@ class FixedFrequencyTimeIndex(TimeIndex):
             The array containing the data to be written into the target_vector.
 
         """
-        if _depth > 100:  # noqa: PLR2004
-            raise RecursionError("Maximum recursion depth (100) exceeded in _write_into_fixed_frequency_recursive.")
+        source_timeindex, source_vector = self._transform_to_same_period(target_timeindex, input_vector)
+
+        if source_timeindex.is_same_resolution(target_timeindex):
+            np.copyto(target_vector, source_vector)
+        elif target_timeindex.get_period_duration() < source_timeindex.get_period_duration():
+            v_ops.disaggregate(
+                input_vector=source_vector,
+                output_vector=target_vector,
+                is_disaggfunc_repeat=True,
+            )
+        else:
+            v_ops.aggregate(
+                input_vector=source_vector,
+                output_vector=target_vector,
+                is_aggfunc_sum=False,
+            )
 
-        if self == target_timeindex:
-            np.copyto(target_vector, input_vector)
-            return
+    def _transform_to_same_period(
+        self,
+        target_timeindex: FixedFrequencyTimeIndex,
+        input_vector: NDArray,
+        _depth: int = 0,  # only for recursion depth tracking
+    ) -> tuple[FixedFrequencyTimeIndex, NDArray]:
+        """
+        Recursively transform input_vector until its TimeIndex has the same period as target_timeindex, and a compatible resolution.
+
+        Returns:
+            tuple[FixedFrequencyTimeIndex, NDArray]: The transformed TimeIndex and vector. Only the period duration
+            (and extrapolation flags) of the transformed TimeIndex may differ from target_timeindex.
 
-        transformed_timeindex = None
+        """
+        if _depth > 100:  # noqa: PLR2004
+            raise RecursionError("Maximum recursion depth (100) exceeded in _transform_to_same_period.")
 
-        # Check differences between self and target_timeindex and apply transformations recursively
+        # Check differences between self and target_timeindex and apply transformations recursively.
         if not target_timeindex._is_compatible_resolution(self):
             transformed_timeindex, transformed_vector = self._transform_to_compatible_resolution(input_vector, target_timeindex)
 
@@ -302,28 +477,10 @@ class FixedFrequencyTimeIndex(TimeIndex):
             else:
                 transformed_timeindex, transformed_vector = self._adjust_period(input_vector, target_timeindex)
 
-        elif not self.is_same_resolution(target_timeindex):
-            if target_timeindex.get_period_duration() < self._period_duration:
-                v_ops.disaggregate(
-                    input_vector=input_vector,
-                    output_vector=target_vector,
-                    is_disaggfunc_repeat=True,
-                )
-            else:
-                v_ops.aggregate(
-                    input_vector=input_vector,
-                    output_vector=target_vector,
-                    is_aggfunc_sum=False,
-                )
-
-        # Recursively write the transformed vector into the target vector
-        if transformed_timeindex is not None:
-            transformed_timeindex._write_into_fixed_frequency_recursive(  # noqa: SLF001
-                target_vector=target_vector,
-                target_timeindex=target_timeindex,
-                input_vector=transformed_vector,
-                _depth=_depth + 1,
-            )
+        else:
+            return self, input_vector
+
+        return transformed_timeindex._transform_to_same_period(target_timeindex, transformed_vector, _depth + 1)  # noqa: SLF001
 
     def _convert_to_iso_time(self, input_vector: NDArray) -> tuple[FixedFrequencyTimeIndex, NDArray]:
         """
@@ -344,7 +501,7 @@ class FixedFrequencyTimeIndex(TimeIndex):
 
         transformed_timeindex = self.copy_with(
             start_time=self._start_time,
-            num_periods=transformed_vector.size,
+            num_periods=transformed_vector.shape[-1],
             is_52_week_years=False,
         )
 
@@ -378,7 +535,7 @@ class FixedFrequencyTimeIndex(TimeIndex):
         )
         transformed_timeindex = self.copy_with(
             start_time=adjusted_start_time,
-            num_periods=transformed_vector.size,
+            num_periods=transformed_vector.shape[-1],
             is_52_week_years=True,
         )
 
@@ -417,21 +574,56 @@ class FixedFrequencyTimeIndex(TimeIndex):
         tuple[FixedFrequencyTimeIndex, NDArray]
             A tuple containing the transformed FixedFrequencyTimeIndex and the transformed input vector.
 
+        Notes
+        -----
+        If the start times are not aligned at the common resolution of the period durations, the input vector is
+        resampled by overlap onto periods aligned with the target time index (see `_resample_to_aligned_resolution`),
+        instead of being disaggregated to the (possibly very fine) resolution that also divides the start time offset.
+        Between 52-week years and ISO time the calendar is converted first, on periods aligned with this index and
+        with its weeks (see `_convert_calendar_at_aligned_resolution`), and the converted vector is resampled next.
+
         """
-        new_period_duration = timedelta(
-            seconds=math.gcd(
-                int(self._period_duration.total_seconds()),
-                int(target_timeindex.get_period_duration().total_seconds()),
-                int((self._start_time - target_timeindex.get_start_time()).total_seconds()),
-            ),
+        common_seconds = math.gcd(
+            int(self._period_duration.total_seconds()),
+            int(target_timeindex.get_period_duration().total_seconds()),
         )
+        offset_seconds = int((self._start_time - target_timeindex.get_start_time()).total_seconds())
+        if offset_seconds % common_seconds != 0 and not self.is_one_year():
+            if target_timeindex.is_52_week_years() != self.is_52_week_years():
+                return self._convert_calendar_at_aligned_resolution(input_vector, common_seconds)
+            resampled = self._resample_to_aligned_resolution(input_vector, common_seconds, offset_seconds)
+            if resampled is not None:
+                return resampled
+
+        return self._disaggregate(input_vector, timedelta(seconds=math.gcd(common_seconds, offset_seconds)))
+
+    def _convert_calendar_at_aligned_resolution(self, input_vector: NDArray, period_seconds: int) -> tuple[FixedFrequencyTimeIndex, NDArray]:
+        """
+        Convert input_vector between 52-week years and ISO time on periods that are aligned with this start time and with whole weeks.
+
+        The periods are the coarsest that divide period_seconds, a week and the time from the start of the week of
+        this start time, so that week 53 is added or removed as whole periods.
+        """
+        start_time = self._start_time
+        seconds_into_week = start_time.weekday() * 24 * 3600 + start_time.hour * 3600 + start_time.minute * 60 + start_time.second
+        period_duration = timedelta(seconds=math.gcd(period_seconds, v_ops.SECONDS_PER_WEEK, seconds_into_week))
+
+        transformed_timeindex, transformed_vector = self._disaggregate(input_vector, period_duration)
+        if self._is_52_week_years:
+            return transformed_timeindex._convert_to_iso_time(transformed_vector)  # noqa: SLF001
+        return transformed_timeindex._convert_to_52_week_years(transformed_vector)  # noqa: SLF001
+
+    def _disaggregate(self, input_vector: NDArray, period_duration: timedelta) -> tuple[FixedFrequencyTimeIndex, NDArray]:
+        """Repeat each value of input_vector for the periods of period_duration (which must divide the period duration of this TimeIndex)."""
+        if period_duration == self._period_duration:
+            return self, input_vector
 
         transformed_timeindex = self.copy_with(
-            period_duration=new_period_duration,
-            num_periods=int(self._period_duration.total_seconds() // new_period_duration.total_seconds()) * self._num_periods,
+            period_duration=period_duration,
+            num_periods=int(self._period_duration.total_seconds() // period_duration.total_seconds()) * self._num_periods,
         )
 
-        transformed_vector = np.zeros(transformed_timeindex.get_num_periods(), dtype=input_vector.dtype)
+        transformed_vector = np.zeros((*input_vector.shape[:-1], transformed_timeindex.get_num_periods()), dtype=input_vector.dtype)
         v_ops.disaggregate(
             input_vector=input_vector,
             output_vector=transformed_vector,
@@ -440,6 +632,57 @@ class FixedFrequencyTimeIndex(TimeIndex):
 
         return transformed_timeindex, transformed_vector
 
+    def _resample_to_aligned_resolution(
+        self,
+        input_vector: NDArray,
+        period_seconds: int,
+        offset_seconds: int,
+    ) -> tuple[FixedFrequencyTimeIndex, NDArray] | None:
+        """
+        Resample input_vector onto periods of period_seconds that are aligned with a target start time offset_seconds before this start time.
+
+        Each new period gets the overlap-weighted average of the periods of this TimeIndex. New periods that are partly
+        outside this TimeIndex are only included if extrapolation is allowed at that end, and are then filled with the
+        first or last value, so that extrapolation errors are raised as before in later transformations.
+
+        Returns:
+            tuple[FixedFrequencyTimeIndex, NDArray], or None if this TimeIndex is one year (which must stay whole to be
+            repeated), if there would be no new periods, or if they would start in week 53 of 52-week years.
+
+        """
+        if self.is_one_year():
+            return None
+
+        source_seconds = int(self._period_duration.total_seconds())
+        total_seconds = self._num_periods * source_seconds
+
+        first_seconds = (-offset_seconds) % period_seconds  # first aligned time at or after start
+        if self._extrapolate_first_point:
+            first_seconds -= period_seconds
+        if self._extrapolate_last_point:
+            num_periods = -((first_seconds - total_seconds) // period_seconds)  # ceil
+        else:
+            num_periods = (total_seconds - first_seconds) // period_seconds
+        start_time = self._start_time + timedelta(seconds=first_seconds)
+        if num_periods < 1 or (self._is_52_week_years and start_time.isocalendar().week == 53):  # noqa: PLR2004
+            return None
+
+        transformed_timeindex = self.copy_with(
+            start_time=start_time,
+            period_duration=timedelta(seconds=period_seconds),
+            num_periods=num_periods,
+        )
+
+        transformed_vector = np.zeros((*input_vector.shape[:-1], num_periods), dtype=input_vector.dtype)
+        v_ops.resample_by_overlap(
+            input_vector=input_vector,
+            source_boundaries=np.arange(self._num_periods + 1, dtype=np.int64) * source_seconds,
+            target_boundaries=first_seconds + np.arange(num_periods + 1, dtype=np.int64) * period_seconds,
+            output_vector=transformed_vector,
+        )
+
+        return transformed_timeindex, transformed_vector
+
     def _is_same_period(self, other: FixedFrequencyTimeIndex) -> bool:
         """Check if the start and stop times are the same."""
         return self._start_time == other.get_start_time() and self.get_stop_time() == other.get_stop_time()
@@ -489,7 +732,7 @@ class FixedFrequencyTimeIndex(TimeIndex):
             start_time=target_index.get_start_time(),
             num_periods=self._num_periods - num_periods_to_slice,
         )
-        transformed_vector = input_vector[num_periods_to_slice:]
+        transformed_vector = input_vector[..., num_periods_to_slice:]
 
         return transformed_timeindex, transformed_vector
 
@@ -507,7 +750,7 @@ class FixedFrequencyTimeIndex(TimeIndex):
             self._is_52_week_years,
         )
         transformed_timeindex = self.copy_with(num_periods=self._num_periods - num_periods_to_slice)
-        transformed_vector = input_vector[:-num_periods_to_slice]
+        transformed_vector = input_vector[..., :-num_periods_to_slice]
 
         return transformed_timeindex, transformed_vector
 
@@ -534,7 +777,7 @@ class FixedFrequencyTimeIndex(TimeIndex):
             self._period_duration,
             self._is_52_week_years,
         )
-        extended_vector = np.concatenate((np.full(num_periods_to_extend, input_vector[0]), input_vector))
+        extended_vector = np.concatenate((np.repeat(input_vector[..., :1], num_periods_to_extend, axis=-1), input_vector), axis=-1)
 
         transformed_timeindex = self.copy_with(
             start_time=target_timeindex.get_start_time(),
@@ -557,7 +800,7 @@ class FixedFrequencyTimeIndex(TimeIndex):
             self._period_duration,
             self._is_52_week_years,
         )
-        extended_vector = np.concatenate((input_vector, np.full(num_periods_to_extend, input_vector[-1])))
+        extended_vector = np.concatenate((input_vector, np.repeat(input_vector[..., -1:], num_periods_to_extend, axis=-1)), axis=-1)
         target_timeindex = self.copy_with(num_periods=self._num_periods + num_periods_to_extend)
 
         return target_timeindex, extended_vector
@@ -593,7 +836,7 @@ class FixedFrequencyTimeIndex(TimeIndex):
             )
         transformed_timeindex = self.copy_with(
             start_time=target_timeindex.get_start_time(),
-            num_periods=transformed_vector.size,
+            num_periods=transformed_vector.shape[-1],
         )
 
         return transformed_timeindex, transformed_vector
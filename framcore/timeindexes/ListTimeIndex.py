@@ -5,9 +5,12 @@ from datetime import datetime, timedelta, tzinfo
 import numpy as np
 from numpy.typing import NDArray
 
+import framcore.timeindexes._time_vector_operations as v_ops
 from framcore.fingerprints import Fingerprint
 from framcore.timeindexes import FixedFrequencyTimeIndex, TimeIndex
-from framcore.timeindexes._time_vector_operations import period_duration
+from framcore.timeindexes._time_vector_operations import _find_all_week_53_periods, period_duration
+
+_SECONDS_PER_DAY = 24 * 3600
 
 
 class ListTimeIndex(TimeIndex):
@@ -18,7 +21,8 @@ class ListTimeIndex(TimeIndex):
     necessarily the end of the time vector, and the first timestamp is not necessarily the start of the time vector
     if extrapolation is enabled.
 
-    ListTimeIndex is not recommended for large time vectors, as it is less efficient.
+    Vectors are resampled by overlap from the datetimes as datetime64 (computed once per ListTimeIndex), so large
+    time vectors are supported, but FixedFrequencyTimeIndex is more efficient where the periods are regular.
     """
 
     def __init__(
@@ -60,6 +64,10 @@ class ListTimeIndex(TimeIndex):
         self._extrapolate_first_point = extrapolate_first_point
         self._extrapolate_last_point = extrapolate_last_point
 
+        # Computed on first use, see _get_datetime64 and _get_boundary_seconds
+        self._datetime64: NDArray | None = None
+        self._boundary_seconds: NDArray | None = None
+
     def __eq__(self, other) -> bool:  # noqa: ANN001
         """Check if two ListTimeIndexes are equal."""
         if not isinstance(other, type(self)):
@@ -212,30 +220,58 @@ class ListTimeIndex(TimeIndex):
         target_timeindex: FixedFrequencyTimeIndex,
         input_vector: NDArray,
     ) -> None:
-        """Write the input vector into the target vector using the target FixedFrequencyTimeIndex."""
+        """
+        Write the input vector into the target vector using the target FixedFrequencyTimeIndex.
+
+        Each target period gets the overlap-weighted average of the periods of this TimeIndex. If the target is in
+        the same calendar (52-week years or ISO time) and needs no repetition of one year, this is done directly.
+        Otherwise the input vector is first resampled onto a FixedFrequencyTimeIndex, with the coarsest resolution
+        that has the target period duration, all days and the first and last period of this TimeIndex (and all target
+        period boundaries when one year is repeated), which then writes into the target vector.
+
+        Many vectors sharing this TimeIndex can be written in one call, as 2D arrays of shape (num_series, num_periods).
+        """
         self._check_type(target_vector, np.ndarray)
         self._check_type(target_timeindex, FixedFrequencyTimeIndex)
         self._check_type(input_vector, np.ndarray)
 
-        dts: list[datetime] = self._datetime_list
-
-        durations = set(self._microseconds(period_duration(dts[i], dts[i + 1], self._is_52_week_years)) for i in range(len(dts) - 1))
-        smallest_common_period_duration = functools.reduce(math.gcd, durations)
-
-        num_periods_ff = self._microseconds(self.total_duration()) // smallest_common_period_duration
-        input_vector_ff = np.zeros(num_periods_ff, dtype=target_vector.dtype)
-
-        i_start_ff = 0
-        for i in range(len(dts) - 1):
-            num_periods = self._microseconds(period_duration(dts[i], dts[i + 1], self._is_52_week_years)) // smallest_common_period_duration
-            i_stop_ff = i_start_ff + num_periods
-            input_vector_ff[i_start_ff:i_stop_ff] = input_vector[i]
-            i_start_ff = i_stop_ff
+        start_time = self._datetime_list[0]
+        source_boundaries = self._get_boundary_seconds()
+        total_seconds = int(source_boundaries[-1])
+        target_seconds = int(target_timeindex.get_period_duration().total_seconds())
+        offset_seconds = self._get_offset_seconds(target_timeindex.get_start_time())
+
+        if self._can_resample_directly(target_timeindex, offset_seconds, target_seconds):
+            v_ops.resample_by_overlap(
+                input_vector=input_vector,
+                source_boundaries=source_boundaries,
+                target_boundaries=offset_seconds + np.arange(target_timeindex.get_num_periods() + 1, dtype=np.int64) * target_seconds,
+                output_vector=target_vector,
+            )
+            return
+
+        # First and last period are kept whole, so that extrapolation gives their values. The target start time is only
+        # needed on the grid when one year is repeated, as FixedFrequencyTimeIndex otherwise resamples by overlap.
+        seconds_of_day = int((start_time - start_time.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds())
+        edge_seconds = [int(source_boundaries[1]), int(source_boundaries[-2]), total_seconds]
+        grid_seconds = [target_seconds, _SECONDS_PER_DAY, seconds_of_day, *edge_seconds]
+        if self.is_one_year():
+            grid_seconds.append(offset_seconds)
+        common_seconds = functools.reduce(math.gcd, grid_seconds)
+        num_periods_ff = total_seconds // common_seconds
+
+        input_vector_ff = np.zeros((*input_vector.shape[:-1], num_periods_ff), dtype=target_vector.dtype)
+        v_ops.resample_by_overlap(
+            input_vector=input_vector,
+            source_boundaries=source_boundaries,
+            target_boundaries=np.arange(num_periods_ff + 1, dtype=np.int64) * common_seconds,
+            output_vector=input_vector_ff,
+        )
 
         input_timeindex_ff = FixedFrequencyTimeIndex(
-            start_time=dts[0],
+            start_time=start_time,
             num_periods=num_periods_ff,
-            period_duration=timedelta(microseconds=smallest_common_period_duration),
+            period_duration=timedelta(seconds=common_seconds),
             is_52_week_years=self.is_52_week_years(),
             extrapolate_first_point=self.extrapolate_first_point(),
             extrapolate_last_point=self.extrapolate_last_point(),
@@ -247,6 +283,51 @@ class ListTimeIndex(TimeIndex):
             input_vector=input_vector_ff,
         )
 
+    def _can_resample_directly(self, target_timeindex: FixedFrequencyTimeIndex, offset_seconds: int, target_seconds: int) -> bool:
+        """Return True if target periods can be resampled directly from the periods of this TimeIndex."""
+        if target_timeindex.is_52_week_years() != self._is_52_week_years:
+            return False
+        stop_seconds = offset_seconds + target_timeindex.get_num_periods() * target_seconds
+        is_before = offset_seconds < 0
+        is_after = stop_seconds > self._get_boundary_seconds()[-1]
+        if (is_before or is_after) and self.is_one_year():
+            return False  # one year is repeated
+        # Let FixedFrequencyTimeIndex raise errors for extrapolation that is not allowed
+        return not ((is_before and not self._extrapolate_first_point) or (is_after and not self._extrapolate_last_point))
+
+    def _get_datetime64(self) -> NDArray:
+        """Get the datetimes of the TimeIndex as a read-only datetime64 array (in local time if timezone aware)."""
+        if self._datetime64 is None:
+            # Offsets as integers are much faster to convert than datetimes
+            start_time = self._datetime_list[0]
+            one_microsecond = timedelta(microseconds=1)
+            offsets = np.fromiter(((dt - start_time) // one_microsecond for dt in self._datetime_list), dtype=np.int64, count=len(self._datetime_list))
+            self._datetime64 = np.datetime64(start_time.replace(tzinfo=None), "us") + offsets.astype("timedelta64[us]")
+            self._datetime64.flags.writeable = False
+        return self._datetime64
+
+    def _get_boundary_seconds(self) -> NDArray:
+        """Get the datetimes of the TimeIndex as seconds since the first, skipping all weeks 53 if 52-week time format."""
+        if self._boundary_seconds is None:
+            dts = self._get_datetime64()
+            boundaries = (dts - dts[0]) // np.timedelta64(1, "s")
+            if self._is_52_week_years:
+                start_time = self._datetime_list[0].replace(tzinfo=None)
+                stop_time = self._datetime_list[-1].replace(tzinfo=None)
+                for week_53_start, week_53_end in _find_all_week_53_periods(start_time, stop_time):
+                    start, end = np.datetime64(week_53_start, "us"), np.datetime64(week_53_end, "us")
+                    boundaries -= (np.clip(dts, start, end) - start) // np.timedelta64(1, "s")
+            boundaries.flags.writeable = False
+            self._boundary_seconds = boundaries
+        return self._boundary_seconds
+
+    def _get_offset_seconds(self, time: datetime) -> int:
+        """Get signed number of seconds from the first datetime to time, skipping all weeks 53 if 52-week time format."""
+        start_time = self._datetime_list[0]
+        if time >= start_time:
+            return int(period_duration(start_time, time, self._is_52_week_years).total_seconds())
+        return -int(period_duration(time, start_time, self._is_52_week_years).total_seconds())
+
     def total_duration(self) -> timedelta:
         """
         Return the total duration covered by the time index.
@@ -261,9 +342,6 @@ class ListTimeIndex(TimeIndex):
         end_time = self._datetime_list[-1]
         return period_duration(start_time, end_time, self.is_52_week_years())
 
-    def _microseconds(self, duration: timedelta) -> int:
-        return int(duration.total_seconds() * 1e6)
-
     def is_constant(self) -> bool:
         """
         Return True if the time index is constant (single period and both extrapolation flags are True).
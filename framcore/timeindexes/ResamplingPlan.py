@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+import framcore.timeindexes._time_vector_operations as v_ops
+from framcore import Base
+
+if TYPE_CHECKING:
+    from framcore.timeindexes import FixedFrequencyTimeIndex
+
+# Max number of cached plans (and of index pairs waiting for a second use), and max total bytes of their indices.
+# The oldest is removed first. Larger plans are not cached.
+_MAX_NUM_PLANS = 256
+_MAX_NUM_PLAN_BYTES = 256 * 1024**2
+
+_PLANS: dict[tuple[FixedFrequencyTimeIndex, FixedFrequencyTimeIndex], ResamplingPlan | None] = dict()
+_USED_ONCE: dict[tuple[FixedFrequencyTimeIndex, FixedFrequencyTimeIndex], None] = dict()
+
+
+class ResamplingPlan(Base):
+    """
+    Precomputed resampling of vectors from one FixedFrequencyTimeIndex to another.
+
+    Value i of the output is the average of the input values at indices[i * group_size : (i + 1) * group_size].
+    This covers the transformations of FixedFrequencyTimeIndex.write_into_fixed_frequency that only select,
+    repeat and average values (change of resolution, 52-week conversion, repeat of one year, slice and extend),
+    so applying a plan is a single gather, or a view when the indices are contiguous, followed by a mean.
+
+    Create with FixedFrequencyTimeIndex.create_resampling_plan, or get a cached plan with get_resampling_plan.
+    """
+
+    def __init__(self, indices: NDArray, group_size: int) -> None:
+        """
+        Initialize ResamplingPlan.
+
+        Args:
+            indices (NDArray): Indices into the input vector, with group_size indices per output value.
+            group_size (int): Number of input values averaged into each output value.
+
+        """
+        self._check_type(indices, np.ndarray)
+        self._check_type(group_size, int)
+        self._check_int(value=group_size, lower_bound=1, upper_bound=None)
+        if indices.ndim != 1 or indices.size % group_size != 0:
+            message = f"Expected 1D indices with a multiple of group_size ({group_size}) values, got shape {indices.shape}."
+            raise ValueError(message)
+
+        self._group_size = group_size
+        self._num_periods = indices.size // group_size
+        self._slice: slice | None = None
+        self._indices: NDArray | None = None
+        if indices.size > 0 and np.array_equal(indices, np.arange(indices[0], indices[0] + indices.size)):
+            self._slice = slice(int(indices[0]), int(indices[0]) + indices.size)
+        else:
+            self._indices = indices.astype(np.int64)
+            self._indices.flags.writeable = False
+
+    def get_indices(self) -> NDArray:
+        """Get indices into the input vector, with group_size indices per output value."""
+        if self._slice is not None:
+            return np.arange(self._slice.start, self._slice.stop)
+        return self._indices
+
+    def get_group_size(self) -> int:
+        """Get number of input values averaged into each output value."""
+        return self._group_size
+
+    def get_num_periods(self) -> int:
+        """Get number of output values."""
+        return self._num_periods
+
+    def get_nbytes(self) -> int:
+        """Get number of bytes used by the indices of the plan (0 when they are contiguous)."""
+        return 0 if self._indices is None else self._indices.nbytes
+
+    def apply(self, input_vector: NDArray, target_vector: NDArray) -> None:
+        """Write the resampled input_vector into target_vector. 2D vectors (one series per row) are resampled along the last axis."""
+        if target_vector.shape[-1:] != (self._num_periods,):
+            message = f"Expected target_vector with {self._num_periods} periods along the last axis, got shape {target_vector.shape}."
+            raise ValueError(message)
+
+        if self._slice is not None:
+            selected = input_vector[..., self._slice]
+        elif self._group_size == 1 and input_vector.dtype == target_vector.dtype:
+            np.take(input_vector, self._indices, axis=-1, out=target_vector, mode="clip")
+            return
+        else:
+            selected = input_vector[..., self._indices]
+
+        if self._group_size == 1:
+            np.copyto(target_vector, selected)
+        else:
+            v_ops.mean_of_groups(selected, self._group_size, target_vector)
+
+
+def get_resampling_plan(source_timeindex: FixedFrequencyTimeIndex, target_timeindex: FixedFrequencyTimeIndex) -> ResamplingPlan | None:
+    """
+    Get cached ResamplingPlan from source_timeindex to target_timeindex.
+
+    The plan is created the second time a pair of time indexes is used, so that pairs used only once
+    (e.g. for a single period average) do not pay for creating a plan.
+
+    Returns:
+        ResamplingPlan, or None if there is no plan (yet) for this pair, or it is too large to cache.
+        Use write_into_fixed_frequency then.
+
+    """
+    key = (source_timeindex, target_timeindex)
+    if key in _PLANS:
+        return _PLANS[key]
+    if key not in _USED_ONCE:
+        _add_bounded(_USED_ONCE, key, None)
+        return None
+    del _USED_ONCE[key]
+    plan = source_timeindex.create_resampling_plan(target_timeindex)
+    if plan is not None and plan.get_nbytes() > _MAX_NUM_PLAN_BYTES:
+        plan = None
+    _add_bounded(_PLANS, key, plan)
+    return plan
+
+
+def clear_resampling_plans() -> None:
+    """Remove all cached resampling plans."""
+    _PLANS.clear()
+    _USED_ONCE.clear()
+
+
+def _add_bounded(cache: dict, key: object, value: ResamplingPlan | None) -> None:
+    nbytes = _get_nbytes(value)
+    total_nbytes = sum(_get_nbytes(v) for v in cache.values())
+    while cache and (len(cache) >= _MAX_NUM_PLANS or total_nbytes + nbytes > _MAX_NUM_PLAN_BYTES):
+        total_nbytes -= _get_nbytes(cache.pop(next(iter(cache))))
+    cache[key] = value
+
+
+def _get_nbytes(plan: ResamplingPlan | None) -> int:
+    return 0 if plan is None else plan.get_nbytes()
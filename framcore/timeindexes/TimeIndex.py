@@ -94,6 +94,9 @@ class TimeIndex(Base, ABC):
         - And when we implement a new TimeIndex, we only need to implement the conversion to FixedFrequencyTimeIndex
             and the rest of the conversion functionality can be reused.
 
+        Vectors are 1D arrays with one value per period. Many vectors sharing the same TimeIndex can be written in one
+        call as 2D arrays of shape (num_series, num_periods), where all operations are done along the last axis.
+
         """
         pass
 
@@ -2,6 +2,7 @@
 
 """FRAM time indexes package provides functionality for handling time-related data."""
 
+from framcore.timeindexes.ResamplingPlan import ResamplingPlan, clear_resampling_plans, get_resampling_plan
 from framcore.timeindexes.FixedFrequencyTimeIndex import FixedFrequencyTimeIndex
 from framcore.timeindexes.TimeIndex import TimeIndex
 from framcore.timeindexes.SinglePeriodTimeIndex import SinglePeriodTimeIndex
@@ -30,7 +31,10 @@ __all__ = [
     "ModelYears",
     "OneYearProfileTimeIndex",
     "ProfileTimeIndex",
+    "ResamplingPlan",
     "SinglePeriodTimeIndex",
     "TimeIndex",
     "WeeklyIndex",
+    "clear_resampling_plans",
+    "get_resampling_plan",
 ]
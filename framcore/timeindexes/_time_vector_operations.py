@@ -12,36 +12,81 @@ MODEL_WEEKS_PER_YEAR = 52
 
 
 def aggregate(input_vector: NDArray, output_vector: NDArray, is_aggfunc_sum: bool) -> None:
-    """Aggregate input vector to output vector."""
-    assert len(input_vector.shape) == 1
-    assert len(output_vector.shape) == 1
-    assert input_vector.size > output_vector.size
-    assert input_vector.size % output_vector.size == 0
+    """Aggregate input vector to output vector. 2D vectors (one series per row) are aggregated along the last axis."""
+    assert input_vector.ndim in (1, 2)
+    assert output_vector.ndim == input_vector.ndim
+    assert input_vector.shape[:-1] == output_vector.shape[:-1]
+    assert input_vector.shape[-1] > output_vector.shape[-1]
+    assert input_vector.shape[-1] % output_vector.shape[-1] == 0
     assert input_vector.dtype == output_vector.dtype
 
-    multiplier = input_vector.size // output_vector.size
-    num_macro_periods = output_vector.size
-    input_vector.reshape((num_macro_periods, multiplier)).mean(axis=1, out=output_vector)
+    multiplier = input_vector.shape[-1] // output_vector.shape[-1]
+    mean_of_groups(input_vector, multiplier, output_vector)
 
     if is_aggfunc_sum:
         np.multiply(output_vector, multiplier, out=output_vector)
 
 
+# Group sizes up to this are averaged by adding strided views, which gives the same result as mean but is much faster
+_MAX_GROUP_SIZE_FOR_STRIDED_SUM = 7
+
+
+def mean_of_groups(input_vector: NDArray, group_size: int, output_vector: NDArray) -> None:
+    """Write the mean of each group of group_size consecutive values along the last axis of input vector into output vector."""
+    groups = input_vector.reshape((*input_vector.shape[:-1], output_vector.shape[-1], group_size))
+    if group_size > _MAX_GROUP_SIZE_FOR_STRIDED_SUM:
+        groups.mean(axis=-1, out=output_vector)
+        return
+    np.copyto(output_vector, groups[..., 0])
+    for i in range(1, group_size):
+        np.add(output_vector, groups[..., i], out=output_vector)
+    np.divide(output_vector, group_size, out=output_vector)
+
+
 def disaggregate(input_vector: NDArray, output_vector: NDArray, is_disaggfunc_repeat: bool) -> None:
-    """Disaggregate input vector to output vector."""
-    assert len(input_vector.shape) == 1
-    assert len(output_vector.shape) == 1
-    assert input_vector.size < output_vector.size
-    assert output_vector.size % input_vector.size == 0
+    """Disaggregate input vector to output vector. 2D vectors (one series per row) are disaggregated along the last axis."""
+    assert input_vector.ndim in (1, 2)
+    assert output_vector.ndim == input_vector.ndim
+    assert input_vector.shape[:-1] == output_vector.shape[:-1]
+    assert input_vector.shape[-1] < output_vector.shape[-1]
+    assert output_vector.shape[-1] % input_vector.shape[-1] == 0
     assert input_vector.dtype == output_vector.dtype
 
-    multiplier = output_vector.size // input_vector.size
-    output_vector[:] = np.repeat(input_vector, multiplier)
+    multiplier = output_vector.shape[-1] // input_vector.shape[-1]
+    output_vector[...] = np.repeat(input_vector, multiplier, axis=-1)
 
     if not is_disaggfunc_repeat:
         np.multiply(output_vector, 1 / multiplier, out=output_vector)
 
 
+def resample_by_overlap(input_vector: NDArray, source_boundaries: NDArray, target_boundaries: NDArray, output_vector: NDArray) -> None:
+    """
+    Write the average of input vector over each target period into output vector, weighted by overlap with source periods.
+
+    Period i of input vector is [source_boundaries[i], source_boundaries[i + 1]), and likewise for output vector.
+    Boundaries must be increasing, in the same unit (e.g. seconds). Parts of target periods outside the source periods
+    get the first or last value of input vector. Uses memory proportional to the number of source and target periods.
+    2D vectors (one series per row) are resampled along the last axis.
+    """
+    assert input_vector.ndim in (1, 2)
+    assert output_vector.ndim == input_vector.ndim
+    assert input_vector.shape[:-1] == output_vector.shape[:-1]
+    assert source_boundaries.shape == (input_vector.shape[-1] + 1,)
+    assert target_boundaries.shape == (output_vector.shape[-1] + 1,)
+
+    source_boundaries = source_boundaries.astype(np.float64)
+    target_boundaries = target_boundaries.astype(np.float64)
+
+    cumulative_integral = np.zeros((*input_vector.shape[:-1], input_vector.shape[-1] + 1), dtype=np.float64)
+    np.cumsum(input_vector * np.diff(source_boundaries), axis=-1, out=cumulative_integral[..., 1:])
+
+    # Source period containing each target boundary. The first and last period are extended to cover the rest.
+    periods = np.clip(np.searchsorted(source_boundaries, target_boundaries, side="right") - 1, 0, input_vector.shape[-1] - 1)
+    integrals = cumulative_integral[..., periods] + (target_boundaries - source_boundaries[periods]) * input_vector[..., periods]
+
+    np.divide(np.diff(integrals, axis=-1), np.diff(target_boundaries), out=output_vector, casting="unsafe")
+
+
 def convert_to_modeltime(input_vector: NDArray, startdate: datetime, period_duration: timedelta) -> tuple[datetime, NDArray]:
     """
     Convert isotime input vector to model time (52-weeks) of various data resolutions by removing week 53 data if present.
@@ -53,7 +98,8 @@ def convert_to_modeltime(input_vector: NDArray, startdate: datetime, period_dura
     If start_date of input vector is in week 53, the start_date will be moved to the first week of the next year.
 
     Args:
-        input_vector (NDArray): The input time series vector in isotime format.
+        input_vector (NDArray): The input time series vector in isotime format. 2D vectors (one series per row) are
+            converted along the last axis.
         startdate (datetime): The start date of the input vector.
         period_duration (timedelta): The duration of each period in the input vector.
 
@@ -63,15 +109,23 @@ def convert_to_modeltime(input_vector: NDArray, startdate: datetime, period_dura
 
     """
     assert isinstance(input_vector, np.ndarray)
-    assert input_vector.ndim == 1
+    assert input_vector.ndim in (1, 2)
     assert isinstance(startdate, datetime)
     assert isinstance(period_duration, timedelta)
     assert period_duration.total_seconds() > 0, "Period duration must be greater than zero."
 
-    end_date = startdate + period_duration * input_vector.size
+    output_date, plan = _get_week_53_plan(_MODELTIME, startdate, period_duration, input_vector.shape[-1])
+    if plan is None:
+        return startdate, input_vector.copy()
+    return output_date, _apply_week_53_plan(plan, input_vector)
+
+
+def _create_modeltime_plan(startdate: datetime, period_duration: timedelta, size: int) -> tuple[datetime, tuple | None]:
+    """Find which input periods make up each model time period, by converting indices instead of values."""
+    end_date = startdate + period_duration * size
 
     if not _period_contains_week_53(startdate, end_date):
-        return startdate, input_vector.copy()
+        return startdate, None
 
     whole_duration = end_date - startdate
     week_53_periods = _find_all_week_53_periods(startdate, end_date)
@@ -88,38 +142,23 @@ def convert_to_modeltime(input_vector: NDArray, startdate: datetime, period_dura
         raise ValueError(err_message)
 
     sub_periods = _find_all_sub_periods(startdate, end_date, week_53_periods)
+    output_date = _get_start_of_next_year(startdate) if _is_within_week_53(startdate) else startdate
 
     if _period_duration_compatible_with_all_sub_periods(period_duration, sub_periods):
-        return _to_modeltime(input_vector, startdate, period_duration)
+        keep_mask = _get_not_week_53_mask(size, startdate, period_duration)
+        keep_mask.flags.writeable = False
+        return output_date, (keep_mask, None, None)
 
     new_period_duration = _common_compatible_period_duration(period_duration, *[sub_period[1] - sub_period[0] for sub_period in sub_periods])
     scaling_factor = period_duration // new_period_duration
 
-    tmp_vector = np.zeros(input_vector.size * scaling_factor, dtype=input_vector.dtype)
-
-    disaggregate(
-        input_vector=input_vector,
-        output_vector=tmp_vector,
-        is_disaggfunc_repeat=True,
-    )
-
-    output_date, tmp_vector = _to_modeltime(
-        input_vector=tmp_vector,
-        startdate=startdate,
-        period_duration=new_period_duration,
-    )
+    fine_keep_mask = _get_not_week_53_mask(size * scaling_factor, startdate, new_period_duration)
+    fine_indices = np.repeat(np.arange(size, dtype=_get_index_dtype(size)), scaling_factor)[fine_keep_mask]
 
-    assert tmp_vector.size % scaling_factor == 0, "This should never happen: expected tmp_vector.size to be multiple of scaling_factor before aggregation."
+    assert fine_indices.size % scaling_factor == 0, "This should never happen: expected tmp_vector.size to be multiple of scaling_factor before aggregation."
 
-    out_vector = np.zeros(tmp_vector.size // scaling_factor, dtype=input_vector.dtype)
+    return output_date, _create_weighted_plan(fine_indices, scaling_factor)
 
-    aggregate(
-        input_vector=tmp_vector,
-        output_vector=out_vector,
-        is_aggfunc_sum=False,
-    )
-
-    return output_date, out_vector
 
 def _total_duration(periods: list[tuple[datetime, datetime]]) -> timedelta:
     return sum((end - start for start, end in periods), timedelta(0))
@@ -151,15 +190,9 @@ def _period_duration_compatible_with_all_sub_periods(period_duration: timedelta,
 def _common_compatible_period_duration(*period_durations: timedelta) -> timedelta:
     return timedelta(seconds=math.gcd(*[int(period_duration.total_seconds()) for period_duration in period_durations]))
 
-def _to_modeltime(input_vector: NDArray, startdate: datetime, period_duration: timedelta) -> tuple[datetime, NDArray]:
-    output_vector = _remove_week_53_data(input_vector, startdate, period_duration)
-
-    if not _is_within_week_53(startdate):
-        output_date = startdate
-    else:
-        output_date = _get_start_of_next_year(startdate)
-
-    return output_date, output_vector
+def _get_index_dtype(size: int) -> type[np.signedinteger]:
+    """Get the smallest of int32 and int64 that holds indices into size values, to save memory in week 53 plans."""
+    return np.int32 if size <= np.iinfo(np.int32).max else np.int64
 
 
 def convert_to_isotime(
@@ -173,7 +206,8 @@ def convert_to_isotime(
     Args:
         input_vector (NDArray): The input vector in model time. Input can be in weekly, daily, hourly or minute format.
             For example year, week and hour format: (2025, 3, 1), (2025, 3, 2), ..., (2025, 52, 168), (2026, 1, 1). Time
-            index can start at any date, not necessarily the first day of the year.
+            index can start at any date, not necessarily the first day of the year. 2D vectors (one series per row)
+            are converted along the last axis.
         startdate (date): The start date of the input vector.
         period_duration (int): The duration of each period in minutes.
 
@@ -182,9 +216,17 @@ def convert_to_isotime(
 
     """
     assert isinstance(input_vector, np.ndarray)
-    assert input_vector.ndim == 1
+    assert input_vector.ndim in (1, 2)
 
-    total_duration = period_duration * input_vector.size
+    __, plan = _get_week_53_plan(_ISOTIME, startdate, period_duration, input_vector.shape[-1])
+    if plan is None:
+        return input_vector.copy()
+    return _apply_week_53_plan(plan, input_vector)
+
+
+def _create_isotime_plan(startdate: datetime, period_duration: timedelta, size: int) -> tuple[datetime, tuple | None]:
+    """Find which input periods make up each ISO time period, by converting indices instead of values."""
+    total_duration = period_duration * size
 
     is_whole_years = startdate.isocalendar().week == 1 and startdate.isocalendar().weekday == 1 and  (total_duration % timedelta(weeks=52) == timedelta(0))
 
@@ -195,7 +237,7 @@ def convert_to_isotime(
         end_date = startdate + total_duration
 
     if not (is_whole_years and _has_week_53(startdate.isocalendar().year)) and not _period_contains_week_53(startdate, end_date):
-        return input_vector.copy()
+        return startdate, None
 
     week_53_periods = _find_all_week_53_periods(startdate, end_date)
     extended_total_duration = total_duration + timedelta(weeks=len(week_53_periods))
@@ -214,48 +256,91 @@ def convert_to_isotime(
     sub_periods = _find_all_sub_periods(startdate,  end_date, week_53_periods)
 
     if _period_duration_compatible_with_all_sub_periods(period_duration, sub_periods):
-        return _to_isotime(input_vector, period_duration, sub_periods)
+        indices = _to_isotime(np.arange(size, dtype=_get_index_dtype(size)), period_duration, sub_periods)
+        indices.flags.writeable = False
+        return startdate, (indices, None, None)
 
     new_period_duration = _common_compatible_period_duration(period_duration, *[sub_period[1] - sub_period[0] for sub_period in sub_periods])
-
     scaling_factor = period_duration // new_period_duration
-    tmp_vector = np.zeros(input_vector.size * scaling_factor, dtype=input_vector.dtype)
 
-    disaggregate(
-        input_vector=input_vector,
-        output_vector=tmp_vector,
-        is_disaggfunc_repeat=True,
-    )
+    fine_indices = _to_isotime(np.repeat(np.arange(size, dtype=_get_index_dtype(size)), scaling_factor), new_period_duration, sub_periods)
 
-    assert tmp_vector.size % scaling_factor == 0, "This should never happen: expected tmp_vector.size to be multiple of scaling_factor before aggregation."
+    assert fine_indices.size % scaling_factor == 0, "This should never happen: expected tmp_vector.size to be multiple of scaling_factor before aggregation."
 
-    adjusted_vector = _to_isotime(tmp_vector, new_period_duration, sub_periods)
+    return startdate, _create_weighted_plan(fine_indices, scaling_factor)
 
 
-    out_vector = np.zeros(adjusted_vector.size // scaling_factor, dtype=input_vector.dtype)
-
-    aggregate(
-        input_vector=adjusted_vector,
-        output_vector=out_vector,
-        is_aggfunc_sum=False,
-    )
-
-    return out_vector
-
 def _to_isotime(input_vector: NDArray, period_duration: timedelta, sub_periods: list[tuple[datetime, datetime]]) -> NDArray:
     periods_per_week = timedelta(weeks=1) // period_duration
 
     idxs, values = [], []
+    num_inserted = 0
 
     for sub_period in sub_periods:
         if sub_period[0].isocalendar().week == 53:
             delta = sub_period[0] - sub_periods[0][0]
-            offset = delta // period_duration - len(idxs)
-            for i in range(periods_per_week):
-                idxs.append(offset)
-                values.append(input_vector[offset-periods_per_week + i])
+            offset = delta // period_duration - num_inserted
+            idxs.append(np.full(periods_per_week, offset))
+            values.append(input_vector[np.arange(offset - periods_per_week, offset)])  # the week before is repeated
+            num_inserted += periods_per_week
 
-    return np.insert(input_vector, idxs, values)
+    if not idxs:
+        return input_vector.copy()
+    return np.insert(input_vector, np.concatenate(idxs), np.concatenate(values))
+
+
+# Week 53 conversions are cached per (direction, start date, period duration, number of periods).
+# A plan is (selection, weights, starts): the output is input_vector[selection] if weights is None,
+# otherwise the sums of input_vector[selection] * weights over the segments beginning at starts.
+# The cache is bounded by number of plans and total bytes, removing the oldest first. Larger plans are not cached.
+_MODELTIME = "modeltime"
+_ISOTIME = "isotime"
+_MAX_NUM_WEEK_53_PLANS = 64
+_MAX_NUM_WEEK_53_PLAN_BYTES = 256 * 1024**2
+_WEEK_53_PLANS: dict[tuple[str, datetime, timedelta, int], tuple[datetime, tuple | None]] = dict()
+
+
+def _get_week_53_plan(direction: str, startdate: datetime, period_duration: timedelta, size: int) -> tuple[datetime, tuple | None]:
+    """Get cached plan for converting a vector to model time or ISO time, or create and cache a new one."""
+    key = (direction, startdate, period_duration, size)
+    output = _WEEK_53_PLANS.get(key)
+    if output is None:
+        create = _create_modeltime_plan if direction == _MODELTIME else _create_isotime_plan
+        output = create(startdate, period_duration, size)
+        nbytes = _get_week_53_plan_nbytes(output[1])
+        if nbytes <= _MAX_NUM_WEEK_53_PLAN_BYTES:
+            total_nbytes = sum(_get_week_53_plan_nbytes(plan) for __, plan in _WEEK_53_PLANS.values())
+            while _WEEK_53_PLANS and (len(_WEEK_53_PLANS) >= _MAX_NUM_WEEK_53_PLANS or total_nbytes + nbytes > _MAX_NUM_WEEK_53_PLAN_BYTES):
+                __, removed_plan = _WEEK_53_PLANS.pop(next(iter(_WEEK_53_PLANS)))
+                total_nbytes -= _get_week_53_plan_nbytes(removed_plan)
+            _WEEK_53_PLANS[key] = output
+    return output
+
+
+def _get_week_53_plan_nbytes(plan: tuple | None) -> int:
+    return 0 if plan is None else sum(array.nbytes for array in plan if array is not None)
+
+
+def _create_weighted_plan(fine_indices: NDArray, scaling_factor: int) -> tuple[NDArray, NDArray, NDArray]:
+    """Create plan averaging each group of scaling_factor fine_indices, with one weighted term per run of equal indices."""
+    is_run_start = np.ones(fine_indices.size, dtype=bool)
+    is_run_start[1:] = fine_indices[1:] != fine_indices[:-1]
+    is_run_start[::scaling_factor] = True  # runs do not cross output periods
+    run_starts = np.flatnonzero(is_run_start)
+
+    selection = fine_indices[run_starts]
+    weights = np.diff(np.append(run_starts, fine_indices.size)) / scaling_factor
+    starts = np.searchsorted(run_starts, np.arange(0, fine_indices.size, scaling_factor))
+    for array in (selection, weights, starts):
+        array.flags.writeable = False
+    return selection, weights, starts
+
+
+def _apply_week_53_plan(plan: tuple, input_vector: NDArray) -> NDArray:
+    selection, weights, starts = plan
+    if weights is None:
+        return input_vector[..., selection]
+    return np.add.reduceat(input_vector[..., selection] * weights, starts, axis=-1).astype(input_vector.dtype, copy=False)
 
 
 MINUTES_PER_DAY = 24 * 60
@@ -398,18 +483,19 @@ def repeat_oneyear_modeltime(
     Repeat a one-year input vector to cover the specified output date range.
 
     Args:
-        input_vector (NDArray): A 1D NumPy array representing the input time series for one year.
+        input_vector (NDArray): A 1D NumPy array representing the input time series for one year, or a 2D array with
+            one time series per row, which is repeated along the last axis.
         input_start_date (date): The start date of the input vector.
         period_duration (timedelta): The duration of each period in the input vector.
         output_start_date (date): The start date of the output period.
         output_end_date (date): The end date of the output period.
 
     Returns:
-        NDArray: A 1D NumPy array containing the repeated time series data for the specified output period.
+        NDArray: A NumPy array containing the repeated time series data for the specified output period.
 
     """
-    assert isinstance(input_vector, np.ndarray), "input_vector must be a 1D numpy array."
-    assert input_vector.ndim == 1, "input_vector must be a 1D numpy array."
+    assert isinstance(input_vector, np.ndarray), "input_vector must be a 1D or 2D numpy array."
+    assert input_vector.ndim in (1, 2), "input_vector must be a 1D or 2D numpy array."
     assert isinstance(input_start_date, datetime), "input_start_date must be a datetime object."
     assert isinstance(period_duration, timedelta), "period_duration must be a timedelta object."
     assert period_duration.total_seconds() >= 0, "period_duration must be at least one second."
@@ -431,15 +517,15 @@ def repeat_oneyear_modeltime(
     start_offset_periods = int(timedelta(days=start_offset_days) / period_duration)
 
     # Repeat the input vector enough times to cover the output period
-    repeat_count = (start_offset_periods + output_periods_count) / len(input_vector)
+    repeat_count = (start_offset_periods + output_periods_count) / input_vector.shape[-1]
 
-    if start_offset_periods + output_periods_count > len(input_vector):
+    if start_offset_periods + output_periods_count > input_vector.shape[-1]:
         repeat_count += 1  # Ensure we have enough data to cover the offset
 
-    repeated_vector = np.tile(input_vector, int(repeat_count))
+    repeated_vector = np.tile(input_vector, int(repeat_count))  # tiles along the last axis
 
     # Slice the repeated vector to match the exact output period
-    return repeated_vector[start_offset_periods : start_offset_periods + output_periods_count]
+    return repeated_vector[..., start_offset_periods : start_offset_periods + output_periods_count]
 
 
 def repeat_oneyear_isotime(
@@ -453,18 +539,19 @@ def repeat_oneyear_isotime(
     Repeat a one-year input vector to cover the specified output date range in isotime format.
 
     Args:
-        input_vector (NDArray): A 1D NumPy array representing the input time series for one year.
+        input_vector (NDArray): A 1D NumPy array representing the input time series for one year, or a 2D array with
+            one time series per row, which is repeated along the last axis.
         input_start_date (date): The start date of the input vector.
         period_duration (timedelta): The duration of each period in the input vector.
         output_start_date (date): The start date of the output period.
         output_end_date (date): The end date of the output period.
 
     Returns:
-        NDArray: A 1D NumPy array containing the repeated time series data for the specified output period.
+        NDArray: A NumPy array containing the repeated time series data for the specified output period.
 
     """
-    assert isinstance(input_vector, np.ndarray), "input_vector must be a 1D numpy array."
-    assert input_vector.ndim == 1, "input_vector must be a 1D numpy array."
+    assert isinstance(input_vector, np.ndarray), "input_vector must be a 1D or 2D numpy array."
+    assert input_vector.ndim in (1, 2), "input_vector must be a 1D or 2D numpy array."
     assert isinstance(input_start_date, date), "input_start_date must be a date object."
     assert isinstance(period_duration, timedelta), "period_duration must be a timedelta object."
     assert period_duration.total_seconds() >= 0, "period_duration must be at least one second."
@@ -486,7 +573,7 @@ def repeat_oneyear_isotime(
             assert (  # noqa: PT018
                 output_start_week == 1 and output_start_weekday == 1 and output_end_week == 1 and output_end_weekday == 1
             ), "Output period must be whole years."
-            return np.repeat(input_vector, total_years)
+            return np.repeat(input_vector, total_years, axis=-1)
         return ValueError("Provided period duration is not supported for isotime conversion.")
 
     assert output_total_duration % period_duration == timedelta(0), "Output period must be a multiple of input period duration."
@@ -495,18 +582,19 @@ def repeat_oneyear_isotime(
     assert periods_per_week.is_integer(), "Week must be a multiple of input period duration."
     periods_per_week = int(periods_per_week)
 
-    # Initialize 2D array with 53 weeks per year
-    output_vector = np.zeros((total_years, 53 * periods_per_week), dtype=np.float32)
+    # Initialize array with one row of 53 weeks per year (per series)
+    num_input_periods = input_vector.shape[-1]
+    output_vector = np.zeros((*input_vector.shape[:-1], total_years, 53 * periods_per_week), dtype=np.float32)
 
     # Repeat input vector across all years
-    output_vector[:, : input_vector.size] = np.tile(input_vector, (total_years, 1))
+    output_vector[..., :num_input_periods] = input_vector[..., np.newaxis, :]
 
     # Fill week 53 with the data from week 52 for each year
-    if len(input_vector) == 52 * periods_per_week:
-        output_vector[:, 52 * periods_per_week :] = output_vector[:, 51 * periods_per_week : 52 * periods_per_week]
+    if num_input_periods == 52 * periods_per_week:
+        output_vector[..., 52 * periods_per_week :] = output_vector[..., 51 * periods_per_week : 52 * periods_per_week]
 
-    # Flatten the output vector to 1D
-    output_vector = np.reshape(output_vector, -1)
+    # Flatten the years of each series
+    output_vector = np.reshape(output_vector, (*input_vector.shape[:-1], -1))
 
     # Array of all years in the output period
     years = np.arange(output_start_date.isocalendar().year, output_end_date.isocalendar().year)
@@ -527,7 +615,7 @@ def repeat_oneyear_isotime(
         )
 
         # Remove week 53 for years with only 52 weeks
-        output_vector = np.delete(output_vector, indices_to_delete)
+        output_vector = np.delete(output_vector, indices_to_delete, axis=-1)
 
     return output_vector
 
@@ -550,8 +638,8 @@ def _is_week_53(starttime: datetime) -> bool:
     return starttime.isocalendar().week == 53
 
 
-def _remove_week_53_data(input_vector: NDArray, starttime: datetime, period_duration: timedelta) -> NDArray:
-    """Remove data corresponding to week 53 from the input vector."""
+def _get_not_week_53_mask(size: int, starttime: datetime, period_duration: timedelta) -> NDArray:
+    """Get mask that is False for the periods of a vector of size periods that correspond to week 53."""
     period_duration_seconds = int(period_duration.total_seconds())
 
     tracking_index = 0
@@ -563,9 +651,9 @@ def _remove_week_53_data(input_vector: NDArray, starttime: datetime, period_dura
         tracking_index += seconds_to_adjust // period_duration_seconds
         tracking_date += timedelta(seconds=seconds_to_adjust)
 
-    indexes_to_remove = []
+    mask = np.ones(size, dtype=bool)
 
-    while tracking_index < input_vector.size:
+    while tracking_index < size:
         # Calculate the start of week 53
         weeks_to_start_of_week_53 = 53 - tracking_date.isocalendar().week
         seconds_to_start_of_week_53 = weeks_to_start_of_week_53 * SECONDS_PER_WEEK
@@ -575,10 +663,10 @@ def _remove_week_53_data(input_vector: NDArray, starttime: datetime, period_dura
         # Check if week 53 exists and mark its indexes for removal
         if _is_week_53(tracking_date):
             periods_per_week = SECONDS_PER_WEEK // period_duration_seconds
-            indexes_to_remove.extend(range(max(tracking_index, 0), min(tracking_index + periods_per_week, input_vector.size)))
+            mask[max(tracking_index, 0) : max(tracking_index + periods_per_week, 0)] = False
             tracking_date += timedelta(seconds=SECONDS_PER_WEEK)
             tracking_index += periods_per_week
-    return np.delete(input_vector, indexes_to_remove)
+    return mask
 
 
 def _has_week_53(year_: int) -> bool:
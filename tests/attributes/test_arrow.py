@@ -132,6 +132,30 @@ def test_get_scenario_vector_with_only_conversion_and_has_profile():
     assert np.equal(result, np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])).all()
 
 
+def test_get_scenario_vector_with_out_and_level_writes_into_out():
+    arrow = Arrow(node="test", is_ingoing=True, conversion=mock_conversion(data_value=2.0))
+    matrix = np.zeros((2, 7), dtype=np.float32)
+
+    result = arrow.get_scenario_vector(mock_db(), mock_scenario_horizon(), mock_level_period(), unit="MWh", out=matrix[1])
+
+    assert np.shares_memory(result, matrix[1])
+    assert np.equal(matrix, [np.zeros(7), np.repeat(2.0, 7)]).all()
+
+
+def test_get_scenario_vector_with_out_passes_out_to_first_coefficient_with_profile():
+    conversion = mock_conversion(has_profile=True, scenario_vector=np.array([4.0, 8.0]))
+    efficiency = mock_efficiency(has_profile=True, scenario_vector=np.array([0.8, 0.4]))
+    arrow = Arrow(node="test", is_ingoing=True, conversion=conversion, efficiency=efficiency)
+    out = np.zeros(2)
+
+    result = arrow.get_scenario_vector(mock_db(), mock_scenario_horizon(), mock_level_period(), unit="MWh", out=out)
+
+    assert result is out
+    assert conversion.get_scenario_vector.call_args.kwargs["out"] is out
+    assert efficiency.get_scenario_vector.call_args.kwargs["out"] is None
+    assert np.equal(out, [5.0, 20.0]).all()
+
+
 def test_get_scenario_vector_with_only_efficiency_and_has_level():
     arrow = Arrow(node="test", is_ingoing=True, efficiency=mock_efficiency(data_value=0.8))
 
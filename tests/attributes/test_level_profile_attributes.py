@@ -376,6 +376,47 @@ def test_get_data_value_raises_value_error_when_level_is_none():
         )
 
 
+def test_get_data_series_returns_level_series_when_intercept_is_none():
+    db = Mock(spec=QueryDB)
+    scenario_horizon = Mock(spec=FixedFrequencyTimeIndex)
+    level_periods = Mock(spec=FixedFrequencyTimeIndex)
+
+    level_profile = StockVolume(level=_level())
+
+    with patch("framcore.attributes.level_profile_attributes.get_level_series", return_value=np.array([10.0, 20.0])):
+        result = level_profile._get_data_series(
+            db=db,
+            scenario_horizon=scenario_horizon,
+            level_periods=level_periods,
+            unit="MWh",
+            is_max_level=True,
+        )
+
+    assert np.array_equal(result, np.array([10.0, 20.0]))
+
+
+def test_get_data_series_returns_sum_of_level_and_intercept_series():
+    db = Mock(spec=QueryDB)
+    scenario_horizon = Mock(spec=FixedFrequencyTimeIndex)
+    level_periods = Mock(spec=FixedFrequencyTimeIndex)
+
+    level_profile = StockVolume(level=_level(), intercept=_intercept())
+
+    with (
+        patch("framcore.attributes.level_profile_attributes.get_level_series", return_value=np.array([10.0, 20.0])),
+        patch("framcore.attributes.level_profile_attributes._get_constant_series_from_expr", return_value=np.array([5.0, 5.0])),
+    ):
+        result = level_profile._get_data_series(
+            db=db,
+            scenario_horizon=scenario_horizon,
+            level_periods=level_periods,
+            unit="MWh",
+            is_max_level=True,
+        )
+
+    assert np.array_equal(result, np.array([15.0, 25.0]))
+
+
 def test_get_scenario_vector_with_profile_none_returns_level_value_times_ones():
     db = Mock(spec=QueryDB)
     scenario_horizon = Mock(spec=FixedFrequencyTimeIndex)
@@ -509,3 +550,31 @@ def test_hash_changes_with_field_modification():
     level_profile._scale = None
     new_hash = hash(level_profile)
     assert original_hash != new_hash
+
+
+def test_get_scenario_vector_with_out_writes_level_times_profile_into_out():
+    db = Mock(spec=QueryDB)
+    scenario_horizon = Mock(spec=FixedFrequencyTimeIndex)
+    level_period = Mock(spec=SinglePeriodTimeIndex)
+    level_profile = StockVolume(level=_level(), profile=Mock(spec=ConstantTimeVector), intercept=Mock(spec=Expr))
+    matrix = np.zeros((2, 3), dtype=np.float32)
+
+    def write_profile_vector(**kwargs: object) -> np.ndarray:
+        kwargs["out"][:] = [1.0, 2.0, 3.0]
+        return kwargs["out"]
+
+    with (
+        patch("framcore.attributes.level_profile_attributes.get_level_value", return_value=3.0),
+        patch("framcore.attributes.level_profile_attributes.get_profile_vector", side_effect=write_profile_vector),
+        patch("framcore.attributes.level_profile_attributes._get_constant_from_expr", return_value=1.0),
+    ):
+        result = level_profile.get_scenario_vector(
+            db=db,
+            scenario_horizon=scenario_horizon,
+            level_period=level_period,
+            unit="MWh",
+            out=matrix[1],
+        )
+
+    assert np.shares_memory(result, matrix[1])
+    assert np.equal(matrix, [[0.0, 0.0, 0.0], [4.0, 7.0, 10.0]]).all()
@@ -0,0 +1,71 @@
+import pytest
+
+from framcore.expressions import Expr
+from framcore.timevectors import ConstantTimeVector
+
+
+def _flow(key: str) -> Expr:
+    return Expr(src=key, is_level=True, is_flow=True)
+
+
+def _level(key: str) -> Expr:
+    return Expr(src=key, is_level=True)
+
+
+def _const(scalar: float) -> Expr:
+    return Expr(src=ConstantTimeVector(scalar, unit="MW", is_max_level=True), is_level=True, is_flow=True)
+
+
+@pytest.mark.parametrize(
+    "exprs",
+    [
+        [_flow("a")],
+        [_flow("a"), _flow("b"), _flow("c")],
+        [_flow("a") + _flow("b"), _flow("c"), _flow("d")],
+        [_level("a") - _level("b"), _level("c")],
+        [_flow("a") * 2.0, _flow("b") * 3.0, _flow("c")],
+        [_const(1.0), _const(2.0), _flow("a"), _const(3.0)],
+        [_const(1.0), _const(2.0), _const(3.0)],
+    ],
+    ids=["leaf", "leaves", "sum_first", "sub_first", "products", "constants_first", "all_constants"],
+)
+def test_add_many_equals_builtin_sum(exprs: list[Expr]):
+    result = Expr.add_many(exprs)
+    expected = sum(exprs)
+    assert result == expected
+    assert repr(result) == repr(expected)
+    assert (result.is_level(), result.is_flow(), result.get_profile()) == (expected.is_level(), expected.is_flow(), expected.get_profile())
+
+
+def test_add_many_does_not_change_args_of_first_expr():
+    first = _flow("a") + _flow("b")
+    Expr.add_many([first, _flow("c")])
+    __, args = first.get_operations(expect_ops=True, copy_list=False)
+    assert len(args) == 2
+
+
+def test_add_many_empty_raises_value_error():
+    with pytest.raises(ValueError):  # noqa: PT011
+        Expr.add_many([])
+
+
+def test_add_many_not_expr_raises_type_error():
+    with pytest.raises(TypeError):
+        Expr.add_many([_flow("a"), 1.0])
+
+
+def test_add_many_unsupported_case_raises_value_error():
+    stock = Expr(src="s", is_level=True, is_stock=True)
+    with pytest.raises(ValueError):  # noqa: PT011
+        Expr.add_many([_flow("a"), _flow("b"), stock])
+
+
+def test_weighted_sum_equals_builtin_sum_of_products():
+    exprs = [_flow("a"), _flow("b"), _flow("c")]
+    weights = [0.2, 0.3, 0.5]
+    assert Expr.weighted_sum(exprs, weights) == sum([w * e for e, w in zip(exprs, weights, strict=True)])
+
+
+def test_weighted_sum_different_lengths_raises_value_error():
+    with pytest.raises(ValueError):  # noqa: PT011
+        Expr.weighted_sum([_flow("a"), _flow("b")], [1.0])
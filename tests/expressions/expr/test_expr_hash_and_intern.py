@@ -0,0 +1,89 @@
+import pickle
+from copy import deepcopy
+
+import pytest
+
+from framcore.expressions import Expr, clear_interned_exprs, intern_expr
+from framcore.timevectors import ConstantTimeVector
+
+
+def _flow(key: str) -> Expr:
+    return Expr(src=key, is_level=True, is_flow=True)
+
+
+def _profile(key: str) -> Expr:
+    return Expr(src=key, is_profile=True)
+
+
+def test_hash_is_cached():
+    expr = _flow("a") + _flow("b")
+    assert expr._hash is None
+    value = hash(expr)
+    assert expr._hash == value
+    assert hash(expr) == value
+
+
+def test_equal_exprs_have_equal_hash():
+    assert hash(_flow("a") + _flow("b") * 2.0) == hash(_flow("a") + _flow("b") * 2.0)
+
+
+def test_different_hash_means_not_equal():
+    x = _flow("a") + _flow("b")
+    y = _flow("a") + _flow("c")
+    hash(x)
+    hash(y)
+    assert x != y
+
+
+def test_set_profile_resets_hash():
+    expr = _flow("a")
+    before = hash(expr)
+    expr.set_profile(_profile("p"))
+    assert expr._hash is None
+    assert hash(expr) != before
+    assert expr == Expr(src="a", is_level=True, is_flow=True, profile=_profile("p"))
+
+
+@pytest.mark.parametrize("copy_func", [deepcopy, lambda expr: pickle.loads(pickle.dumps(expr))], ids=["deepcopy", "pickle"])
+def test_hash_is_not_copied(copy_func):
+    expr = _flow("a") + _flow("b")
+    hash(expr)
+    copied = copy_func(expr)
+    assert copied._hash is None
+    assert copied == expr
+    assert hash(copied) == hash(expr)
+
+
+def test_intern_expr_shares_equal_subexpressions():
+    clear_interned_exprs()
+    price = Expr(src=ConstantTimeVector(1.0, unit="EUR/MWh", is_max_level=False), is_level=True)
+    x = intern_expr(price * _flow("a") + price * _flow("b"))
+    y = intern_expr(Expr(src=ConstantTimeVector(1.0, unit="EUR/MWh", is_max_level=False), is_level=True) * _flow("a"))
+
+    __, args = x.get_operations(expect_ops=True, copy_list=False)
+    assert args[0] is y
+    assert intern_expr(price * _flow("a") + price * _flow("b")) is x
+
+
+def test_intern_expr_does_not_modify_expr():
+    clear_interned_exprs()
+    first = intern_expr(_flow("a"))
+    expr = _flow("a") + _flow("b")
+    interned = intern_expr(expr)
+    __, args = expr.get_operations(expect_ops=True, copy_list=False)
+    __, interned_args = interned.get_operations(expect_ops=True, copy_list=False)
+    assert interned == expr
+    assert interned_args[0] is first
+    assert args[0] is not first
+
+
+def test_intern_expr_interns_profile():
+    clear_interned_exprs()
+    profile = intern_expr(_profile("p"))
+    level = intern_expr(Expr(src="a", is_level=True, is_flow=True, profile=_profile("p")))
+    assert level.get_profile() is profile
+
+
+def test_intern_expr_not_expr_raises_type_error():
+    with pytest.raises(TypeError):
+        intern_expr("a")
@@ -0,0 +1,84 @@
+import importlib
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from framcore import Model
+from framcore.attributes import AvgFlowVolume, MaxFlowVolume
+from framcore.expressions import Expr, QueryExecutor, get_level_value
+from framcore.timeindexes import ModelYear, ProfileTimeIndex
+from framcore.timevectors import ConstantTimeVector
+
+
+def _model(num_levels: int) -> Model:
+    model = Model()
+    data = model.get_data()
+    for i in range(num_levels):
+        data[f"level_{i}"] = ConstantTimeVector(float(i), unit="MW", is_max_level=True)
+    data["profile"] = ConstantTimeVector(0.5, is_zero_one_profile=True)
+    return model
+
+
+def _profile_time_index() -> ProfileTimeIndex:
+    return ProfileTimeIndex(1981, 2, timedelta(weeks=1), is_52_week_years=True)
+
+
+@pytest.mark.parametrize("num_workers", [1, 3])
+def test_get_level_values_gives_same_values_as_get_level_value(num_workers: int):
+    model = _model(10)
+    exprs = [Expr(src=f"level_{i}", is_level=True) for i in range(10)]
+    items = [*exprs, MaxFlowVolume(level=Expr(src="level_5", is_level=True, is_flow=True), profile=Expr(src="profile", is_profile=True))]
+
+    values = QueryExecutor(model, num_workers).get_level_values(items, "GW", ModelYear(2025), _profile_time_index(), is_max=True)
+
+    expected = [get_level_value(expr, model, "GW", ModelYear(2025), _profile_time_index(), is_max=True) for expr in exprs]
+    assert values.tolist() == pytest.approx([*expected, 0.005])
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_get_scenario_vectors_gives_one_row_per_item(num_workers: int):
+    model = _model(3)
+    profile = Expr(src="profile", is_profile=True)
+    items = [MaxFlowVolume(level=Expr(src=f"level_{i}", is_level=True, is_flow=True), profile=profile) for i in range(3)]
+    items.append(AvgFlowVolume(value=7.0, unit="MW"))
+
+    vectors = QueryExecutor(model, num_workers).get_scenario_vectors(items, "MW", ModelYear(2025), _profile_time_index())
+
+    assert vectors.shape == (4, _profile_time_index().get_num_periods())
+    assert vectors.dtype == np.float32
+    for i, item in enumerate(items):
+        expected = item.get_scenario_vector(model, _profile_time_index(), ModelYear(2025), "MW")
+        assert np.allclose(vectors[i], expected)
+
+
+def test_get_scenario_vectors_with_workers_gives_same_float64_vectors_as_serial():
+    model = _model(5)
+    profile = Expr(src="profile", is_profile=True)
+    items = [MaxFlowVolume(level=Expr(src=f"level_{i}", is_level=True, is_flow=True), profile=profile) for i in range(5)]
+
+    serial = QueryExecutor(model, 1).get_scenario_vectors(items, "MW", ModelYear(2025), _profile_time_index(), is_float32=False)
+    parallel = QueryExecutor(model, 2).get_scenario_vectors(items, "MW", ModelYear(2025), _profile_time_index(), is_float32=False)
+
+    assert parallel.dtype == np.float64
+    assert np.array_equal(parallel, serial)
+
+
+def test_worker_job_is_reset_after_run():
+    model = _model(4)
+    exprs = [Expr(src=f"level_{i}", is_level=True) for i in range(4)]
+
+    QueryExecutor(model, 2).get_level_values(exprs, "MW", ModelYear(2025), _profile_time_index(), is_max=True)
+
+    assert importlib.import_module("framcore.expressions.QueryExecutor")._WORKER_JOB is None
+
+
+def test_get_scenario_vectors_with_expr_raises_type_error():
+    model = _model(1)
+    with pytest.raises(TypeError):
+        QueryExecutor(model).get_scenario_vectors([Expr(src="level_0", is_level=True)], "MW", ModelYear(2025), _profile_time_index())
+
+
+def test_init_with_zero_workers_raises_value_error():
+    with pytest.raises(ValueError):  # noqa: PT011
+        QueryExecutor(Model(), 0)
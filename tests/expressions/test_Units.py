@@ -1,6 +1,11 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
-from framcore.expressions import get_unit_conversion_factor
+from framcore.expressions import get_unit_conversion_factor, units
 from framcore.expressions.units import is_convertable
 
 
@@ -102,3 +107,119 @@ def test_unknown_unit_raises(from_unit, to_unit):
 def test_is_convertable(from_unit: str, to_unit: str, expected: bool):
     result = is_convertable(from_unit, to_unit)
     assert result is expected
+
+
+@pytest.mark.parametrize(
+    ("from_unit", "to_unit"),
+    [
+        ("GWh/year", "MW"),
+        ("Mm3/year", "m3/s"),
+        ("EUR/(MW*h)", "EUR/MWh"),
+        ("kWh/m3", "GWh/Mm3"),
+        ("MW**2", "kW^2"),
+        ("t/MWh", "kg/GJ"),
+        ("1/(MW)", "1/GW"),
+        ("l/s", "Mm3/year"),
+        ("2.5*joule", "kJ"),
+        ("(EUR/MWh)*(GWh/year)", "EUR/hour"),
+    ],
+)
+def test_native_conversion_equals_sympy(from_unit, to_unit):
+    native = units._native_get_unit_conversion_factor(from_unit, to_unit)
+    sympy_result = units._fallback_get_unit_conversion_factor(from_unit, to_unit)
+    assert native == pytest.approx(sympy_result, rel=1e-12)
+
+
+def test_native_conversion_supports_euro_sign():
+    assert get_unit_conversion_factor("€/MWh", "EUR/GWh") == 1000.0
+
+
+@pytest.mark.parametrize(
+    ("from_unit", "to_unit"),
+    [
+        ("MW + GW", "MW"),
+        ("MW**0.5", "MW"),
+        ("MW*(GW", "MW"),
+        ("MW$", "MW"),
+        ("", "MW"),
+    ],
+)
+def test_native_conversion_invalid_unit_raises(from_unit, to_unit):
+    with pytest.raises(ValueError, match=r".+"):
+        units._native_get_unit_conversion_factor(from_unit, to_unit)
+
+
+def test_validate_unit_conversion_fastpaths():
+    units.validate_unit_conversion_fastpaths()
+
+
+@pytest.fixture
+def persistent_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(units, "_FASTPATH_CONVERSION_FACTORS", dict(units._FASTPATH_CONVERSION_FACTORS))
+    monkeypatch.setattr(units, "_PERSISTENT_CACHE_PATH", None)
+    monkeypatch.setattr(units, "_PERSISTENT_CACHE_IS_DIRTY", False)
+    monkeypatch.setattr(units, "_PERSISTENT_CACHE_ATEXIT_REGISTERED", True)
+    return tmp_path / "cache" / "unit_conversion_factors.json"
+
+
+def test_persistent_unit_cache_saves_and_loads_factors(persistent_cache):
+    units.enable_persistent_unit_cache(persistent_cache)
+    factor = get_unit_conversion_factor("kWh/year", "watt")
+    get_unit_conversion_factor("2.5*kW", "watt")
+    units.flush_persistent_unit_cache()
+
+    factors = units._read_persistent_cache(persistent_cache)
+    assert factors[("kWh/year", "watt")] == factor
+    assert ("2.5*kW", "watt") not in factors
+
+    del units._FASTPATH_CONVERSION_FACTORS[("kWh/year", "watt")]
+    units.enable_persistent_unit_cache(persistent_cache)
+    assert units._FASTPATH_CONVERSION_FACTORS[("kWh/year", "watt")] == factor
+
+
+def test_persistent_unit_cache_merges_with_existing_file(persistent_cache):
+    units.enable_persistent_unit_cache(persistent_cache)
+    get_unit_conversion_factor("kW", "watt")
+    units.flush_persistent_unit_cache()
+
+    del units._FASTPATH_CONVERSION_FACTORS[("kW", "watt")]
+    get_unit_conversion_factor("GW", "watt")
+    units.flush_persistent_unit_cache()
+
+    factors = units._read_persistent_cache(persistent_cache)
+    assert ("kW", "watt") in factors
+    assert ("GW", "watt") in factors
+
+
+def test_persistent_unit_cache_ignores_invalid_file(persistent_cache):
+    persistent_cache.parent.mkdir(parents=True)
+    persistent_cache.write_text("not json")
+    units.enable_persistent_unit_cache(persistent_cache)
+    assert units._read_persistent_cache(persistent_cache) == {}
+    assert get_unit_conversion_factor("MW", "GW") == 0.001
+
+
+def test_persistent_unit_cache_is_validated(persistent_cache):
+    persistent_cache.parent.mkdir(parents=True)
+    persistent_cache.write_text('{"version": 1, "factors": [["TW", "kJ/s", 2.0]]}')
+    units.enable_persistent_unit_cache(persistent_cache)
+    with pytest.raises(RuntimeError, match="'TW' to 'kJ/s'"):
+        units.validate_unit_conversion_fastpaths()
+
+
+def _get_persistent_cache_path_in_new_process(env_value: str, cwd: Path) -> str:
+    code = "from framcore.expressions import units; units.get_unit_conversion_factor('kWh/year', 'watt'); print(units._PERSISTENT_CACHE_PATH)"
+    env = {**os.environ, "FRAMCORE_UNIT_CACHE": env_value, "PYTHONPATH": str(Path(__file__).parents[2])}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=cwd, env=env)
+    return result.stdout.strip()
+
+
+@pytest.mark.parametrize("value", ["", "0", "false", "False", "no", "off"])
+def test_persistent_unit_cache_env_var_off_values_leave_cache_disabled(tmp_path, value):
+    assert _get_persistent_cache_path_in_new_process(value, tmp_path) == "None"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_persistent_unit_cache_env_var_path_enables_cache(tmp_path):
+    cache_path = tmp_path / "unit_conversion_factors.json"
+    assert _get_persistent_cache_path_in_new_process(str(cache_path), tmp_path) == str(cache_path)
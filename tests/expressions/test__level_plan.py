@@ -0,0 +1,140 @@
+from datetime import timedelta
+
+import pytest
+
+from framcore import Model
+from framcore.expressions import Expr, get_level_value
+from framcore.expressions._get_constant_from_expr import _sympy_fallback
+from framcore.expressions._level_plan import (
+    _KIND_AGGREGATION,
+    _KIND_GENERAL,
+    _KIND_LEAF,
+    _KIND_PRODUCT,
+    _KIND_SUM,
+    _KIND_SUM_OF_PRODUCTS,
+    _clear_level_plans,
+    _get_level_plan,
+)
+from framcore.querydbs import ModelDB
+from framcore.timeindexes import ModelYear, ProfileTimeIndex
+from framcore.timevectors import ConstantTimeVector
+
+
+def _level(key: str) -> Expr:
+    return Expr(src=key, is_level=True)
+
+
+def _model(**scalars_with_units: tuple[float, str | None]) -> Model:
+    model = Model()
+    data = model.get_data()
+    for key, (scalar, unit) in scalars_with_units.items():
+        data[key] = ConstantTimeVector(scalar, unit=unit, is_max_level=True)
+    return model
+
+
+def _query(expr: Expr, model: Model, unit: str | None, year: int = 2025) -> float:
+    return get_level_value(
+        expr,
+        db=ModelDB(model),
+        unit=unit,
+        data_dim=ModelYear(year),
+        scen_dim=ProfileTimeIndex(1981, 10, timedelta(days=1), is_52_week_years=True),
+        is_max=True,
+    )
+
+
+@pytest.mark.parametrize(
+    ("expr", "expected_kind"),
+    [
+        (_level("a"), _KIND_LEAF),
+        (_level("a") + _level("b") - _level("c"), _KIND_SUM),
+        (_level("a") * (_level("b") + _level("c")), _KIND_PRODUCT),
+        (_level("a") * _level("b") + _level("c"), _KIND_SUM_OF_PRODUCTS),
+        ((_level("a") * _level("b") + _level("c")) / (_level("b") + _level("c")), _KIND_AGGREGATION),
+        (_level("a") / _level("b") / _level("c"), _KIND_GENERAL),
+    ],
+    ids=["leaf", "sum", "product", "sum_of_products", "aggregation", "general"],
+)
+def test_plan_kind(expr: Expr, expected_kind: str):
+    assert _get_level_plan(expr).get_kind() == expected_kind
+
+
+def test_plan_has_one_slot_per_unique_leaf():
+    expr = _level("a") + _level("b") + _level("a")
+    plan = _get_level_plan(expr)
+    assert [leaf.get_src() for leaf in plan.get_leaves()] == ["a", "b"]
+    assert plan.get_expr_str() == "(x0 + x1 + x0)"
+
+
+def test_plan_is_cached_for_equal_expr():
+    _clear_level_plans()
+    plan = _get_level_plan(_level("a") + _level("b"))
+    assert _get_level_plan(_level("a") + _level("b")) is plan
+
+
+def test_sum_with_mixed_units_is_converted_to_target_unit():
+    model = _model(a=(1.0, "GW"), b=(500.0, "MW"))
+    assert _query(_level("a") + _level("b"), model, "MW") == pytest.approx(1500.0)
+    assert _query(_level("a") + _level("b"), model, "GW") == pytest.approx(1.5)
+
+
+def test_repeated_queries_refill_leaf_values():
+    model = _model(a=(1.0, "GW"), b=(500.0, "MW"))
+    expr = _level("a") - _level("b")
+    assert _query(expr, model, "MW") == pytest.approx(500.0)
+    model.get_data()["b"] = ConstantTimeVector(250.0, unit="MW", is_max_level=True)
+    assert _query(expr, model, "MW") == pytest.approx(750.0)
+
+
+def test_aggregation_with_mixed_units_in_denominator():
+    model = _model(price=(10.0, "EUR/MWh"), a=(1.0, "GW"), b=(1000.0, "MW"))
+    expr = (_level("price") * _level("a") + _level("price") * _level("b")) / (_level("a") + _level("b"))
+    assert _query(expr, model, "EUR/MWh") == pytest.approx(10.0)
+
+
+def test_general_kind_gives_same_value_as_sympy():
+    model = _model(a=(8.0, "MW"), b=(2.0, None), c=(2.0, None))
+    assert _query(_level("a") / _level("b") / _level("c"), model, "MW") == pytest.approx(2.0)
+
+
+def test_incompatible_units_raises_value_error():
+    model = _model(a=(1.0, "MW"), b=(1.0, "m3/s"))
+    with pytest.raises(ValueError):  # noqa: PT011
+        _query(_level("a") + _level("b"), model, "MW")
+
+
+def test_weighted_sum_is_converted_to_target_unit():
+    model = _model(a=(1.0, "GW"), b=(500.0, "MW"))
+    expr = Expr.weighted_sum([_level("a"), _level("b")], [0.5, 2.0])
+    assert _get_level_plan(expr).get_kind() == _KIND_SUM_OF_PRODUCTS
+    assert _query(expr, model, "MW") == pytest.approx(1500.0)
+
+
+def test_general_kind_with_nested_operations_and_units():
+    model = _model(price=(20.0, "EUR/MWh"), volume=(2.0, "GWh"), hours=(10.0, "h"), cap=(100.0, "MW"), cost=(5.0, "EUR/h"))
+    expr = (_level("price") * _level("volume")) / (_level("hours") * _level("cap")) + _level("cost") / _level("cap")
+    plan = _get_level_plan(expr)
+    assert plan.get_kind() == _KIND_GENERAL
+    assert _query(expr, model, "EUR/MWh") == pytest.approx(20.0 * 2000.0 / (10.0 * 100.0) + 5.0 / 100.0)
+    values, units = [20.0, 2.0, 10.0, 100.0, 5.0], ["EUR/MWh", "GWh", "h", "MW", "EUR/h"]
+    expected = _sympy_fallback(plan.get_constants_with_units(values, units), plan.get_expr_str(), "EUR/GWh")
+    assert plan.evaluate(values, units, "EUR/GWh") == pytest.approx(expected)
+
+
+def test_general_kind_with_incompatible_units_raises_value_error():
+    model = _model(a=(1.0, "MW"), b=(1.0, "m3/s"), c=(2.0, None))
+    with pytest.raises(ValueError):  # noqa: PT011
+        _query(_level("a") / _level("c") + _level("b") / _level("c"), model, "MW")
+
+
+def test_general_kind_ignores_unit_of_zero_terms():
+    model = _model(a=(4.0, "MW"), b=(0.0, "m3/s"), c=(2.0, None))
+    assert _query(_level("a") / _level("c") + _level("b") / _level("c"), model, "MW") == pytest.approx(2.0)
+
+
+def test_aggregation_with_incompatible_numerator_raises_value_error():
+    plan = _get_level_plan((_level("a") * _level("b") + _level("c")) / (_level("b") + _level("d")))
+    assert plan.get_kind() == _KIND_AGGREGATION
+    values, units = [10.0, 1.0, 500.0, 1000.0], ["EUR/MWh", "GW", "m3/s", "MW"]
+    with pytest.raises(ValueError):  # noqa: PT011
+        plan.evaluate(values, units, "EUR/MWh")
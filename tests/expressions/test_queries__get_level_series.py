@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from framcore import Model
+from framcore.expressions import Expr, get_level_series, get_level_value
+from framcore.querydbs import QueryDB
+from framcore.timeindexes import FixedFrequencyTimeIndex, ModelYear, ProfileTimeIndex
+from framcore.timevectors import ConstantTimeVector, ListTimeVector
+
+
+def _profile_time_index() -> ProfileTimeIndex:
+    return ProfileTimeIndex(1981, 10, timedelta(days=1), is_52_week_years=True)
+
+
+def _model_years(start_year: int, num_years: int) -> FixedFrequencyTimeIndex:
+    return FixedFrequencyTimeIndex(
+        start_time=datetime.fromisocalendar(start_year, 1, 1),
+        period_duration=timedelta(weeks=52),
+        num_periods=num_years,
+        is_52_week_years=True,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+
+
+def _model() -> Model:
+    model = Model()
+    data = model.get_data()
+    data["capacity"] = ListTimeVector(
+        timeindex=FixedFrequencyTimeIndex(
+            start_time=datetime.fromisocalendar(2025, 1, 1),
+            period_duration=timedelta(weeks=26),
+            num_periods=8,
+            is_52_week_years=True,
+            extrapolate_first_point=True,
+            extrapolate_last_point=True,
+        ),
+        vector=np.array([100.0, 200.0, 300.0, 300.0, 400.0, 600.0, 700.0, 700.0]),
+        unit="MW",
+        is_max_level=True,
+        is_zero_one_profile=None,
+    )
+    data["extra"] = ConstantTimeVector(1.0, unit="GW", is_max_level=True)
+    return model
+
+
+@pytest.mark.parametrize(
+    ("expr", "unit", "data_dims", "is_max"),
+    [
+        ("not_an_expr", "MW", Mock(FixedFrequencyTimeIndex), True),
+        (Mock(Expr), 100.0, Mock(FixedFrequencyTimeIndex), True),
+        (Mock(Expr), "MW", "not_a_timeindex", True),
+        (Mock(Expr), "MW", Mock(FixedFrequencyTimeIndex), "not_a_bool"),
+    ],
+)
+def test_get_level_series_with_invalid_params_raises_type_error(expr, unit, data_dims, is_max):
+    with pytest.raises(TypeError):
+        get_level_series(expr, Mock(QueryDB), unit, data_dims, Mock(FixedFrequencyTimeIndex), is_max)
+
+
+def test_get_level_series_matches_get_level_value_per_period():
+    model = _model()
+    expr = Expr(src="capacity", is_level=True) + Expr(src="extra", is_level=True)
+    data_dims = _model_years(2024, 6)
+
+    series = get_level_series(expr, model, "MW", data_dims, _profile_time_index(), True)
+
+    expected = [get_level_value(expr, model, "MW", ModelYear(year), _profile_time_index(), True) for year in range(2024, 2030)]
+    assert series.shape == (6,)
+    assert series.tolist() == pytest.approx(expected)
+    assert series.tolist() == pytest.approx([1100.0, 1150.0, 1300.0, 1500.0, 1700.0, 1700.0])
+
+
+def test_get_level_series_with_single_period_equals_get_level_value():
+    model = _model()
+    expr = Expr(src="capacity", is_level=True)
+    data_dim = ModelYear(2026)
+
+    series = get_level_series(expr, model, "GW", data_dim, _profile_time_index(), True)
+
+    assert series.tolist() == pytest.approx([get_level_value(expr, model, "GW", data_dim, _profile_time_index(), True)])
+
+
+def test_get_level_series_returns_read_only_series_unless_copy():
+    model = _model()
+    expr = Expr(src="capacity", is_level=True)
+    data_dims = _model_years(2025, 3)
+
+    series = get_level_series(expr, model, "MW", data_dims, _profile_time_index(), True)
+    assert not series.flags.writeable
+
+    series_copy = get_level_series(expr, model, "MW", data_dims, _profile_time_index(), True, copy=True)
+    assert series_copy.flags.writeable
+    series_copy[:] = 0.0
+    assert series.tolist() == pytest.approx([150.0, 300.0, 500.0])
+
+
+def test_get_level_series_raises_when_extrapolation_not_allowed():
+    model = _model()
+    model.get_data()["capacity"] = ListTimeVector(
+        timeindex=FixedFrequencyTimeIndex(
+            start_time=datetime.fromisocalendar(2025, 1, 1),
+            period_duration=timedelta(weeks=52),
+            num_periods=2,
+            is_52_week_years=True,
+            extrapolate_first_point=False,
+            extrapolate_last_point=False,
+        ),
+        vector=np.array([100.0, 200.0]),
+        unit="MW",
+        is_max_level=True,
+        is_zero_one_profile=None,
+    )
+    expr = Expr(src="capacity", is_level=True)
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        get_level_series(expr, model, "MW", _model_years(2024, 3), _profile_time_index(), True)
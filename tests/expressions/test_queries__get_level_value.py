@@ -2,13 +2,14 @@ import operator
 from datetime import timedelta
 from unittest.mock import Mock
 
+import numpy as np
 import pytest
 
 from framcore import Model
 from framcore.expressions import Expr, get_level_value
-from framcore.querydbs import ModelDB, QueryDB
+from framcore.querydbs import CacheDB, ModelDB, QueryDB
 from framcore.timeindexes import FixedFrequencyTimeIndex, ModelYear, ProfileTimeIndex, SinglePeriodTimeIndex, TimeIndex
-from framcore.timevectors import ConstantTimeVector
+from framcore.timevectors import ConstantTimeVector, ListTimeVector
 
 
 @pytest.mark.parametrize(
@@ -170,3 +171,56 @@ def test_get_level_value_complex_expr_no_fastpath():
 
     expected_value = (50.0 + 30.0) * 10.0 - 30.0 / 10.0  # (80 * 10) - 3 = 797.0
     assert level_value == expected_value, f"Expected {expected_value}, got {level_value}"
+
+
+def test_get_level_value_resolves_expr_references_without_modifying_them():
+    model = Model()
+    data = model.get_data()
+    data["a"] = _level_timevector(scalar=100.0)
+    data["b"] = _level_timevector(scalar=50.0)
+    data["sum_ab"] = Expr(src="a", is_level=True) + Expr(src="b", is_level=True)
+    data["ref_sum_ab"] = Expr(src="sum_ab", is_level=True)
+    sum_ab = data["sum_ab"]
+    sum_ab_hash = hash(sum_ab)
+
+    expr = Expr(src="ref_sum_ab", is_level=True) + Expr(src="sum_ab", is_level=True) + Expr(src="a", is_level=True)
+
+    value = get_level_value(expr, model, "MW", _model_year(), _profile_time_index(), is_max=True)
+
+    assert value == pytest.approx(400.0)
+    assert [arg.get_src() for arg in sum_ab.get_operations(expect_ops=True, copy_list=False)[1]] == ["a", "b"]
+    assert hash(sum_ab) == sum_ab_hash
+
+
+def test_get_level_value_with_cycle_of_expr_references_raises_value_error():
+    model = Model()
+    data = model.get_data()
+    data["a"] = _level_timevector(scalar=100.0)
+    data["x"] = Expr(src="a", is_level=True) + Expr(src="y", is_level=True)
+    data["y"] = Expr(src="x", is_level=True)
+
+    with pytest.raises(ValueError, match="Cycle"):
+        get_level_value(Expr(src="x", is_level=True), model, "MW", _model_year(), _profile_time_index(), is_max=True)
+
+
+def test_get_level_value_caches_cumulative_integral_of_timevector():
+    model = Model()
+    timeindex = FixedFrequencyTimeIndex(
+        start_time=ModelYear(2024).get_start_time(),
+        period_duration=timedelta(weeks=1),
+        num_periods=3 * 52,
+        is_52_week_years=True,
+        extrapolate_first_point=True,
+        extrapolate_last_point=True,
+    )
+    vector = np.repeat([100.0, 200.0, 300.0], 52)
+    model.get_data()["level_tv"] = ListTimeVector(timeindex, vector, unit="MW", is_max_level=True, is_zero_one_profile=None)
+    db = CacheDB(model)
+    db.set_min_elapsed_seconds(0.0)
+
+    for year, expected_value in [(2024, 100.0), (2025, 200.0), (2026, 300.0), (2030, 300.0)]:
+        level_value = get_level_value(Expr(src="level_tv", is_level=True), db, "MW", ModelYear(year), _profile_time_index(), is_max=True)
+        assert level_value == pytest.approx(expected_value)
+
+    cumulative_integral_keys = [key for key in db._cache if key[0] == "_get_cumulative_integral"]
+    assert len(cumulative_integral_keys) == 1
@@ -0,0 +1,80 @@
+from datetime import timedelta
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from framcore import Model
+from framcore.expressions import Expr, get_level_value, get_level_values
+from framcore.querydbs import CacheDB, QueryDB
+from framcore.timeindexes import FixedFrequencyTimeIndex, ModelYear, ProfileTimeIndex, SinglePeriodTimeIndex
+from framcore.timevectors import ConstantTimeVector
+
+
+def _model_year() -> ModelYear:
+    return ModelYear(2025)
+
+
+def _profile_time_index() -> ProfileTimeIndex:
+    return ProfileTimeIndex(1981, 10, timedelta(days=1), is_52_week_years=True)
+
+
+def _model() -> Model:
+    model = Model()
+    data = model.get_data()
+    data["a"] = ConstantTimeVector(100.0, unit="MW", is_max_level=True)
+    data["b"] = ConstantTimeVector(2.0, unit="GW", is_max_level=True)
+    data["c"] = ConstantTimeVector(50.0, unit="MW", is_max_level=True)
+    return model
+
+
+def _exprs() -> list[Expr]:
+    a = Expr(src="a", is_level=True)
+    b = Expr(src="b", is_level=True)
+    c = Expr(src="c", is_level=True)
+    return [a, b, a + b, a + c - b, a * 2, a]
+
+
+@pytest.mark.parametrize(
+    ("exprs", "unit"),
+    [
+        ("not_a_list", "MW"),
+        (["not_an_expr"], "MW"),
+        ([Mock(Expr)], 100.0),
+    ],
+)
+def test_get_level_values_with_invalid_params_raises_type_error(exprs, unit):
+    with pytest.raises(TypeError):
+        get_level_values(exprs, Mock(QueryDB), unit, Mock(SinglePeriodTimeIndex), Mock(FixedFrequencyTimeIndex), True)
+
+
+def test_get_level_values_matches_get_level_value():
+    model = _model()
+    exprs = _exprs()
+
+    values = get_level_values(exprs, model, "MW", _model_year(), _profile_time_index(), True)
+
+    expected = [get_level_value(expr, model, "MW", _model_year(), _profile_time_index(), True) for expr in exprs]
+    assert isinstance(values, np.ndarray)
+    assert values.tolist() == pytest.approx(expected)
+    assert values.tolist() == pytest.approx([100.0, 2000.0, 2100.0, -1850.0, 200.0, 100.0])
+
+
+def test_get_level_values_with_empty_list():
+    values = get_level_values([], _model(), "MW", _model_year(), _profile_time_index(), True)
+    assert values.shape == (0,)
+
+
+def test_get_level_values_uses_and_fills_cache():
+    db = CacheDB(_model())
+    db.set_min_elapsed_seconds(0.0)
+    exprs = _exprs()
+
+    first = get_level_values(exprs, db, "MW", _model_year(), _profile_time_index(), True)
+    for expr, value in zip(exprs, first, strict=True):
+        cache_key = ("_get_constant_from_expr", expr, "MW", _model_year(), _profile_time_index(), True)
+        assert db.has_key(cache_key)
+        assert db.get(cache_key) == value
+
+    second = get_level_values(exprs, db, "MW", _model_year(), _profile_time_index(), True)
+    assert np.array_equal(first, second)
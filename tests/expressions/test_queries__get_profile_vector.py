@@ -1,10 +1,11 @@
 from datetime import timedelta
 from unittest.mock import Mock
 
+import numpy as np
 import pytest
 
 from framcore import Model
-from framcore.expressions import Expr, get_profile_vector
+from framcore.expressions import Expr, get_profile_vector, queries
 from framcore.querydbs import ModelDB, QueryDB
 from framcore.timeindexes import FixedFrequencyTimeIndex, ModelYear, ProfileTimeIndex, SinglePeriodTimeIndex, TimeIndex
 from framcore.timevectors import ConstantTimeVector
@@ -206,3 +207,99 @@ def test_get_profile_vector_expr_with_non_profile_leaf_raises_value_error():
             scen_dim=_profile_time_index(),
             is_zero_one=True,
         )
+
+
+def _weighted_profile_sum_expr(model: Model) -> Expr:
+    data = model.get_data()
+    data["profile_tv_1"] = _profile_timevector(scalar=0.2, unit=None)
+    data["profile_tv_2"] = _profile_timevector(scalar=0.4, unit=None)
+    data["profile_tv_3"] = _profile_timevector(scalar=0.8, unit=None)
+
+    expr_1 = Expr(src="profile_tv_1", is_profile=True)
+    expr_2 = Expr(src="profile_tv_2", is_profile=True)
+    expr_3 = Expr(src="profile_tv_3", is_profile=True)
+    data["scaled_expr_3"] = 2 * expr_3
+
+    # profile_tv_1 appears twice, and the last term has nested weights
+    return Expr.weighted_sum([expr_1, expr_2, expr_1], [1.0, 2.0, 0.5]) + 3 * Expr(src="scaled_expr_3", is_profile=True)
+
+
+def test_get_profile_vector_weighted_sum_expr():
+    model = Model()
+    expr = _weighted_profile_sum_expr(model)
+
+    profile_vector = get_profile_vector(
+        expr,
+        ModelDB(model),
+        data_dim=_model_year(),
+        scen_dim=_profile_time_index(),
+        is_zero_one=True,
+    )
+
+    assert np.allclose(profile_vector, 1.5 * 0.2 + 2.0 * 0.4 + 3.0 * 2.0 * 0.8)
+
+
+def test_get_profile_vector_weighted_sum_expr_in_blocks_gives_same_result(monkeypatch: pytest.MonkeyPatch):
+    model = Model()
+    expr = _weighted_profile_sum_expr(model)
+    query_db = ModelDB(model)
+    scen_dim = _profile_time_index()
+
+    expected = get_profile_vector(expr, query_db, data_dim=_model_year(), scen_dim=scen_dim, is_zero_one=True)
+
+    # room for one profile vector per block
+    monkeypatch.setattr(queries, "_MAX_PROFILE_MATRIX_BYTES", scen_dim.get_num_periods() * 8)
+    profile_vector = get_profile_vector(expr, query_db, data_dim=_model_year(), scen_dim=scen_dim, is_zero_one=True)
+
+    assert np.allclose(profile_vector, expected)
+
+
+def test_get_profile_vector_returns_read_only_vector_unless_copy():
+    model = Model()
+    data = model.get_data()
+    data["profile_tv"] = _profile_timevector(scalar=0.25, unit=None)
+    expr = Expr(src="profile_tv", is_profile=True)
+    query_db = ModelDB(model)
+
+    for profile_expr in [expr, 2 * expr]:
+        profile_vector = get_profile_vector(profile_expr, query_db, data_dim=_model_year(), scen_dim=_profile_time_index(), is_zero_one=True)
+        assert not profile_vector.flags.writeable
+        with pytest.raises(ValueError, match="read-only"):
+            profile_vector[:] = -1.0
+
+    profile_vector = get_profile_vector(expr, query_db, data_dim=_model_year(), scen_dim=_profile_time_index(), is_zero_one=True, copy=True)
+    assert profile_vector.flags.writeable
+    profile_vector[:] = -1.0
+
+    profile_vector = get_profile_vector(expr, query_db, data_dim=_model_year(), scen_dim=_profile_time_index(), is_zero_one=True)
+    assert np.allclose(profile_vector, 0.25)
+
+
+def test_get_profile_vector_with_out_writes_into_out():
+    model = Model()
+    expr = _weighted_profile_sum_expr(model)
+    query_db = ModelDB(model)
+    scen_dim = _profile_time_index()
+    matrix = np.full((2, scen_dim.get_num_periods()), -1.0, dtype=np.float32)
+
+    for row, profile_expr in zip(matrix, [expr, Expr(src="profile_tv_1", is_profile=True)], strict=True):
+        result = get_profile_vector(profile_expr, query_db, data_dim=_model_year(), scen_dim=scen_dim, is_zero_one=True, out=row)
+        assert result is row
+
+    assert np.allclose(matrix[0], 1.5 * 0.2 + 2.0 * 0.4 + 3.0 * 2.0 * 0.8)
+    assert np.allclose(matrix[1], 0.2)
+
+
+def test_get_profile_vector_with_out_of_wrong_shape_raises_value_error():
+    model = Model()
+    model.get_data()["profile_tv"] = _profile_timevector(scalar=0.25, unit=None)
+
+    with pytest.raises(ValueError, match="shape"):
+        get_profile_vector(
+            Expr(src="profile_tv", is_profile=True),
+            ModelDB(model),
+            data_dim=_model_year(),
+            scen_dim=_profile_time_index(),
+            is_zero_one=True,
+            out=np.zeros(3),
+        )
@@ -1,9 +1,17 @@
+import importlib
+from datetime import timedelta
 from unittest.mock import Mock
 
+import numpy as np
 import pytest
 
 from framcore import Model
+from framcore.expressions import Expr, get_level_value
 from framcore.querydbs import CacheDB
+from framcore.timeindexes import ModelYear, ProfileTimeIndex
+from framcore.timevectors import ConstantTimeVector
+
+cache_db_module = importlib.import_module("framcore.querydbs.CacheDB")
 
 
 def _mock_model():
@@ -136,3 +144,148 @@ def test_get_data_returns_primary_model_data():
     data = db.get_data()
 
     assert data == {"key1": "primary_value"}
+
+
+def test_max_bytes_setting():
+    db = CacheDB(_mock_model())
+    assert db.get_max_bytes() is None
+
+    db.set_max_bytes(1000)
+
+    assert db.get_max_bytes() == 1000
+
+
+def test_set_max_bytes_negative_value_raises_value_error():
+    db = CacheDB(_mock_model())
+
+    with pytest.raises(ValueError, match=r".+"):
+        db.set_max_bytes(-1)
+
+
+def test_num_bytes_accounts_array_nbytes_and_nominal_size_for_scalars():
+    db = CacheDB(_mock_model())
+
+    db.put(key="vector", value=np.zeros(100), elapsed_seconds=1.0)
+    db.put(key="scalar", value=1.0, elapsed_seconds=1.0)
+
+    assert db.get_num_values() == 2
+    assert db.get_num_bytes() == 800 + cache_db_module._NOMINAL_VALUE_BYTES
+
+    db.put(key="vector", value=np.zeros(10), elapsed_seconds=1.0)
+    assert db.get_num_bytes() == 80 + cache_db_module._NOMINAL_VALUE_BYTES
+
+    db.clear()
+    assert db.get_num_values() == 0
+    assert db.get_num_bytes() == 0
+
+
+def test_put_evicts_value_with_lowest_cost_per_byte_when_over_budget():
+    db = CacheDB(_mock_model())
+    db.set_max_bytes(2000)
+
+    db.put(key="cheap", value=np.zeros(100), elapsed_seconds=0.1)
+    db.put(key="expensive", value=np.zeros(100), elapsed_seconds=10.0)
+    db.put(key="new", value=np.zeros(100), elapsed_seconds=1.0)
+
+    assert db.has_key("expensive") is True
+    assert db.has_key("new") is True
+    assert db.has_key("cheap") is False
+    assert db.get_num_bytes() <= 2000
+
+
+def test_get_protects_recently_used_values_from_eviction():
+    db = CacheDB(_mock_model())
+    db.set_max_bytes(1600)
+
+    db.put(key="a", value=np.zeros(100), elapsed_seconds=1.0)
+    db.put(key="b", value=np.zeros(100), elapsed_seconds=1.0)
+    db.put(key="c", value=np.zeros(100), elapsed_seconds=1.0)  # evicts a
+    db.get("b")
+    db.put(key="d", value=np.zeros(100), elapsed_seconds=1.0)  # evicts c, since b was used after c was put
+
+    assert db.has_key("a") is False
+    assert db.has_key("b") is True
+    assert db.has_key("c") is False
+    assert db.has_key("d") is True
+
+
+def test_put_does_not_cache_value_larger_than_budget():
+    db = CacheDB(_mock_model())
+    db.set_max_bytes(100)
+
+    db.put(key="small", value=1.0, elapsed_seconds=1.0)
+    db.put(key="large", value=np.zeros(100), elapsed_seconds=1.0)
+
+    assert db.has_key("small") is True
+    assert db.has_key("large") is False
+
+
+def test_set_max_bytes_evicts_values():
+    db = CacheDB(_mock_model())
+    for i in range(10):
+        db.put(key=i, value=np.zeros(10), elapsed_seconds=1.0)
+
+    db.set_max_bytes(400)
+
+    assert db.get_num_values() == 5
+    assert db.get_num_bytes() == 400
+
+
+def _level_value(db: CacheDB, src: str) -> float:
+    scen_dim = ProfileTimeIndex(1981, 2, timedelta(weeks=1), is_52_week_years=True)
+    return get_level_value(Expr(src=src, is_level=True), db, "MW", ModelYear(2025), scen_dim, is_max=True)
+
+
+def test_changed_model_data_invalidates_only_dependent_values():
+    model = Model()
+    data = model.get_data()
+    data["a"] = ConstantTimeVector(1.0, unit="MW", is_max_level=True)
+    data["b"] = ConstantTimeVector(2.0, unit="MW", is_max_level=True)
+    data["c"] = ConstantTimeVector(3.0, unit="MW", is_max_level=True)
+    data["a_plus_b"] = Expr(src="a", is_level=True) + Expr(src="b", is_level=True)
+    db = CacheDB(model)
+    db.set_min_elapsed_seconds(0.0)
+
+    assert _level_value(db, "a_plus_b") == pytest.approx(3.0)
+    assert _level_value(db, "c") == pytest.approx(3.0)
+    assert db.get_num_values() == 2
+    assert {"a", "b", "a_plus_b"} <= next(d for d in map(db.get_dependencies, db._cache) if "a" in d)
+
+    data["b"] = ConstantTimeVector(5.0, unit="MW", is_max_level=True)
+    assert db.get_num_values() == 1
+    assert _level_value(db, "a_plus_b") == pytest.approx(6.0)
+
+    del data["c"]
+    assert db.get_num_values() == 1
+    with pytest.raises(KeyError):
+        _level_value(db, "c")
+
+
+def test_put_without_cache_miss_depends_on_all_model_keys():
+    model = Model()
+    model.get_data()["a"] = ConstantTimeVector(1.0, unit="MW", is_max_level=True)
+    db = CacheDB(model)
+    db.set_min_elapsed_seconds(0.0)
+    db.put(("value",), 1.0, elapsed_seconds=1.0)
+    assert db.get_dependencies(("value",)) is None
+
+    model.get_data()["unrelated"] = ConstantTimeVector(2.0, unit="MW", is_max_level=True)
+    assert not db.has_key(("value",))
+    assert db.get_num_bytes() == 0
+
+
+def test_failed_computation_does_not_leave_key_being_computed():
+    model = Model()
+    data = model.get_data()
+    data["a"] = ConstantTimeVector(1.0, unit="MW", is_max_level=True)
+    data["broken"] = Expr(src="a", is_level=True) + Expr(src="missing", is_level=True)
+    db = CacheDB(model)
+    db.set_min_elapsed_seconds(0.0)
+
+    for __ in range(3):
+        with pytest.raises(KeyError):
+            _level_value(db, "broken")
+
+    assert db._computing == {}
+    assert _level_value(db, "a") == pytest.approx(1.0)
+    assert db.get_dependencies(next(iter(db._cache))) == {"a"}
@@ -0,0 +1,151 @@
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from framcore import Model
+from framcore.expressions import Expr, get_level_value, get_profile_vector, queries
+from framcore.querydbs import PersistentCacheDB, _digests
+from framcore.timeindexes import ModelYear, ProfileTimeIndex
+from framcore.timevectors import ConstantTimeVector, ListTimeVector, ReferencePeriod
+
+
+def _model(capacity: float = 100.0) -> Model:
+    model = Model()
+    data = model.get_data()
+    data["capacity"] = ConstantTimeVector(capacity, unit="MW", is_max_level=True)
+    data["extra"] = ConstantTimeVector(1.0, unit="GW", is_max_level=True)
+    data["total"] = Expr(src="capacity", is_level=True) + Expr(src="extra", is_level=True)
+    data["profile"] = ConstantTimeVector(0.5, is_zero_one_profile=True)
+    return model
+
+
+def _db(path: Path, model: Model) -> PersistentCacheDB:
+    db = PersistentCacheDB(path, model)
+    db.set_min_elapsed_seconds(0.0)
+    return db
+
+
+def _level_value(db: PersistentCacheDB) -> float:
+    scen_dim = ProfileTimeIndex(1981, 2, timedelta(weeks=1), is_52_week_years=True)
+    return get_level_value(Expr(src="total", is_level=True), db, "MW", ModelYear(2025), scen_dim, is_max=True)
+
+
+def _profile_vector(db: PersistentCacheDB) -> np.ndarray:
+    scen_dim = ProfileTimeIndex(1981, 2, timedelta(weeks=1), is_52_week_years=True)
+    return get_profile_vector(Expr(src="profile", is_profile=True), db, ModelYear(2025), scen_dim, is_zero_one=True)
+
+
+def _fail(*args: object, **kwargs: object) -> None:
+    message = "Value should be found in PersistentCacheDB"
+    raise AssertionError(message)
+
+
+def test_values_are_found_by_new_db_with_same_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    assert _level_value(_db(tmp_path, _model())) == pytest.approx(1100.0)
+    vector = _profile_vector(_db(tmp_path, _model())).copy()
+
+    monkeypatch.setattr(queries, "_get_constant_from_expr", _fail)
+    monkeypatch.setattr(queries, "_get_profile_vector_from_timevector", _fail)
+
+    db = _db(tmp_path, _model())
+    assert _level_value(db) == pytest.approx(1100.0)
+    stored_vector = _profile_vector(db)
+    assert isinstance(stored_vector, np.memmap)
+    assert not stored_vector.flags.writeable
+    assert stored_vector.dtype == vector.dtype
+    assert np.array_equal(stored_vector, vector)
+
+
+def test_changed_referenced_data_gives_new_entry(tmp_path: Path):
+    assert _level_value(_db(tmp_path, _model(capacity=100.0))) == pytest.approx(1100.0)
+
+    assert _level_value(_db(tmp_path, _model(capacity=200.0))) == pytest.approx(1200.0)
+    assert _level_value(_db(tmp_path, _model(capacity=100.0))) == pytest.approx(1100.0)
+
+
+def test_key_without_fingerprint_is_only_cached_in_memory(tmp_path: Path):
+    db = _db(tmp_path, _model())
+    key = ("some_query", object())
+
+    db.put(key, 1.0, elapsed_seconds=1.0)
+
+    assert db.get(key) == 1.0
+    assert not (tmp_path / "index.jsonl").exists()
+    assert not _db(tmp_path, _model()).has_key(key)
+
+
+def test_scalar_key_is_stored_in_index(tmp_path: Path):
+    db = _db(tmp_path, _model())
+    key = ("some_query", "a", 2, None)
+
+    db.put(key, 3.5, elapsed_seconds=1.0)
+
+    assert _db(tmp_path, _model()).get(key) == 3.5
+
+
+def test_data_keys_are_found_in_models(tmp_path: Path):
+    model = _model()
+    db = _db(tmp_path, model)
+
+    assert db.has_key("capacity")
+    assert db.get("capacity") is model.get_data()["capacity"]
+    assert not db.has_key("missing")
+    with pytest.raises(KeyError):
+        db.get("missing")
+
+
+def test_changed_model_data_is_seen_by_same_db(tmp_path: Path):
+    model = _model()
+    db = _db(tmp_path, model)
+    assert _level_value(db) == pytest.approx(1100.0)
+    model.get_data()["capacity"] = ConstantTimeVector(200.0, unit="MW", is_max_level=True)
+    assert _level_value(db) == pytest.approx(1200.0)
+
+
+def test_changed_reference_period_gives_new_entry(tmp_path: Path):
+    scen_dim = ProfileTimeIndex(1981, 2, timedelta(weeks=1), is_52_week_years=True)
+    profile_vector = np.repeat([1.5, 0.5], scen_dim.get_num_periods() // 2)
+    profile = ListTimeVector(scen_dim, profile_vector, None, is_max_level=None, is_zero_one_profile=False, reference_period=ReferencePeriod(1981, 2))
+    expr = Expr(src="capacity", is_level=True, profile=Expr(src="profile", is_profile=True))
+
+    def level_value(reference_period: ReferencePeriod) -> float:
+        model = _model()
+        data = model.get_data()
+        level = ListTimeVector(ModelYear(2025), np.array([100.0]), "MW", is_max_level=False, is_zero_one_profile=None, reference_period=reference_period)
+        data["capacity"] = level
+        data["profile"] = profile
+        return get_level_value(expr, _db(tmp_path, model), "MW", ModelYear(2025), scen_dim, is_max=False)
+
+    first = level_value(ReferencePeriod(1981, 1))
+    second = level_value(ReferencePeriod(1982, 1))
+
+    assert second != pytest.approx(first)
+    assert level_value(ReferencePeriod(1982, 1)) == pytest.approx(second)
+
+
+def test_values_in_memory_are_within_byte_budget(tmp_path: Path):
+    db = _db(tmp_path, _model())
+    db.set_max_bytes(100)
+
+    db.put(("vector", 1), np.zeros(10), elapsed_seconds=1.0)
+    db.put(("vector", 2), np.zeros(10), elapsed_seconds=2.0)
+
+    assert db.get_num_bytes() <= 100
+    assert db.get_num_values() == 1
+    assert np.array_equal(db.get(("vector", 1)), np.zeros(10))
+    assert db.get_num_bytes() <= 100
+
+
+def test_memoized_digests_are_bounded_with_least_recently_used_removed_first(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(_digests, "_MAX_NUM_DIGESTS", 3)
+    digester = _digests._KeyDigester((_model(),), salt=1)
+    digest = digester.get_digest(("some_query", 0))
+
+    for key in [("some_query", 1), ("some_query", 2), ("some_query", 0), ("some_query", 3)]:
+        digester.get_digest(key)
+
+    assert list(digester._digests) == [("some_query", 2), ("some_query", 0), ("some_query", 3)]
+    assert digester.get_digest(("some_query", 1)) is not None
+    assert digester.get_digest(("some_query", 0)) == digest
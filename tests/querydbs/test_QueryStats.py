@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+
+from framcore import Model
+from framcore.expressions import Expr, get_level_value, units
+from framcore.querydbs import CacheDB, ModelDB, QueryStats
+from framcore.timeindexes import ModelYear, ProfileTimeIndex
+from framcore.timevectors import ConstantTimeVector
+
+
+def test_init_with_negative_max_slowest_raises_value_error():
+    with pytest.raises(ValueError):  # noqa: PT011
+        QueryStats(max_slowest=-1)
+
+
+def test_record_path_keeps_count_seconds_and_slowest_exprs():
+    stats = QueryStats(max_slowest=2)
+
+    for seconds, expr in [(0.1, "a"), (0.3, "b"), (0.2, "c"), (0.05, "d")]:
+        stats.record_path("sum", seconds, expr)
+
+    snapshot = stats.get_snapshot()
+    assert snapshot["paths"]["sum"]["count"] == 4
+    assert snapshot["paths"]["sum"]["seconds"] == pytest.approx(0.65)
+    assert snapshot["paths"]["sum"]["slowest"] == [(0.3, "b"), (0.2, "c")]
+
+
+def test_snapshot_is_not_changed_by_later_records_and_reset():
+    stats = QueryStats()
+    stats.record_cache_hit("x")
+    stats.record_cache_miss("x")
+    stats.record_unit_fastpath_miss("MW", "GW")
+
+    snapshot = stats.get_snapshot()
+    stats.record_cache_hit("x")
+    stats.reset()
+
+    assert snapshot["cache_hits"] == {"x": 1}
+    assert snapshot["cache_misses"] == {"x": 1}
+    assert snapshot["unit_fastpath_misses"] == {("MW", "GW"): 1}
+    assert stats.get_snapshot() == {"paths": {}, "cache_hits": {}, "cache_misses": {}, "unit_fastpath_misses": {}}
+
+
+def test_set_stats_with_wrong_type_raises_type_error():
+    db = ModelDB(Model())
+    with pytest.raises(TypeError):
+        db.set_stats("not_stats")
+
+
+def test_queries_record_paths_cache_lookups_and_unit_fastpath_misses(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(units, "_FASTPATH_CONVERSION_FACTORS", dict())
+
+    model = Model()
+    data = model.get_data()
+    data["stats_a"] = ConstantTimeVector(1.0, unit="GW", is_max_level=True)
+    data["stats_b"] = ConstantTimeVector(500.0, unit="MW", is_max_level=True)
+    expr = Expr(src="stats_a", is_level=True) + Expr(src="stats_b", is_level=True)
+
+    db = CacheDB(model)
+    db.set_min_elapsed_seconds(0.0)
+    stats = QueryStats()
+    db.set_stats(stats)
+    assert db.get_stats() is stats
+
+    scen_dim = ProfileTimeIndex(1981, 10, timedelta(days=1), is_52_week_years=True)
+    for __ in range(2):
+        assert get_level_value(expr, db, "MW", ModelYear(2025), scen_dim, is_max=True) == pytest.approx(1500.0)
+
+    snapshot = stats.get_snapshot()
+    assert snapshot["paths"]["sum"]["count"] == 1
+    assert snapshot["paths"]["sum"]["slowest"][0][1] == expr
+    assert snapshot["cache_hits"]["_get_constant_from_expr"] == 1
+    assert snapshot["cache_misses"]["_get_constant_from_expr"] == 1
+    assert ("GW", "MW") in snapshot["unit_fastpath_misses"]
@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+import sys
+from datetime import timedelta
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from framcore import Model
+from framcore.expressions import Expr, get_profile_vector
+from framcore.querydbs import SharedMemoryCacheDB
+from framcore.timeindexes import ModelYear, ProfileTimeIndex
+from framcore.timevectors import ConstantTimeVector
+
+requires_fork = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="requires fork")
+
+
+def _model() -> Model:
+    model = Model()
+    model.get_data()["profile"] = ConstantTimeVector(0.5, is_zero_one_profile=True)
+    return model
+
+
+def _db(model: Model, max_shared_values: int = 16) -> SharedMemoryCacheDB:
+    db = SharedMemoryCacheDB(model, max_shared_values=max_shared_values)
+    db.set_min_elapsed_seconds(0.0)
+    return db
+
+
+def _profile_vector(db: SharedMemoryCacheDB) -> np.ndarray:
+    scen_dim = ProfileTimeIndex(1981, 2, timedelta(weeks=1), is_52_week_years=True)
+    return get_profile_vector(Expr(src="profile", is_profile=True), db, ModelYear(2025), scen_dim, is_zero_one=True)
+
+
+def _run_in_forked_process(target: object) -> None:
+    process = multiprocessing.get_context("fork").Process(target=target)
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+
+
+@requires_fork
+def test_array_computed_in_forked_process_is_mapped_by_other_processes():
+    db = _db(_model())
+    try:
+        _run_in_forked_process(lambda: _profile_vector(db))
+        assert db.get_num_shared_values() == 1
+        assert db.get_num_values() == 0
+
+        vector = _profile_vector(db)
+        assert not vector.flags.writeable
+        assert np.allclose(vector, 0.5)
+        assert db.get_num_values() == 1
+    finally:
+        db.close()
+
+
+def test_close_removes_shared_segments():
+    db = _db(_model())
+    vector = _profile_vector(db).copy()
+    assert db.get_num_shared_values() == 1
+    name = next(iter(db._segments))
+
+    db.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+    assert np.allclose(vector, 0.5)
+
+
+def test_values_that_are_not_arrays_are_only_cached_locally():
+    db = _db(_model())
+    try:
+        db.put(("value",), 1.0, elapsed_seconds=1.0)
+        assert db.has_key(("value",))
+        assert db.get_num_shared_values() == 0
+    finally:
+        db.close()
+
+
+def test_arrays_are_not_shared_when_index_is_full():
+    db = _db(_model(), max_shared_values=1)
+    try:
+        db.put(("a",), np.zeros(3), elapsed_seconds=1.0)
+        db.put(("b",), np.ones(3), elapsed_seconds=1.0)
+        assert db.get_num_shared_values() == 1
+        assert db.get_num_values() == 2
+    finally:
+        db.close()
+
+
+@requires_fork
+def test_slot_left_writing_by_dead_process_is_reclaimed(monkeypatch: pytest.MonkeyPatch):
+    module = sys.modules[SharedMemoryCacheDB.__module__]
+    db = _db(_model())
+    key = ("a",)
+
+    def die_while_writing() -> None:
+        create_segment = module.SharedMemory
+
+        def create_segment_and_die(*args: object, **kwargs: object) -> None:
+            create_segment(*args, **kwargs)
+            os._exit(0)
+
+        monkeypatch.setattr(module, "SharedMemory", create_segment_and_die)
+        db.put(key, np.zeros(3), elapsed_seconds=1.0)
+
+    try:
+        _run_in_forked_process(die_while_writing)
+        assert db.get_num_shared_values() == 0
+
+        db.put(key, np.ones(3), elapsed_seconds=1.0)
+        assert db.get_num_shared_values() == 1
+        name = next(iter(db._segments))
+        assert np.array_equal(np.ndarray((3,), dtype=np.float64, buffer=db._segments[name].buf), np.ones(3))
+    finally:
+        db.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
@@ -1,3 +1,4 @@
+import copy
 from unittest.mock import Mock
 
 import pytest
@@ -70,3 +71,37 @@ def test_disaggregate():
 
     # After disaggregation, the aggregators list should be empty
     assert len(model._aggregators) == 0
+
+
+def test_model_dict_notifies_listeners_of_changed_keys():
+    model = Model()
+    data = model.get_data()
+    changes = []
+    listener = changes.append
+    data.add_listener(listener)
+
+    data["a"] = Mock(Expr)
+    data.update({"b": Mock(Expr), "c": Mock(Expr)})
+    del data["a"]
+    data.pop("b")
+    data.pop("missing", None)
+    data.setdefault("c", Mock(Expr))
+    data.clear()
+    assert changes == [["a"], ["b", "c"], ["a"], ["b"], ["c"]]
+
+    data.remove_listener(listener)
+    data["d"] = Mock(Expr)
+    assert len(changes) == 5
+
+
+def test_model_dict_listeners_are_not_copied():
+    model = Model()
+    model.get_data()["expr"] = Expr("x")
+    changes = []
+    model.get_data().add_listener(changes.append)
+
+    copied = copy.deepcopy(model)
+    copied.get_data()["other"] = Expr("y")
+
+    assert list(copied.get_data()) == ["expr", "other"]
+    assert changes == []
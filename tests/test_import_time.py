@@ -0,0 +1,29 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# Import time budget for framcore. Short-lived worker processes and CLI tools pay this on every start.
+_IMPORT_TIME_BUDGET_SECONDS = 1.0
+
+_ROOT = Path(__file__).parents[1]
+
+
+def _run_python(code: str) -> str:
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=_ROOT)
+    return result.stdout.strip()
+
+
+def test_import_framcore_does_not_import_sympy_or_juliacall():
+    code = "import sys, framcore, framcore.juliamodels; print(sorted(m for m in ('sympy', 'juliacall') if m in sys.modules))"
+    assert _run_python(code) == "[]"
+
+
+def test_import_juliamodels_does_not_set_environment_variables():
+    code = "import os; before = dict(os.environ); import framcore.juliamodels; print(dict(os.environ) == before)"
+    assert _run_python(code) == "True"
+
+
+def test_import_framcore_within_budget():
+    code = "import time; t = time.perf_counter(); import framcore; print(time.perf_counter() - t)"
+    elapsed_seconds = min(float(_run_python(code)) for __ in range(3))
+    assert elapsed_seconds < _IMPORT_TIME_BUDGET_SECONDS
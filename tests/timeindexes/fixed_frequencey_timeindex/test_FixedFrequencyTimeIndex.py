@@ -651,3 +651,55 @@ def test_get_datetime_list_52_week_years(start_time: datetime, period_duration:
     datetime_list = index.get_datetime_list()
 
     assert np.array_equal(datetime_list, np.array(expected_datetimes))
+
+
+@pytest.mark.parametrize(
+    ("is_52_week_years", "start_time", "period_duration", "num_periods"),
+    [
+        (False, datetime.fromisocalendar(2020, 50, 1), timedelta(days=3), 10),  # contains week 53
+        (True, datetime.fromisocalendar(2020, 50, 1), timedelta(days=3), 10),  # contains week 53
+        (False, datetime.fromisocalendar(2020, 45, 3) + timedelta(hours=5), timedelta(hours=7), 40),  # before first point
+        (True, datetime.fromisocalendar(2021, 3, 1), timedelta(days=2), 20),  # after last point
+        (False, datetime.fromisocalendar(2020, 51, 2), timedelta(weeks=1), 1),
+    ],
+)
+def test_get_period_averages_from_cumulative_integral_equals_write_into_fixed_frequency(
+    is_52_week_years: bool,
+    start_time: datetime,
+    period_duration: timedelta,
+    num_periods: int,
+):
+    index = FixedFrequencyTimeIndex(
+        start_time=datetime.fromisocalendar(2020, 48, 1),
+        period_duration=timedelta(days=1),
+        num_periods=50,
+        is_52_week_years=is_52_week_years,
+        extrapolate_first_point=True,
+        extrapolate_last_point=True,
+    )
+    vector = np.random.default_rng(0).random(50)
+    target_index = FixedFrequencyTimeIndex(start_time, period_duration, num_periods, is_52_week_years, True, True)
+    expected = np.zeros(num_periods)
+    index.write_into_fixed_frequency(expected, target_index, vector)
+
+    cumulative_integral = index.get_cumulative_integral(vector)
+    averages = index.get_period_averages_from_cumulative_integral(cumulative_integral, start_time, period_duration, num_periods, is_52_week_years)
+
+    assert np.allclose(averages, expected)
+
+
+def test_get_period_averages_from_cumulative_integral_returns_none_when_not_possible():
+    index = FixedFrequencyTimeIndex(
+        start_time=datetime.fromisocalendar(2021, 1, 1),
+        period_duration=timedelta(weeks=1),
+        num_periods=52,
+        is_52_week_years=True,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+    cumulative_integral = index.get_cumulative_integral(np.ones(52))
+    start_time = datetime.fromisocalendar(2021, 10, 1)
+
+    assert index.get_period_averages_from_cumulative_integral(cumulative_integral, start_time, timedelta(weeks=2), 1, is_52_week_years=False) is None
+    assert index.get_period_averages_from_cumulative_integral(cumulative_integral, start_time, timedelta(weeks=52), 1, is_52_week_years=True) is None
+    assert index.get_period_averages_from_cumulative_integral(cumulative_integral, start_time, timedelta(weeks=2), 1, is_52_week_years=True) == 1.0
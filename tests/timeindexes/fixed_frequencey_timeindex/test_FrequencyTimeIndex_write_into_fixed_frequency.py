@@ -2,6 +2,7 @@ import copy
 import datetime as dt
 
 import numpy as np
+import pytest
 
 from framcore.timeindexes import ConstantTimeIndex, FixedFrequencyTimeIndex, ModelYear, ProfileTimeIndex
 
@@ -286,3 +287,174 @@ def test_when_time_index_is_one_year_and_52_week_years_should_repeat_data_to_tar
     # The target vector should contain values repeated for each year from the input vector.
     expected_vector = np.tile(input_vector, 3)
     assert np.array_equal(target_vector, expected_vector), "Target vector should contain repeated values for each year from the input vector."
+
+
+def test_when_time_indexes_only_differ_in_extrapolation_flags_should_copy_input_vector():
+    base_index = FixedFrequencyTimeIndex(
+        start_time=dt.datetime.fromisocalendar(2020, 1, 1),
+        period_duration=dt.timedelta(hours=1),
+        num_periods=10,
+        is_52_week_years=False,
+        extrapolate_first_point=True,
+        extrapolate_last_point=True,
+    )
+    target_index = base_index.copy_with(extrapolate_first_point=False, extrapolate_last_point=False)
+    target_vector = np.zeros(10, dtype=np.float32)
+    input_vector = np.arange(1, 11, dtype=np.float32)
+
+    base_index.write_into_fixed_frequency(
+        target_vector=target_vector,
+        target_timeindex=target_index,
+        input_vector=input_vector,
+    )
+
+    assert np.array_equal(target_vector, input_vector)
+
+
+def test_when_start_times_are_not_aligned_should_average_input_values_weighted_by_overlap():
+    base_index = FixedFrequencyTimeIndex(
+        start_time=dt.datetime.fromisocalendar(2020, 1, 1),
+        period_duration=dt.timedelta(hours=1),
+        num_periods=4,
+        is_52_week_years=False,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+    target_index = base_index.copy_with(
+        start_time=dt.datetime.fromisocalendar(2020, 1, 1) + dt.timedelta(seconds=7),
+        period_duration=dt.timedelta(hours=2),
+        num_periods=1,
+    )
+    target_vector = np.zeros(1, dtype=np.float64)
+    input_vector = np.array([1, 2, 3, 4], dtype=np.float64)
+
+    base_index.write_into_fixed_frequency(
+        target_vector=target_vector,
+        target_timeindex=target_index,
+        input_vector=input_vector,
+    )
+
+    expected_value = ((3600 - 7) * 1 + 3600 * 2 + 7 * 3) / 7200
+    assert np.isclose(target_vector[0], expected_value)
+
+
+def test_when_start_times_are_not_aligned_and_target_is_52_week_years_should_skip_week_53_of_iso_weeks():
+    base_index = FixedFrequencyTimeIndex(
+        start_time=dt.datetime(2026, 12, 4, 4),  # friday
+        period_duration=dt.timedelta(weeks=1),
+        num_periods=8,
+        is_52_week_years=False,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+    target_index = base_index.copy_with(start_time=dt.datetime(2026, 12, 7, 4), num_periods=4, is_52_week_years=True)
+    target_vector = np.zeros(4, dtype=np.float64)
+    input_vector = np.arange(1, 9, dtype=np.float64)
+
+    base_index.write_into_fixed_frequency(target_vector=target_vector, target_timeindex=target_index, input_vector=input_vector)
+
+    # Target weeks overlap source weeks by 4 and 3 days. Week 53 (2026-12-28) of the source is skipped.
+    expected = [(4 * 1 + 3 * 2) / 7, (4 * 2 + 3 * 3) / 7, (4 * 3 + 3 * 4) / 7, (4 * 5 + 3 * 6) / 7]
+    assert np.allclose(target_vector, expected)
+
+
+def test_when_start_times_are_not_aligned_and_target_is_52_week_years_should_take_value_of_containing_week():
+    base_index = FixedFrequencyTimeIndex(
+        start_time=dt.datetime(2026, 12, 25, 17),
+        period_duration=dt.timedelta(weeks=1),
+        num_periods=4,
+        is_52_week_years=False,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+    target_index = base_index.copy_with(
+        start_time=dt.datetime(2026, 12, 25, 17, 15),
+        period_duration=dt.timedelta(hours=1),
+        num_periods=3,
+        is_52_week_years=True,
+    )
+    target_vector = np.zeros(3, dtype=np.float64)
+    input_vector = np.array([0.816, 0.2, 0.3, 0.4], dtype=np.float64)
+
+    base_index.write_into_fixed_frequency(target_vector=target_vector, target_timeindex=target_index, input_vector=input_vector)
+
+    assert np.allclose(target_vector, 0.816)
+
+
+def test_when_start_times_are_not_aligned_and_target_is_52_week_years_should_extrapolate_first_point():
+    base_index = FixedFrequencyTimeIndex(
+        start_time=dt.datetime(2020, 11, 12, 16),
+        period_duration=dt.timedelta(days=1),
+        num_periods=50,
+        is_52_week_years=False,
+        extrapolate_first_point=True,
+        extrapolate_last_point=False,
+    )
+    target_index = FixedFrequencyTimeIndex(
+        start_time=dt.datetime(2020, 11, 9, 15),
+        period_duration=dt.timedelta(hours=3),
+        num_periods=1,
+        is_52_week_years=True,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+    target_vector = np.zeros(1, dtype=np.float64)
+    input_vector = np.linspace(0.5, 1.0, 50)
+
+    base_index.write_into_fixed_frequency(target_vector=target_vector, target_timeindex=target_index, input_vector=input_vector)
+
+    assert np.allclose(target_vector, [0.5])
+
+
+def test_when_start_times_are_not_aligned_and_calendars_differ_should_not_disaggregate_to_seconds():
+    base_index = FixedFrequencyTimeIndex(
+        start_time=dt.datetime(2020, 1, 6),
+        period_duration=dt.timedelta(hours=1),
+        num_periods=5 * 8760,
+        is_52_week_years=False,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+    target_index = base_index.copy_with(
+        start_time=dt.datetime(2020, 1, 6, 0, 7, 13),
+        period_duration=dt.timedelta(weeks=1),
+        num_periods=200,
+        is_52_week_years=True,
+    )
+    input_vector = np.full(base_index.get_num_periods(), 0.5, dtype=np.float64)
+
+    __, transformed_vector = base_index._transform_to_same_period(target_index, input_vector)
+    target_vector = np.zeros(200, dtype=np.float64)
+    base_index.write_into_fixed_frequency(target_vector=target_vector, target_timeindex=target_index, input_vector=input_vector)
+
+    assert transformed_vector.size <= base_index.get_num_periods()
+    assert np.allclose(target_vector, 0.5)
+
+
+@pytest.mark.parametrize(
+    ("base_index", "target_index"),
+    [
+        (ProfileTimeIndex(1991, 3, dt.timedelta(hours=1), is_52_week_years=False), ProfileTimeIndex(1991, 3, dt.timedelta(hours=3), is_52_week_years=True)),
+        (ProfileTimeIndex(1991, 3, dt.timedelta(hours=168), is_52_week_years=True), ProfileTimeIndex(1991, 3, dt.timedelta(hours=24), is_52_week_years=False)),
+        (ProfileTimeIndex(1991, 1, dt.timedelta(hours=24), is_52_week_years=False), ProfileTimeIndex(1990, 5, dt.timedelta(hours=168), is_52_week_years=False)),
+    ],
+)
+def test_when_vectors_are_2d_should_write_each_row_as_a_1d_vector(base_index: ProfileTimeIndex, target_index: ProfileTimeIndex):
+    input_vectors = np.random.default_rng(seed=1).random((3, base_index.get_num_periods()), dtype=np.float32)
+    target_vectors = np.zeros((3, target_index.get_num_periods()), dtype=np.float32)
+
+    base_index.write_into_fixed_frequency(target_vectors, target_index, input_vectors)
+
+    for input_vector, target_vector in zip(input_vectors, target_vectors, strict=True):
+        expected = np.zeros(target_index.get_num_periods(), dtype=np.float32)
+        base_index.write_into_fixed_frequency(expected, target_index, input_vector)
+        assert np.array_equal(target_vector, expected)
+
+
+def test_when_vectors_have_different_number_of_rows_raise_exception():
+    base_index = ProfileTimeIndex(1991, 1, dt.timedelta(hours=168), is_52_week_years=True)
+    input_vectors = np.ones((2, base_index.get_num_periods()), dtype=np.float32)
+    target_vectors = np.zeros((3, base_index.get_num_periods()), dtype=np.float32)
+
+    with pytest.raises(ValueError, match="must only differ in the last axis"):
+        base_index.write_into_fixed_frequency(target_vectors, base_index, input_vectors)
@@ -635,6 +635,37 @@ def test_write_into_fixed_frequency_non_uniform_periods():
     np.testing.assert_array_equal(target_vector, np.array([5.0, 7.0, 7.0], dtype=np.float32))
 
 
+def test_write_into_fixed_frequency_2d_vectors():
+    datetime_list = [
+        datetime.fromisocalendar(2021, 1, 1),
+        datetime.fromisocalendar(2021, 2, 1),
+        datetime.fromisocalendar(2021, 4, 1),
+    ]
+
+    time_index = ListTimeIndex(
+        datetime_list=datetime_list,
+        is_52_week_years=False,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+
+    input_vector = np.array([[5.0, 7.0], [1.0, 2.0]], dtype=np.float32)
+    target_vector = np.zeros((2, 3), dtype=np.float32)
+
+    target_timeindex = FixedFrequencyTimeIndex(
+        start_time=datetime.fromisocalendar(2021, 1, 1),
+        period_duration=timedelta(weeks=1),
+        num_periods=3,
+        is_52_week_years=False,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+
+    time_index.write_into_fixed_frequency(target_vector, target_timeindex, input_vector)
+
+    np.testing.assert_array_equal(target_vector, np.array([[5.0, 7.0, 7.0], [1.0, 2.0, 2.0]], dtype=np.float32))
+
+
 def test_write_into_fixed_frequency_partial_overlap():
     datetime_list = [
         datetime.fromisocalendar(2021, 3, 1),
@@ -666,6 +697,106 @@ def test_write_into_fixed_frequency_partial_overlap():
     np.testing.assert_array_equal(target_vector, np.array([4.0, 4.0, 4.0, 8.0, 8.0], dtype=np.float32))
 
 
+def test_write_into_fixed_frequency_unaligned_target_in_other_calendar():
+    datetime_list = [
+        datetime.fromisocalendar(2021, 1, 1),
+        datetime.fromisocalendar(2021, 1, 1) + timedelta(minutes=1),
+        datetime.fromisocalendar(2021, 3, 1),
+    ]
+
+    time_index = ListTimeIndex(
+        datetime_list=datetime_list,
+        is_52_week_years=False,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+
+    input_vector = np.array([100.0, 1.0], dtype=np.float64)
+    target_vector = np.zeros(1, dtype=np.float64)
+
+    target_timeindex = FixedFrequencyTimeIndex(
+        start_time=datetime.fromisocalendar(2021, 1, 1) + timedelta(seconds=30),
+        period_duration=timedelta(weeks=1),
+        num_periods=1,
+        is_52_week_years=True,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+
+    time_index.write_into_fixed_frequency(target_vector, target_timeindex, input_vector)
+
+    week_seconds = 7 * 24 * 3600
+    np.testing.assert_allclose(target_vector, [(30 * 100.0 + (week_seconds - 30) * 1.0) / week_seconds])
+
+
+def test_write_into_fixed_frequency_unaligned_target_in_other_calendar_resamples_to_days_not_seconds(monkeypatch: pytest.MonkeyPatch):
+    datetime_list = [datetime.fromisocalendar(2020, 1, 1) + timedelta(days=7 * i) for i in range(5 * 52 + 1)]
+    time_index = ListTimeIndex(
+        datetime_list=datetime_list,
+        is_52_week_years=False,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+    target_timeindex = FixedFrequencyTimeIndex(
+        start_time=datetime.fromisocalendar(2020, 2, 1) + timedelta(minutes=7, seconds=13),
+        period_duration=timedelta(weeks=1),
+        num_periods=200,
+        is_52_week_years=True,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+    input_sizes = []
+    write_into_fixed_frequency = FixedFrequencyTimeIndex.write_into_fixed_frequency
+
+    def record_input_size(
+        self: FixedFrequencyTimeIndex,
+        target_vector: np.ndarray,
+        target_timeindex: FixedFrequencyTimeIndex,
+        input_vector: np.ndarray,
+    ) -> None:
+        input_sizes.append(input_vector.size)
+        write_into_fixed_frequency(self, target_vector, target_timeindex, input_vector)
+
+    monkeypatch.setattr(FixedFrequencyTimeIndex, "write_into_fixed_frequency", record_input_size)
+    target_vector = np.zeros(200, dtype=np.float64)
+    time_index.write_into_fixed_frequency(target_vector, target_timeindex, np.full(5 * 52, 2.0))
+
+    assert input_sizes == [7 * 5 * 52]
+    np.testing.assert_allclose(target_vector, 2.0)
+
+
+def test_write_into_fixed_frequency_52_week_years_skips_week_53():
+    datetime_list = [
+        datetime.fromisocalendar(2020, 52, 1),
+        datetime.fromisocalendar(2020, 52, 1) + timedelta(days=3),
+        datetime.fromisocalendar(2021, 2, 1),
+    ]
+
+    time_index = ListTimeIndex(
+        datetime_list=datetime_list,
+        is_52_week_years=True,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+
+    input_vector = np.array([2.0, 9.0], dtype=np.float64)
+    target_vector = np.zeros(2, dtype=np.float64)
+
+    target_timeindex = FixedFrequencyTimeIndex(
+        start_time=datetime.fromisocalendar(2020, 52, 1),
+        period_duration=timedelta(weeks=1),
+        num_periods=2,
+        is_52_week_years=True,
+        extrapolate_first_point=False,
+        extrapolate_last_point=False,
+    )
+
+    time_index.write_into_fixed_frequency(target_vector, target_timeindex, input_vector)
+
+    np.testing.assert_allclose(target_vector, [(3 * 2.0 + 4 * 9.0) / 7, 9.0])
+    np.testing.assert_array_equal(time_index._get_boundary_seconds(), np.array([0, 3, 14]) * 24 * 3600)
+
+
 @pytest.mark.parametrize(
     ("datetime_list", "extrapolate_first_point", "extrapolate_last_point", "expected_is_constant"),
     [
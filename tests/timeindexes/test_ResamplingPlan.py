@@ -0,0 +1,118 @@
+import datetime as dt
+import sys
+
+import numpy as np
+import pytest
+
+from framcore.timeindexes import (
+    ConstantTimeIndex,
+    FixedFrequencyTimeIndex,
+    ProfileTimeIndex,
+    ResamplingPlan,
+    clear_resampling_plans,
+    get_resampling_plan,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_plans():
+    clear_resampling_plans()
+    yield
+    clear_resampling_plans()
+
+
+@pytest.mark.parametrize(
+    ("source", "target"),
+    [
+        (
+            ProfileTimeIndex(1991, 30, dt.timedelta(hours=168), is_52_week_years=False),
+            ProfileTimeIndex(1991, 10, dt.timedelta(hours=168), is_52_week_years=True),
+        ),
+        (ProfileTimeIndex(1991, 30, dt.timedelta(hours=24), is_52_week_years=True), ProfileTimeIndex(2000, 10, dt.timedelta(hours=168), is_52_week_years=True)),
+        (ProfileTimeIndex(1991, 30, dt.timedelta(hours=168), is_52_week_years=True), ProfileTimeIndex(1995, 10, dt.timedelta(hours=24), is_52_week_years=True)),
+        (ProfileTimeIndex(1991, 1, dt.timedelta(hours=24), is_52_week_years=True), ProfileTimeIndex(1991, 5, dt.timedelta(hours=24), is_52_week_years=True)),
+        (ProfileTimeIndex(1991, 30, dt.timedelta(hours=1), is_52_week_years=False), ProfileTimeIndex(1991, 2, dt.timedelta(hours=3), is_52_week_years=True)),
+    ],
+)
+def test_plan_gives_same_result_as_write_into_fixed_frequency(source: ProfileTimeIndex, target: ProfileTimeIndex):
+    plan = source.create_resampling_plan(target)
+    assert plan is not None
+
+    input_vector = np.random.default_rng(seed=1).random(source.get_num_periods(), dtype=np.float32)
+    expected = np.zeros(target.get_num_periods(), dtype=np.float32)
+    source._write_into_fixed_frequency_recursive(expected, target, input_vector)
+    actual = np.zeros(target.get_num_periods(), dtype=np.float32)
+    plan.apply(input_vector, actual)
+
+    assert plan.get_num_periods() == target.get_num_periods()
+    assert np.array_equal(actual, expected)
+
+
+def test_plan_is_created_on_second_use_of_pair():
+    source = ProfileTimeIndex(1991, 30, dt.timedelta(hours=168), is_52_week_years=False)
+    target = ProfileTimeIndex(1991, 30, dt.timedelta(hours=168), is_52_week_years=True)
+
+    assert get_resampling_plan(source, target) is None
+    plan = get_resampling_plan(source, target)
+    assert isinstance(plan, ResamplingPlan)
+    assert get_resampling_plan(source, target) is plan
+
+    clear_resampling_plans()
+    assert get_resampling_plan(source, target) is None
+
+
+def test_plan_of_constant_timeindex_is_none():
+    source = ConstantTimeIndex()
+    target = ProfileTimeIndex(1991, 1, dt.timedelta(hours=168), is_52_week_years=True)
+
+    assert source.create_resampling_plan(target) is None
+
+
+def test_contiguous_indices_are_averaged_in_groups():
+    plan = ResamplingPlan(np.arange(2, 8), group_size=2)
+
+    target_vector = np.zeros(3)
+    plan.apply(np.arange(10, dtype=np.float64), target_vector)
+
+    assert plan.get_group_size() == 2
+    assert np.array_equal(plan.get_indices(), np.arange(2, 8))
+    assert np.array_equal(target_vector, [2.5, 4.5, 6.5])
+
+
+def test_2d_vectors_are_resampled_along_last_axis():
+    plan = ResamplingPlan(np.array([3, 2, 1, 0]), group_size=2)
+
+    target_vector = np.zeros((2, 2))
+    plan.apply(np.arange(8, dtype=np.float64).reshape(2, 4), target_vector)
+
+    assert np.array_equal(target_vector, [[2.5, 0.5], [6.5, 4.5]])
+
+
+def test_indices_must_fill_whole_groups():
+    with pytest.raises(ValueError, match="multiple of group_size"):
+        ResamplingPlan(np.arange(5), group_size=2)
+
+
+def test_no_plan_when_start_times_are_only_aligned_at_much_finer_resolution():
+    source = FixedFrequencyTimeIndex(dt.datetime(2020, 1, 6), dt.timedelta(hours=1), 5 * 8760, False, False, False)
+    target = FixedFrequencyTimeIndex(dt.datetime(2020, 1, 6, 0, 7, 13), dt.timedelta(weeks=1), 200, True, False, False)
+
+    assert source.create_resampling_plan(target) is None
+
+
+def test_plans_are_cached_within_byte_budget(monkeypatch: pytest.MonkeyPatch):
+    module = sys.modules[ResamplingPlan.__module__]
+    source = ProfileTimeIndex(1991, 30, dt.timedelta(hours=168), is_52_week_years=False)
+    targets = [
+        ProfileTimeIndex(1991, 30, dt.timedelta(hours=168), is_52_week_years=True),
+        ProfileTimeIndex(2000, 10, dt.timedelta(hours=168), is_52_week_years=True),
+    ]
+    plan_nbytes = source.create_resampling_plan(targets[0]).get_nbytes()
+    monkeypatch.setattr(module, "_MAX_NUM_PLAN_BYTES", plan_nbytes)
+
+    for target in targets:
+        get_resampling_plan(source, target)
+        assert get_resampling_plan(source, target) is not None
+
+    assert list(module._PLANS) == [(source, targets[1])]
+    assert sum(plan.get_nbytes() for plan in module._PLANS.values()) <= plan_nbytes
@@ -24,6 +24,15 @@ def test_when_aggrfunc_mean_should_mean_values():
     assert np.all(out_x == 1)
 
 
+def test_when_arrays_are_2d_should_mean_values_of_each_row():
+    in_x = np.arange(2 * 52 * 3, dtype=np.float32).reshape(2, 52 * 3)
+    out_x = np.zeros((2, 52), dtype=np.float32)
+
+    aggregate(in_x, out_x, is_aggfunc_sum=False)
+
+    assert np.array_equal(out_x, in_x.reshape(2, 52, 3).mean(axis=-1))
+
+
 def test_when_input_array_is_not_vector_raise_exception():
     in_x = np.ones((52, 168), dtype=np.float32)
     out_x = np.zeros(52, dtype=np.float32)
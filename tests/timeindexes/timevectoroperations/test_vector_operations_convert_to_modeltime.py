@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 import numpy as np
 import pytest
 
+import framcore.timeindexes._time_vector_operations as v_ops
 from framcore.timeindexes._time_vector_operations import convert_to_modeltime
 
 # Must be able to process timve vectors with any data resolution: yearly, monthly, weekly, two-week, daily, hourly, minute, 15-minutes etc.
@@ -262,3 +263,30 @@ def test_incompatible_period_duration_after_removing_53_week_data_raises_excepti
 
     with pytest.raises(ValueError, match="Incompatible period duration detected!"):
         convert_to_modeltime(input_vector, startdate=start_date, period_duration=period_duration)
+
+
+def test_when_period_is_not_aligned_with_week_53_should_average_overlapping_periods():
+    # Weekly periods starting on Thursday of week 52 2020. Removing week 53 leaves 4 days of the first period
+    # followed by 3 days of the second period (Monday to Wednesday of week 1 2021)
+    start_date = datetime.fromisocalendar(2020, 52, 4)
+    input_vector = np.array([1.0, 2.0, 3.0], dtype=np.float64)
+
+    out_date, output_vector = convert_to_modeltime(input_vector, startdate=start_date, period_duration=timedelta(weeks=1))
+    out_date_again, output_vector_again = convert_to_modeltime(input_vector * 2, startdate=start_date, period_duration=timedelta(weeks=1))
+
+    assert out_date == out_date_again == start_date
+    assert np.allclose(output_vector, [(4 * 1.0 + 3 * 2.0) / 7, 3.0])
+    assert np.allclose(output_vector_again, 2 * output_vector)
+
+
+def test_week_53_plans_are_cached_within_byte_budget(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(v_ops, "_WEEK_53_PLANS", {})
+    monkeypatch.setattr(v_ops, "_MAX_NUM_WEEK_53_PLAN_BYTES", 2 * 24 * 53)
+    start_date = datetime.fromisocalendar(2020, 52, 1)
+
+    convert_to_modeltime(np.zeros(24 * 53), startdate=start_date, period_duration=timedelta(hours=1))
+    convert_to_modeltime(np.zeros(24 * 54), startdate=start_date, period_duration=timedelta(hours=1))
+    assert [key[-1] for key in v_ops._WEEK_53_PLANS] == [24 * 54]
+
+    convert_to_modeltime(np.zeros(24 * 7 * 53), startdate=start_date, period_duration=timedelta(hours=1))
+    assert [key[-1] for key in v_ops._WEEK_53_PLANS] == [24 * 54]
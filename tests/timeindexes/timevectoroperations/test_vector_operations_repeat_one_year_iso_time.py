@@ -150,9 +150,9 @@ def test_given_53_week_year_weekly_data_input_vector_should_rotate_over_one_53_a
     )
 
 
-@pytest.mark.parametrize("input_vector", [None, 123, np.array([2, 2]).reshape(2, 1)])
+@pytest.mark.parametrize("input_vector", [None, 123, np.array([2, 2]).reshape(2, 1, 1)])
 def test_when_input_vector_is_not_a_vector_should_raise_type_error(input_vector):
-    with pytest.raises(AssertionError, match="input_vector must be a 1D numpy array."):
+    with pytest.raises(AssertionError, match="input_vector must be a 1D or 2D numpy array."):
         repeat_oneyear_isotime(
             input_vector=input_vector,
             input_start_date=datetime.fromisocalendar(2021, 1, 1),
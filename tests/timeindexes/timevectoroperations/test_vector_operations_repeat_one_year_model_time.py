@@ -137,14 +137,14 @@ def test_given_one_year_data_in_any_resolution_should_repeat_over_two_whole_year
     )
 
 
-@pytest.mark.parametrize("input_array", [None, np.array([1, 2]).reshape(2, 1)])
+@pytest.mark.parametrize("input_array", [None, np.array([1, 2]).reshape(2, 1, 1)])
 def test_when_input_vector_is_not_vector_raise_exception(input_array):
     input_vector = input_array
     input_start_date = dt.date.fromisocalendar(2020, 1, 1)
     output_start_date = dt.date.fromisocalendar(2021, 1, 1)
     output_end_date = output_start_date + dt.timedelta(weeks=60)
 
-    with pytest.raises(AssertionError, match="input_vector must be a 1D numpy array."):
+    with pytest.raises(AssertionError, match="input_vector must be a 1D or 2D numpy array."):
         repeat_oneyear_modeltime(
             input_vector=input_vector,
             input_start_date=input_start_date,
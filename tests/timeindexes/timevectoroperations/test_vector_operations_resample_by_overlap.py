@@ -0,0 +1,21 @@
+import numpy as np
+
+from framcore.timeindexes._time_vector_operations import resample_by_overlap
+
+
+def test_should_average_source_values_weighted_by_overlap():
+    in_x = np.array([2, 4, 8], dtype=np.float32)
+    out_x = np.zeros(2, dtype=np.float32)
+
+    resample_by_overlap(in_x, np.array([0, 10, 20, 30]), np.array([5, 15, 30]), out_x)
+
+    assert np.allclose(out_x, [3, 20 / 3])
+
+
+def test_parts_of_target_periods_outside_source_periods_should_get_first_or_last_value():
+    in_x = np.array([2, 4], dtype=np.float64)
+    out_x = np.zeros(3, dtype=np.float64)
+
+    resample_by_overlap(in_x, np.array([0, 10, 20]), np.array([-10, 0, 10, 30]), out_x)
+
+    assert np.allclose(out_x, [2, 2, 4])